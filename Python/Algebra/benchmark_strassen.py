@@ -0,0 +1,95 @@
+"""
+Strassen Crossover Benchmark
+Author: Андрій Будильников
+
+This program times the classical matrix product against one level of the
+Strassen-Winograd recursion for growing square sizes and reports the size at
+which Strassen starts to win on this machine. The suggested value can be
+assigned to MatrixOperations.STRASSEN_CUTOFF.
+"""
+
+import argparse
+import random
+import time
+
+from matrix_operations import MatrixOperations
+
+def random_matrix(n, kind):
+    """
+    Creates a random n x n matrix
+    :param n: Size
+    :param kind: "int" or "float"
+    :return: Matrix as a list of lists
+    """
+    if kind == "int":
+        return [[random.randint(-1000, 1000) for _ in range(n)] for _ in range(n)]
+    return [[random.uniform(-1.0, 1.0) for _ in range(n)] for _ in range(n)]
+
+def best_time(function, repeat):
+    """
+    Runs a function several times and returns the fastest run
+    :param function: Function without arguments
+    :param repeat: Number of runs
+    :return: Best time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def find_crossover(min_size=16, max_size=512, kind="int", repeat=3):
+    """
+    Finds the smallest size at which one Strassen level beats the classical kernel
+    :param min_size: First size to test
+    :param max_size: Last size to test
+    :param kind: Element type, "int" or "float"
+    :param repeat: Runs per measurement
+    :return: Tuple (crossover size or None, list of (size, classical, strassen) timings)
+    """
+    timings = []
+    crossover = None
+    size = min_size
+    while size <= max_size:
+        a = random_matrix(size, kind)
+        b = random_matrix(size, kind)
+        classical = best_time(lambda: MatrixOperations.multiply_matrices(a, b, workers=1), repeat)
+        # cutoff = size // 2 means exactly one level of recursion above classical blocks
+        strassen = best_time(lambda: MatrixOperations.multiply_strassen(a, b, cutoff=size // 2), repeat)
+        timings.append((size, classical, strassen))
+        if strassen < classical and crossover is None:
+            crossover = size
+        elif strassen >= classical:
+            crossover = None
+        size *= 2
+    return crossover, timings
+
+def main():
+    """
+    Main function to run the crossover benchmark
+    """
+    parser = argparse.ArgumentParser(description="Find the Strassen-Winograd crossover size")
+    parser.add_argument("--min-size", type=int, default=16)
+    parser.add_argument("--max-size", type=int, default=512)
+    parser.add_argument("--kind", choices=("int", "float"), default="int")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("Strassen-Winograd Crossover Benchmark")
+    print("=====================================")
+    print(f"{'size':>6} {'classical, s':>14} {'strassen, s':>14}")
+
+    crossover, timings = find_crossover(args.min_size, args.max_size, args.kind, args.repeat)
+    for size, classical, strassen in timings:
+        print(f"{size:>6} {classical:>14.4f} {strassen:>14.4f}")
+
+    if crossover is None:
+        print(f"\nClassical multiplication was faster up to {args.max_size}; "
+              f"keep STRASSEN_CUTOFF at {args.max_size} or more")
+    else:
+        print(f"\nStrassen wins from size {crossover} on")
+        print(f"Suggested MatrixOperations.STRASSEN_CUTOFF = {crossover // 2}")
+
+if __name__ == "__main__":
+    main()
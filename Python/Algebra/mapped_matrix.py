@@ -0,0 +1,286 @@
+"""
+Memory-Mapped Matrices
+Author: Андрій Будильников
+
+This module provides MappedMatrix, a dense matrix stored in a binary file and
+accessed through mmap, so matrices far larger than RAM can be added and
+multiplied. The operations stream square tiles through a working set whose
+size is bounded by a memory limit instead of materializing whole operands.
+
+File format: a 64-byte header followed by the elements in row-major order.
+
+    offset  size  field
+    0       4     magic b"SPMX"
+    4       1     format version (1)
+    5       1     typecode, b"d" (float64) or b"q" (int64)
+    6       1     byte order, b"<" (little endian) or b">" (big endian)
+    7       1     padding
+    8       8     rows (unsigned 64-bit, little endian)
+    16      8     cols (unsigned 64-bit, little endian)
+    24      40    reserved, zero
+"""
+
+import math
+import mmap
+import operator
+import struct
+import sys
+from array import array
+
+MAGIC = b"SPMX"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sBccxQQ")
+
+# Approximate size of one element held in a Python list (object + pointer)
+_ELEMENT_OVERHEAD = 32
+
+# Default bound on the memory used by the tiles of add and multiply
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+_INT64_MAX = (1 << 63) - 1
+
+
+class MappedMatrix:
+    """
+    Disk-backed matrix of float64 or int64 elements
+    """
+
+    __slots__ = ("path", "rows", "cols", "typecode", "_file", "_mmap", "_view")
+
+    def __init__(self, path, mode="r"):
+        """
+        Opens an existing matrix file
+        :param path: File path
+        :param mode: "r" for read-only or "r+" for read-write access
+        """
+        if mode not in ("r", "r+"):
+            raise ValueError("Mode must be 'r' or 'r+'")
+        self.path = path
+        self._file = open(path, "rb" if mode == "r" else "r+b")
+        try:
+            header = self._file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError("File is too short to be a matrix file")
+            magic, version, typecode, byteorder, rows, cols = _HEADER.unpack_from(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not a matrix file or unsupported version")
+            if byteorder != (b"<" if sys.byteorder == "little" else b">"):
+                raise ValueError("Matrix file was written with a different byte order")
+            self.typecode = typecode.decode()
+            self.rows = rows
+            self.cols = cols
+            access = mmap.ACCESS_READ if mode == "r" else mmap.ACCESS_WRITE
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+            self._view = memoryview(self._mmap)[HEADER_SIZE:].cast(self.typecode)
+        except Exception:
+            self._file.close()
+            raise
+
+    @classmethod
+    def create(cls, path, rows, cols, typecode="d"):
+        """
+        Creates a zero-filled matrix file and opens it for writing
+        :param path: File path
+        :param rows: Number of rows
+        :param cols: Number of columns
+        :param typecode: "d" (float64) or "q" (int64)
+        :return: MappedMatrix opened in "r+" mode
+        """
+        if typecode not in ("d", "q"):
+            raise ValueError("Typecode must be 'd' or 'q'")
+        byteorder = b"<" if sys.byteorder == "little" else b">"
+        header = _HEADER.pack(MAGIC, VERSION, typecode.encode(), byteorder, rows, cols)
+        with open(path, "wb") as file:
+            file.write(header.ljust(HEADER_SIZE, b"\0"))
+            # Extending the file leaves a sparse region of zeros on most file systems
+            file.truncate(HEADER_SIZE + rows * cols * array(typecode).itemsize)
+        return cls(path, "r+")
+
+    @classmethod
+    def from_list(cls, path, matrix, typecode=None):
+        """
+        Writes a list of lists to a new matrix file
+        :param path: File path
+        :param matrix: List of rows
+        :param typecode: "d" or "q"; "q" if every element is an int, otherwise "d"
+        :return: MappedMatrix opened in "r+" mode
+        """
+        rows = len(matrix)
+        cols = len(matrix[0]) if rows else 0
+        if typecode is None:
+            typecode = "q" if all(type(val) is int for row in matrix for val in row) else "d"
+        result = cls.create(path, rows, cols, typecode)
+        for i, row in enumerate(matrix):
+            if len(row) != cols:
+                result.close()
+                raise ValueError("All rows must have the same length")
+            result.write_tile(i, 0, [row])
+        return result
+
+    @property
+    def shape(self):
+        """
+        (rows, cols) of the matrix
+        """
+        return (self.rows, self.cols)
+
+    def close(self):
+        """
+        Flushes and closes the mapping
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            if not self._mmap.closed and self._file.mode != "rb":
+                self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"MappedMatrix({self.path!r}, shape={self.shape}, typecode={self.typecode!r})"
+
+    def __getitem__(self, key):
+        """
+        m[i, j] reads a single element
+        """
+        i, j = key
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError("Matrix index out of range")
+        return self._view[i * self.cols + j]
+
+    def __setitem__(self, key, value):
+        """
+        m[i, j] = value writes a single element
+        """
+        i, j = key
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError("Matrix index out of range")
+        self._view[i * self.cols + j] = value
+
+    def read_tile(self, row_start, row_stop, col_start, col_stop):
+        """
+        Reads a rectangular block into memory
+        :param row_start: First row
+        :param row_stop: Row after the last row
+        :param col_start: First column
+        :param col_stop: Column after the last column
+        :return: Block as a list of lists
+        """
+        view = self._view
+        cols = self.cols
+        return [view[i * cols + col_start:i * cols + col_stop].tolist()
+                for i in range(row_start, row_stop)]
+
+    def write_tile(self, row_start, col_start, tile):
+        """
+        Writes a block of rows back to the file
+        :param row_start: Row of the block's top-left element
+        :param col_start: Column of the block's top-left element
+        :param tile: Block as a list of lists
+        """
+        view = self._view
+        cols = self.cols
+        typecode = self.typecode
+        for i, row in enumerate(tile, row_start):
+            start = i * cols + col_start
+            view[start:start + len(row)] = array(typecode, row)
+
+    def tolist(self):
+        """
+        Reads the whole matrix into a list of lists
+        :return: List of rows
+        """
+        return self.read_tile(0, self.rows, 0, self.cols)
+
+    def max_abs(self):
+        """
+        Largest absolute value of an element, read straight from the mapping
+        :return: Maximum of |element| (0 for an empty matrix)
+        """
+        return max(max(self._view, default=0), -min(self._view, default=0))
+
+    @staticmethod
+    def tile_size_for(memory_limit, tiles=4):
+        """
+        Chooses the side of square tiles so that the working set fits the limit
+        :param memory_limit: Memory budget in bytes
+        :param tiles: Number of tiles held at once
+        :return: Tile side length
+        """
+        return max(1, math.isqrt(memory_limit // (tiles * _ELEMENT_OVERHEAD)))
+
+    def add(self, other, path, memory_limit=DEFAULT_MEMORY_LIMIT):
+        """
+        Adds two mapped matrices, streaming blocks of rows into a new file
+        :param other: MappedMatrix of the same shape
+        :param path: Path of the result file
+        :param memory_limit: Memory budget for the blocks in bytes
+        :return: MappedMatrix holding the sum (int64 for int64 operands whose
+                 sums are sure to fit, float64 otherwise)
+        """
+        if self.shape != other.shape:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        # int64 only when no sum can overflow it, so writing a block never
+        # fails halfway through the result file
+        typecode = "d"
+        if self.typecode == other.typecode == "q" and self.max_abs() + other.max_abs() <= _INT64_MAX:
+            typecode = "q"
+        result = MappedMatrix.create(path, self.rows, self.cols, typecode)
+        block = max(1, memory_limit // (3 * _ELEMENT_OVERHEAD * max(1, self.cols)))
+        add = operator.add
+        for start in range(0, self.rows, block):
+            stop = min(start + block, self.rows)
+            rows1 = self.read_tile(start, stop, 0, self.cols)
+            rows2 = other.read_tile(start, stop, 0, self.cols)
+            result.write_tile(start, 0, [list(map(add, row1, row2)) for row1, row2 in zip(rows1, rows2)])
+        return result
+
+    def multiply(self, other, path, memory_limit=DEFAULT_MEMORY_LIMIT, tile_size=None):
+        """
+        Multiplies two mapped matrices tile by tile into a new file
+
+        For every output tile C[I, J] the products A[I, K] x B[K, J] are
+        accumulated over the K tiles, so only four tiles (A, B, their product
+        and the accumulator) are in memory at once.
+        :param other: MappedMatrix with as many rows as this one has columns
+        :param path: Path of the result file
+        :param memory_limit: Memory budget for the tiles in bytes
+        :param tile_size: Explicit tile side (overrides memory_limit)
+        :return: MappedMatrix holding the product (int64 for int64 operands
+                 whose dot products are sure to fit, float64 otherwise)
+        """
+        if self.cols != other.rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
+        if tile_size is None:
+            tile_size = MappedMatrix.tile_size_for(memory_limit)
+        # int64 only when no dot product can overflow it (see add)
+        typecode = "d"
+        if self.typecode == other.typecode == "q" and \
+                self.max_abs() * other.max_abs() * self.cols <= _INT64_MAX:
+            typecode = "q"
+        result = MappedMatrix.create(path, self.rows, other.cols, typecode)
+        mul = operator.mul
+        add = operator.add
+        inner = self.cols
+        for row_start in range(0, self.rows, tile_size):
+            row_stop = min(row_start + tile_size, self.rows)
+            for col_start in range(0, other.cols, tile_size):
+                col_stop = min(col_start + tile_size, other.cols)
+                acc = None
+                for k_start in range(0, inner, tile_size):
+                    k_stop = min(k_start + tile_size, inner)
+                    a_tile = self.read_tile(row_start, row_stop, k_start, k_stop)
+                    b_columns = list(zip(*other.read_tile(k_start, k_stop, col_start, col_stop)))
+                    product = [[sum(map(mul, row, column)) for column in b_columns] for row in a_tile]
+                    acc = product if acc is None else \
+                        [list(map(add, acc_row, row)) for acc_row, row in zip(acc, product)]
+                if acc is not None:
+                    result.write_tile(row_start, col_start, acc)
+        return result
@@ -0,0 +1,521 @@
+"""
+Compact Matrix Type
+Author: Андрій Будильников
+
+This module provides an array-backed Matrix class. The elements live in one
+contiguous row-major buffer (array('d') for floats, array('q') for integers,
+a plain list for anything else such as Fractions or big integers) and the
+matrix only keeps shape and stride metadata on top of it, so transposes and
+row/column slices are views that share the buffer instead of copying it.
+"""
+
+import operator
+from array import array
+from itertools import chain
+
+# Typecode used for matrices that store arbitrary Python objects in a list
+OBJECT = "O"
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def infer_typecode(values):
+    """
+    Picks the most compact storage that can hold every value exactly
+    :param values: Iterable of matrix elements
+    :return: 'q', 'd' or OBJECT
+    """
+    typecode = "q"
+    for val in values:
+        kind = type(val)
+        if kind is int:
+            if not _INT64_MIN <= val <= _INT64_MAX:
+                return OBJECT
+        elif kind is float:
+            typecode = "d"
+        else:
+            return OBJECT
+    return typecode
+
+
+def make_buffer(typecode, values):
+    """
+    Builds a storage buffer of the given typecode
+    :param typecode: 'q', 'd' or OBJECT
+    :param values: Iterable of elements
+    :return: array or list
+    """
+    if typecode == OBJECT:
+        return list(values)
+    return array(typecode, values)
+
+
+def result_buffer(typecode, values):
+    """
+    Builds a buffer for an arithmetic result, widening integer storage to
+    objects when a value no longer fits into 64 bits
+    :param typecode: Preferred typecode
+    :param values: Iterable of elements
+    :return: array or list
+    """
+    if typecode != "q":
+        return make_buffer(typecode, values)
+    values = list(values)
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+def _common_typecode(first, second):
+    """
+    Returns the storage type able to hold results of mixing two matrices
+    :param first: Typecode of the first operand
+    :param second: Typecode of the second operand
+    :return: Common typecode
+    """
+    if first == second:
+        return first
+    if OBJECT in (first, second):
+        return OBJECT
+    return "d"
+
+
+class Matrix:
+    """
+    Dense matrix stored in a flat row-major buffer with strided views
+    """
+
+    __slots__ = ("_data", "_offset", "_rows", "_cols", "_row_stride", "_col_stride")
+
+    def __init__(self, rows, typecode=None):
+        """
+        Creates a matrix from a list of rows
+        :param rows: List of equally long lists (or another Matrix, which is copied)
+        :param typecode: 'd', 'q' or 'O'; inferred from the values if omitted
+        """
+        if isinstance(rows, Matrix):
+            values = list(rows._values())
+            row_count, col_count = rows.shape
+        else:
+            row_count = len(rows)
+            col_count = len(rows[0]) if row_count else 0
+            for row in rows:
+                if len(row) != col_count:
+                    raise ValueError("All rows must have the same length")
+            values = [val for row in rows for val in row]
+
+        if typecode is None:
+            typecode = infer_typecode(values)
+
+        self._data = make_buffer(typecode, values)
+        self._offset = 0
+        self._rows = row_count
+        self._cols = col_count
+        self._row_stride = col_count
+        self._col_stride = 1
+
+    @classmethod
+    def _view(cls, data, offset, rows, cols, row_stride, col_stride):
+        """
+        Creates a matrix that shares an existing buffer
+        """
+        matrix = object.__new__(cls)
+        matrix._data = data
+        matrix._offset = offset
+        matrix._rows = rows
+        matrix._cols = cols
+        matrix._row_stride = row_stride
+        matrix._col_stride = col_stride
+        return matrix
+
+    @classmethod
+    def from_buffer(cls, data, rows, cols):
+        """
+        Wraps an existing row-major buffer without copying it
+        :param data: array('d'), array('q') or list of length rows * cols
+        :param rows: Number of rows
+        :param cols: Number of columns
+        :return: Matrix backed by data
+        """
+        if len(data) != rows * cols:
+            raise ValueError("Buffer length does not match the matrix shape")
+        if isinstance(data, array) and data.typecode not in ("d", "q"):
+            data = array("d" if data.typecode in ("f", "d") else "q", data)
+        return cls._view(data, 0, rows, cols, cols, 1)
+
+    @classmethod
+    def zeros(cls, rows, cols, typecode="d"):
+        """
+        Creates a matrix filled with zeros
+        :param rows: Number of rows
+        :param cols: Number of columns
+        :param typecode: Storage type
+        :return: Zero matrix
+        """
+        zero = 0.0 if typecode == "d" else 0
+        if typecode == OBJECT:
+            data = [zero] * (rows * cols)
+        else:
+            data = array(typecode, [zero]) * (rows * cols)
+        return cls._view(data, 0, rows, cols, cols, 1)
+
+    @classmethod
+    def identity(cls, n, typecode="q"):
+        """
+        Creates an n x n identity matrix
+        :param n: Size
+        :param typecode: Storage type
+        :return: Identity matrix
+        """
+        matrix = cls.zeros(n, n, typecode)
+        one = 1.0 if typecode == "d" else 1
+        matrix._data[::n + 1] = make_buffer(typecode, [one] * n)
+        return matrix
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Returns value unchanged if it is a Matrix, otherwise builds one
+        :param value: Matrix or list of lists
+        :return: Matrix
+        """
+        return value if isinstance(value, Matrix) else cls(value)
+
+    @property
+    def shape(self):
+        """
+        (rows, cols) of the matrix
+        """
+        return (self._rows, self._cols)
+
+    @property
+    def rows(self):
+        """
+        Number of rows
+        """
+        return self._rows
+
+    @property
+    def cols(self):
+        """
+        Number of columns
+        """
+        return self._cols
+
+    @property
+    def typecode(self):
+        """
+        Storage type: 'd', 'q' or 'O'
+        """
+        return self._data.typecode if isinstance(self._data, array) else OBJECT
+
+    @property
+    def is_contiguous(self):
+        """
+        True if the elements form one unbroken row-major run of the buffer
+        """
+        return self._col_stride == 1 and (self._row_stride == self._cols or self._rows <= 1)
+
+    @property
+    def T(self):
+        """
+        Transposed view sharing the same buffer
+        """
+        return self.transpose()
+
+    def transpose(self):
+        """
+        Returns the transpose as a view (no elements are copied)
+        :return: Transposed Matrix
+        """
+        return Matrix._view(self._data, self._offset, self._cols, self._rows,
+                            self._col_stride, self._row_stride)
+
+    def row(self, i):
+        """
+        Returns row i as a 1 x cols view
+        :param i: Row index
+        :return: Matrix view
+        """
+        return self[i]
+
+    def col(self, j):
+        """
+        Returns column j as a rows x 1 view
+        :param j: Column index
+        :return: Matrix view
+        """
+        return self[:, j]
+
+    def _row_values(self, i):
+        """
+        Returns the elements of row i as a buffer slice
+        """
+        start = self._offset + i * self._row_stride
+        if self._col_stride == 1:
+            return self._data[start:start + self._cols]
+        return self._data[start:start + self._cols * self._col_stride:self._col_stride]
+
+    def _values(self):
+        """
+        Iterates over all elements in row-major order
+        """
+        if self.is_contiguous:
+            start = self._offset
+            return iter(self._data[start:start + self._rows * self._cols])
+        return chain.from_iterable(self._row_values(i) for i in range(self._rows))
+
+    def _row_slices(self):
+        """
+        Yields a slice object addressing each row inside the buffer
+        """
+        for i in range(self._rows):
+            start = self._offset + i * self._row_stride
+            yield slice(start, start + self._cols * self._col_stride, self._col_stride)
+
+    def tolist(self):
+        """
+        Converts the matrix into a list of lists
+        :return: List of rows
+        """
+        return [list(self._row_values(i)) for i in range(self._rows)]
+
+    def copy(self):
+        """
+        Returns a contiguous copy of the matrix
+        :return: New Matrix with its own buffer
+        """
+        data = make_buffer(self.typecode, self._values())
+        return Matrix._view(data, 0, self._rows, self._cols, self._cols, 1)
+
+    @staticmethod
+    def _integer(key):
+        """
+        Returns key as an int if it is an integer index (including NumPy
+        integers and anything else with __index__), otherwise None
+        """
+        if isinstance(key, slice):
+            return None
+        try:
+            return operator.index(key)
+        except TypeError:
+            return None
+
+    @staticmethod
+    def _index(index, size):
+        """
+        Normalizes a possibly negative index
+        """
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Matrix index out of range")
+        return index
+
+    def __len__(self):
+        return self._rows
+
+    def __iter__(self):
+        """
+        Iterates over the rows as 1 x cols views
+        """
+        for i in range(self._rows):
+            yield self[i]
+
+    def __getitem__(self, key):
+        """
+        m[i, j] returns an element; m[i], m[a:b], m[i, :] and m[:, a:b]
+        return views that share the buffer
+        """
+        if isinstance(key, tuple):
+            row_key, col_key = key
+        else:
+            row_key, col_key = key, slice(None)
+
+        row_index = Matrix._integer(row_key)
+        col_index = Matrix._integer(col_key)
+        if row_index is not None and col_index is not None:
+            i = Matrix._index(row_index, self._rows)
+            j = Matrix._index(col_index, self._cols)
+            return self._data[self._offset + i * self._row_stride + j * self._col_stride]
+
+        if row_index is not None:
+            row_index = Matrix._index(row_index, self._rows)
+            row_key = slice(row_index, row_index + 1)
+        if col_index is not None:
+            col_index = Matrix._index(col_index, self._cols)
+            col_key = slice(col_index, col_index + 1)
+        if not (isinstance(row_key, slice) and isinstance(col_key, slice)):
+            raise TypeError("Matrix indices must be integers or slices")
+
+        row_start, row_stop, row_step = row_key.indices(self._rows)
+        col_start, col_stop, col_step = col_key.indices(self._cols)
+        if row_step < 1 or col_step < 1:
+            raise ValueError("Matrix views only support positive steps")
+        return Matrix._view(
+            self._data,
+            self._offset + row_start * self._row_stride + col_start * self._col_stride,
+            len(range(row_start, row_stop, row_step)),
+            len(range(col_start, col_stop, col_step)),
+            self._row_stride * row_step,
+            self._col_stride * col_step,
+        )
+
+    def __setitem__(self, key, value):
+        """
+        m[i, j] = value writes a single element into the shared buffer
+        """
+        indices = [Matrix._integer(k) for k in key] if isinstance(key, tuple) else [None]
+        if len(indices) != 2 or None in indices:
+            raise TypeError("Matrix assignment requires an index of the form m[i, j]")
+        i = Matrix._index(indices[0], self._rows)
+        j = Matrix._index(indices[1], self._cols)
+        self._data[self._offset + i * self._row_stride + j * self._col_stride] = value
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix):
+            return self.shape == other.shape and all(map(operator.eq, self._values(), other._values()))
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Matrix({self.tolist()!r})"
+
+    def _elementwise(self, other, op, symbol):
+        """
+        Applies a binary operation element by element
+        """
+        other = Matrix.coerce(other)
+        if self.shape != other.shape:
+            raise ValueError(f"Matrices must have the same dimensions for {symbol}")
+        typecode = _common_typecode(self.typecode, other.typecode)
+        data = result_buffer(typecode, map(op, self._values(), other._values()))
+        return Matrix._view(data, 0, self._rows, self._cols, self._cols, 1)
+
+    def _elementwise_inplace(self, other, op, symbol):
+        """
+        Applies a binary operation element by element, writing into this buffer
+        """
+        other = Matrix.coerce(other)
+        if self.shape != other.shape:
+            raise ValueError(f"Matrices must have the same dimensions for {symbol}")
+        data = self._data
+        rows = [list(map(op, data[target], other._row_values(i)))
+                for i, target in enumerate(self._row_slices())]
+        self._write_rows(rows, _common_typecode(self.typecode, other.typecode))
+        return self
+
+    def _write_rows(self, rows, typecode):
+        """
+        Writes computed rows back into the buffer, widening the whole buffer
+        to typecode first and to objects if a value does not fit into 64 bits,
+        as result_buffer does for new matrices. A widened buffer is a new
+        object, so other views of the old buffer no longer see the writes.
+        """
+        if typecode != self.typecode:
+            self._data = make_buffer(typecode, self._data)
+        try:
+            for target, values in zip(self._row_slices(), rows):
+                self._data[target] = make_buffer(typecode, values)
+        except OverflowError:
+            # Rows are fully computed, so rewriting them all is safe
+            self._data = make_buffer(OBJECT, self._data)
+            for target, values in zip(self._row_slices(), rows):
+                self._data[target] = values
+
+    def __add__(self, other):
+        if not isinstance(other, (Matrix, list)):
+            return NotImplemented
+        return self._elementwise(other, operator.add, "addition")
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return Matrix(other)._elementwise(self, operator.add, "addition")
+
+    def __iadd__(self, other):
+        if not isinstance(other, (Matrix, list)):
+            return NotImplemented
+        return self._elementwise_inplace(other, operator.add, "addition")
+
+    def __sub__(self, other):
+        if not isinstance(other, (Matrix, list)):
+            return NotImplemented
+        return self._elementwise(other, operator.sub, "subtraction")
+
+    def __rsub__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return Matrix(other)._elementwise(self, operator.sub, "subtraction")
+
+    def __isub__(self, other):
+        if not isinstance(other, (Matrix, list)):
+            return NotImplemented
+        return self._elementwise_inplace(other, operator.sub, "subtraction")
+
+    def __neg__(self):
+        data = result_buffer(self.typecode, map(operator.neg, self._values()))
+        return Matrix._view(data, 0, self._rows, self._cols, self._cols, 1)
+
+    def __mul__(self, scalar):
+        """
+        Multiplies every element by a scalar (use @ for matrix products)
+        """
+        if isinstance(scalar, (Matrix, list)):
+            return NotImplemented
+        typecode = self.typecode
+        if typecode == "q" and type(scalar) is not int:
+            typecode = "d" if type(scalar) is float else OBJECT
+        elif typecode == "d" and type(scalar) not in (int, float):
+            # Complex and other scalars may give values array('d') cannot hold
+            typecode = OBJECT
+        data = result_buffer(typecode, (val * scalar for val in self._values()))
+        return Matrix._view(data, 0, self._rows, self._cols, self._cols, 1)
+
+    __rmul__ = __mul__
+
+    def _product_values(self, other):
+        """
+        Generates the elements of self @ other in row-major order
+        """
+        mul = operator.mul
+        # Reading columns of other as rows of its transpose keeps the inner
+        # loop on contiguous slices
+        columns = [other.transpose()._row_values(j) for j in range(other._cols)]
+        for i in range(self._rows):
+            row = self._row_values(i)
+            for column in columns:
+                yield sum(map(mul, row, column))
+
+    def __matmul__(self, other):
+        if isinstance(other, list):
+            other = Matrix(other)
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self._cols != other._rows:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
+        typecode = _common_typecode(self.typecode, other.typecode)
+        data = result_buffer(typecode, self._product_values(other))
+        return Matrix._view(data, 0, self._rows, other._cols, other._cols, 1)
+
+    def __rmatmul__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return Matrix(other) @ self
+
+    def __imatmul__(self, other):
+        """
+        In-place product; the result is written back into this buffer when
+        the shape is unchanged (other is square), otherwise a new Matrix is returned
+        """
+        product = self @ other
+        if product.shape != self.shape:
+            return product
+        rows = [list(product._row_values(i)) for i in range(product._rows)]
+        self._write_rows(rows, _common_typecode(self.typecode, product.typecode))
+        return self
@@ -0,0 +1,258 @@
+"""
+Batched Small-Matrix Kernels
+Author: Андрій Будильников
+
+This module computes determinants and products of many small matrices at once.
+A stack of matrices is passed as one packed row-major buffer (for example an
+array('d') holding count * n * n values), and the 2x2, 3x3 and 4x4 cases use
+unrolled closed-form kernels, so there is no per-matrix dimension check,
+recursion or minor allocation. When NumPy is installed, float stacks are
+handed to it instead; integer and object stacks always stay on the exact
+kernels, whatever use_numpy says.
+"""
+
+from array import array
+
+from matrix import OBJECT, result_buffer
+from matrix_operations import MatrixOperations
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _chunks(stack, size):
+    """
+    Iterates over consecutive tuples of size elements
+    """
+    iterator = iter(stack)
+    return zip(*[iterator] * size)
+
+
+def _check_stack(stack, n):
+    """
+    Validates a packed stack and returns the number of matrices in it
+    """
+    if n < 1:
+        raise ValueError("Matrix size must be positive")
+    count, remainder = divmod(len(stack), n * n)
+    if remainder:
+        raise ValueError("Stack length must be a multiple of n * n")
+    return count
+
+
+def _typecode(stack):
+    """
+    Returns the typecode used for results computed from a stack
+    """
+    if isinstance(stack, array):
+        return "d" if stack.typecode in ("f", "d") else "q"
+    return OBJECT
+
+
+def _use_numpy(stack, use_numpy):
+    """
+    Decides whether a stack goes through the NumPy fast path
+    """
+    # Integer stacks stay on the exact kernels even when use_numpy is True
+    # (NumPy determinants are floats and int64 products wrap around silently)
+    if not (isinstance(stack, array) and stack.typecode == "d"):
+        return False
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed")
+    return use_numpy is not False and numpy is not None
+
+
+def _det2(stack):
+    """
+    Determinants of packed 2x2 matrices
+    """
+    return [a * d - b * c for a, b, c, d in _chunks(stack, 4)]
+
+
+def _det3(stack):
+    """
+    Determinants of packed 3x3 matrices (expansion along the first row)
+    """
+    return [a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+            for a, b, c, d, e, f, g, h, i in _chunks(stack, 9)]
+
+
+def _det4(stack):
+    """
+    Determinants of packed 4x4 matrices
+    """
+    result = []
+    for (a00, a01, a02, a03, a10, a11, a12, a13,
+         a20, a21, a22, a23, a30, a31, a32, a33) in _chunks(stack, 16):
+        # Laplace expansion along the first two rows using 2x2 minors
+        s0 = a00 * a11 - a10 * a01
+        s1 = a00 * a12 - a10 * a02
+        s2 = a00 * a13 - a10 * a03
+        s3 = a01 * a12 - a11 * a02
+        s4 = a01 * a13 - a11 * a03
+        s5 = a02 * a13 - a12 * a03
+        c5 = a22 * a33 - a32 * a23
+        c4 = a21 * a33 - a31 * a23
+        c3 = a21 * a32 - a31 * a22
+        c2 = a20 * a33 - a30 * a23
+        c1 = a20 * a32 - a30 * a22
+        c0 = a20 * a31 - a30 * a21
+        result.append(s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0)
+    return result
+
+
+def _mul2(stack_a, stack_b):
+    """
+    Products of packed 2x2 matrices
+    """
+    result = []
+    extend = result.extend
+    for (a0, a1, a2, a3), (b0, b1, b2, b3) in zip(_chunks(stack_a, 4), _chunks(stack_b, 4)):
+        extend((a0 * b0 + a1 * b2, a0 * b1 + a1 * b3,
+                a2 * b0 + a3 * b2, a2 * b1 + a3 * b3))
+    return result
+
+
+def _mul3(stack_a, stack_b):
+    """
+    Products of packed 3x3 matrices
+    """
+    result = []
+    extend = result.extend
+    for (a0, a1, a2, a3, a4, a5, a6, a7, a8), (b0, b1, b2, b3, b4, b5, b6, b7, b8) in \
+            zip(_chunks(stack_a, 9), _chunks(stack_b, 9)):
+        extend((a0 * b0 + a1 * b3 + a2 * b6,
+                a0 * b1 + a1 * b4 + a2 * b7,
+                a0 * b2 + a1 * b5 + a2 * b8,
+                a3 * b0 + a4 * b3 + a5 * b6,
+                a3 * b1 + a4 * b4 + a5 * b7,
+                a3 * b2 + a4 * b5 + a5 * b8,
+                a6 * b0 + a7 * b3 + a8 * b6,
+                a6 * b1 + a7 * b4 + a8 * b7,
+                a6 * b2 + a7 * b5 + a8 * b8))
+    return result
+
+
+def _mul4(stack_a, stack_b):
+    """
+    Products of packed 4x4 matrices
+    """
+    result = []
+    extend = result.extend
+    for (a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12, a13, a14, a15), \
+        (b0, b1, b2, b3, b4, b5, b6, b7, b8, b9, b10, b11, b12, b13, b14, b15) in \
+            zip(_chunks(stack_a, 16), _chunks(stack_b, 16)):
+        extend((a0 * b0 + a1 * b4 + a2 * b8 + a3 * b12,
+                a0 * b1 + a1 * b5 + a2 * b9 + a3 * b13,
+                a0 * b2 + a1 * b6 + a2 * b10 + a3 * b14,
+                a0 * b3 + a1 * b7 + a2 * b11 + a3 * b15,
+                a4 * b0 + a5 * b4 + a6 * b8 + a7 * b12,
+                a4 * b1 + a5 * b5 + a6 * b9 + a7 * b13,
+                a4 * b2 + a5 * b6 + a6 * b10 + a7 * b14,
+                a4 * b3 + a5 * b7 + a6 * b11 + a7 * b15,
+                a8 * b0 + a9 * b4 + a10 * b8 + a11 * b12,
+                a8 * b1 + a9 * b5 + a10 * b9 + a11 * b13,
+                a8 * b2 + a9 * b6 + a10 * b10 + a11 * b14,
+                a8 * b3 + a9 * b7 + a10 * b11 + a11 * b15,
+                a12 * b0 + a13 * b4 + a14 * b8 + a15 * b12,
+                a12 * b1 + a13 * b5 + a14 * b9 + a15 * b13,
+                a12 * b2 + a13 * b6 + a14 * b10 + a15 * b14,
+                a12 * b3 + a13 * b7 + a14 * b11 + a15 * b15))
+    return result
+
+
+_DETERMINANT_KERNELS = {2: _det2, 3: _det3, 4: _det4}
+_MULTIPLY_KERNELS = {2: _mul2, 3: _mul3, 4: _mul4}
+
+
+class MatrixBatch:
+    """
+    Provides batched operations on stacks of small square matrices
+    """
+
+    @staticmethod
+    def pack(matrices, typecode="d"):
+        """
+        Packs a list of n x n matrices into one row-major buffer
+        :param matrices: List of matrices given as lists of lists
+        :param typecode: array typecode of the buffer ('d' or 'q'), or 'O' for a list
+        :return: Packed stack
+        """
+        values = [val for matrix in matrices for row in matrix for val in row]
+        return values if typecode == OBJECT else array(typecode, values)
+
+    @staticmethod
+    def unpack(stack, n):
+        """
+        Splits a packed stack back into a list of n x n matrices
+        :param stack: Packed stack
+        :param n: Matrix size
+        :return: List of matrices as lists of lists
+        """
+        _check_stack(stack, n)
+        return [[list(row) for row in _chunks(matrix, n)] for matrix in _chunks(stack, n * n)]
+
+    @staticmethod
+    def determinant_batch(stack, n, use_numpy=None):
+        """
+        Calculates the determinant of every matrix in a packed stack
+        :param stack: Packed row-major buffer of count * n * n values
+        :param n: Size of each matrix
+        :param use_numpy: True forces, False disables and None auto-selects
+                          the NumPy path; it only applies to array('d')
+                          stacks, others always use the exact kernels
+        :return: Determinants (array('d'), array('q') or a list, following the stack)
+        """
+        count = _check_stack(stack, n)
+        if _use_numpy(stack, use_numpy):
+            matrices = numpy.frombuffer(stack, dtype=numpy.float64).reshape(count, n, n)
+            return array("d", numpy.linalg.det(matrices).tobytes()) if count else array("d")
+
+        kernel = _DETERMINANT_KERNELS.get(n)
+        if n == 1:
+            values = list(stack)
+        elif kernel is not None:
+            values = kernel(stack)
+        else:
+            values = [MatrixOperations.determinant([list(row) for row in _chunks(matrix, n)])
+                      for matrix in _chunks(stack, n * n)]
+        return result_buffer(_typecode(stack), values)
+
+    @staticmethod
+    def multiply_batch(stack_a, stack_b, n, use_numpy=None):
+        """
+        Multiplies matching pairs of matrices from two packed stacks
+        :param stack_a: Packed row-major buffer of count * n * n values
+        :param stack_b: Packed buffer of the same length
+        :param n: Size of each matrix
+        :param use_numpy: True forces, False disables and None auto-selects
+                          the NumPy path; it only applies to array('d')
+                          stacks, others always use the exact kernels
+        :return: Packed stack of products
+        """
+        count = _check_stack(stack_a, n)
+        if len(stack_b) != len(stack_a):
+            raise ValueError("Both stacks must hold the same number of matrices")
+        if _use_numpy(stack_a, use_numpy) and _use_numpy(stack_b, use_numpy):
+            first = numpy.frombuffer(stack_a, dtype=numpy.float64).reshape(count, n, n)
+            second = numpy.frombuffer(stack_b, dtype=numpy.float64).reshape(count, n, n)
+            return array("d", numpy.matmul(first, second).tobytes())
+
+        kernel = _MULTIPLY_KERNELS.get(n)
+        if n == 1:
+            values = [a * b for a, b in zip(stack_a, stack_b)]
+        elif kernel is not None:
+            values = kernel(stack_a, stack_b)
+        else:
+            values = []
+            for a, b in zip(_chunks(stack_a, n * n), _chunks(stack_b, n * n)):
+                product = MatrixOperations.multiply_matrices(
+                    [list(row) for row in _chunks(a, n)], [list(row) for row in _chunks(b, n)], workers=1)
+                for row in product:
+                    values.extend(row)
+        typecode = _typecode(stack_a)
+        if typecode != _typecode(stack_b):
+            typecode = OBJECT if OBJECT in (typecode, _typecode(stack_b)) else "d"
+        return result_buffer(typecode, values)
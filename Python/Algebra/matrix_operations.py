@@ -6,43 +6,210 @@ This program provides basic matrix operations including addition, multiplication
 determinant calculation, and matrix inversion.
 """
 
+import functools
 import math
+import numbers
+import operator
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from itertools import chain
+from multiprocessing import shared_memory
+
+from matrix import OBJECT, Matrix, infer_typecode
+from sparse_matrix import COOMatrix, CSRMatrix
+
+# Result of MatrixOperations.lu_factor
+LUFactorization = namedtuple("LUFactorization", ["lu", "permutation", "sign", "exact"])
+
+# Integers up to this magnitude are represented exactly by floats
+_FLOAT_EXACT_LIMIT = 1 << 53
 
 class MatrixOperations:
     """
     Provides methods for performing various matrix operations
     """
     
+    # Products needing at least this many multiply-adds are split across processes
+    PARALLEL_THRESHOLD = 8_000_000
+    
+    # Number of columns of the second matrix processed together per row tile
+    BLOCK_SIZE = 64
+    
+    # Number of LU factorizations kept by lu_factor; a new value takes
+    # effect on the next lu_factor call (the cached entries are dropped)
+    FACTOR_CACHE_SIZE = 128
+    
+    # LRU-cached _lu_factor sized by FACTOR_CACHE_SIZE, built on first use
+    _factor_cache = None
+    
+    # Blocks at or below this size are multiplied classically by multiply_strassen
+    # (see benchmark_strassen.py to calibrate it for the host machine)
+    STRASSEN_CUTOFF = 128
+    
     @staticmethod
     def add_matrices(matrix1, matrix2):
         """
         Adds two matrices of the same dimensions
         :param matrix1: First matrix
         :param matrix2: Second matrix
-        :return: Sum of the two matrices
+        :return: Sum of the two matrices (a Matrix if either operand is one; a
+                 CSRMatrix for two sparse operands)
         """
+        if isinstance(matrix1, (CSRMatrix, COOMatrix)):
+            return matrix1 + matrix2
+        if isinstance(matrix2, (CSRMatrix, COOMatrix)):
+            return matrix2 + matrix1
+        
+        if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+            return Matrix.coerce(matrix1) + Matrix.coerce(matrix2)
+        
         rows = len(matrix1)
         cols = len(matrix1[0])
         
         if rows != len(matrix2) or cols != len(matrix2[0]):
             raise ValueError("Matrices must have the same dimensions for addition")
         
-        result = [[0 for _ in range(cols)] for _ in range(rows)]
+        return [[a + b for a, b in zip(row1, row2)] for row1, row2 in zip(matrix1, matrix2)]
+    
+    @staticmethod
+    def multiply_matrices(matrix1, matrix2, workers=None):
+        """
+        Multiplies two matrices
         
-        for i in range(rows):
-            for j in range(cols):
-                result[i][j] = matrix1[i][j] + matrix2[i][j]
+        The second matrix is transposed once so the inner loop walks two rows
+        side by side, and its columns are processed in tiles of BLOCK_SIZE.
+        Products above PARALLEL_THRESHOLD multiply-adds are split into row
+        blocks and computed by a process pool that reads both operands from
+        shared memory.
+        :param matrix1: First matrix
+        :param matrix2: Second matrix
+        :param workers: Number of worker processes (None uses every CPU, 1 stays in-process)
+        :return: Product of the two matrices (a Matrix if either operand is one;
+                 a CSRMatrix for two sparse operands)
+        """
+        if isinstance(matrix1, (CSRMatrix, COOMatrix)) or isinstance(matrix2, (CSRMatrix, COOMatrix)):
+            return matrix1 @ matrix2
         
+        if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+            return Matrix.coerce(matrix1) @ Matrix.coerce(matrix2)
+        
+        rows1 = len(matrix1)
+        cols1 = len(matrix1[0])
+        rows2 = len(matrix2)
+        cols2 = len(matrix2[0])
+        
+        if cols1 != rows2:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
+        # zip() below would silently drop the tail of longer rows
+        if any(len(row) != cols1 for row in matrix1) or any(len(row) != cols2 for row in matrix2):
+            raise ValueError("All rows must have the same length")
+        
+        columns = [list(column) for column in zip(*matrix2)]
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and rows1 > 1 and rows1 * cols1 * cols2 >= MatrixOperations.PARALLEL_THRESHOLD:
+            result = MatrixOperations._multiply_parallel(matrix1, columns, workers)
+            if result is not None:
+                return result
+        
+        return MatrixOperations._multiply_rows(matrix1, columns, MatrixOperations.BLOCK_SIZE)
+    
+    @staticmethod
+    def _multiply_rows(rows, columns, block_size):
+        """
+        Multiplies a block of rows by a matrix given as a list of its columns
+        :param rows: Rows of the first matrix
+        :param columns: Columns of the second matrix
+        :param block_size: Number of columns per tile
+        :return: Rows of the product
+        """
+        mul = operator.mul
+        result = [[] for _ in rows]
+        for start in range(0, len(columns), block_size):
+            tile = columns[start:start + block_size]
+            for row, out in zip(rows, result):
+                out.extend([sum(map(mul, row, column)) for column in tile])
         return result
     
     @staticmethod
-    def multiply_matrices(matrix1, matrix2):
+    def _multiply_parallel(matrix1, columns, workers):
         """
-        Multiplies two matrices
+        Multiplies row blocks of matrix1 in worker processes over shared memory
+        :param matrix1: First matrix
+        :param columns: Columns of the second matrix
+        :param workers: Number of worker processes
+        :return: Product rows, or None if the elements cannot be shared
+                 (Fractions, complex or integers beyond 64 bits) or if
+                 integers mixed with floats are too large to be converted
+                 to floats without changing the result
+        """
+        values1 = list(chain.from_iterable(matrix1))
+        values2 = list(chain.from_iterable(columns))
+        typecode = infer_typecode(chain(values1, values2))
+        if typecode == OBJECT:
+            return None
+        
+        rows1 = len(matrix1)
+        cols1 = len(columns[0])
+        cols2 = len(columns)
+        if typecode == "d":
+            # The in-process loop multiplies and adds integer pairs exactly, so
+            # a float buffer only gives the same result while every integer
+            # product and partial sum is exactly representable as a float
+            bound1 = max((abs(val) for val in values1 if type(val) is int), default=0)
+            bound2 = max((abs(val) for val in values2 if type(val) is int), default=0)
+            if bound1 * bound2 * cols1 > _FLOAT_EXACT_LIMIT:
+                return None
+        data = array(typecode, chain(values1, values2))
+        
+        shm = shared_memory.SharedMemory(create=True, size=data.itemsize * len(data))
+        try:
+            shm.buf[:data.itemsize * len(data)] = memoryview(data).cast("B")
+            
+            chunk = max(1, -(-rows1 // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_multiply_shared_block, shm.name, typecode, rows1, cols1, cols2,
+                                    start, min(start + chunk, rows1), MatrixOperations.BLOCK_SIZE)
+                    for start in range(0, rows1, chunk)
+                ]
+                result = []
+                for future in futures:
+                    result.extend(future.result())
+            return result
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    @staticmethod
+    def multiply_strassen(matrix1, matrix2, cutoff=None):
+        """
+        Multiplies two matrices with the Strassen-Winograd recursion
+        
+        Each level replaces 8 block products by 7 (15 block additions), giving
+        O(n^2.81) work. Operands are zero-padded to a square size s * 2^k with
+        s <= cutoff, and blocks of size s are multiplied classically. Only
+        +, - and * are used, so integer and Fraction inputs give exact results;
+        float results may differ from the classical product by rounding.
         :param matrix1: First matrix
         :param matrix2: Second matrix
+        :param cutoff: Block size below which the classical kernel is used
+                       (defaults to STRASSEN_CUTOFF)
         :return: Product of the two matrices
         """
+        if isinstance(matrix1, Matrix):
+            matrix1 = matrix1.tolist()
+        if isinstance(matrix2, Matrix):
+            matrix2 = matrix2.tolist()
+        if cutoff is None:
+            cutoff = MatrixOperations.STRASSEN_CUTOFF
+        if cutoff < 1:
+            raise ValueError("Strassen cutoff must be positive")
+        
         rows1 = len(matrix1)
         cols1 = len(matrix1[0])
         rows2 = len(matrix2)
@@ -51,61 +218,362 @@ class MatrixOperations:
         if cols1 != rows2:
             raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
         
-        result = [[0 for _ in range(cols2)] for _ in range(rows1)]
+        n = max(rows1, cols1, cols2)
+        if n <= cutoff:
+            return MatrixOperations.multiply_matrices(matrix1, matrix2, workers=1)
         
-        for i in range(rows1):
-            for j in range(cols2):
-                for k in range(cols1):
-                    result[i][j] += matrix1[i][k] * matrix2[k][j]
+        # Smallest s * 2^k >= n with s <= cutoff, so every leaf is an s x s block
+        levels = 0
+        while -(-n // (1 << levels)) > cutoff:
+            levels += 1
+        size = -(-n // (1 << levels)) << levels
         
-        return result
+        a = MatrixOperations._pad(matrix1, size)
+        b = MatrixOperations._pad(matrix2, size)
+        product = MatrixOperations._strassen(a, b, cutoff)
+        return [row[:cols2] for row in product[:rows1]]
+    
+    @staticmethod
+    def _pad(matrix, size):
+        """
+        Zero-pads a matrix to size x size
+        :param matrix: Matrix
+        :param size: Target size
+        :return: Padded copy
+        """
+        extra = size - len(matrix[0])
+        padded = [list(row) + [0] * extra for row in matrix]
+        padded.extend([0] * size for _ in range(size - len(matrix)))
+        return padded
+    
+    @staticmethod
+    def _strassen(a, b, cutoff):
+        """
+        Strassen-Winograd recursion on square matrices whose size is s * 2^k
+        :param a: First matrix
+        :param b: Second matrix
+        :param cutoff: Size at which the classical kernel takes over
+        :return: Product of the two matrices
+        """
+        n = len(a)
+        if n <= cutoff or n % 2:
+            return MatrixOperations._multiply_rows(a, [list(column) for column in zip(*b)],
+                                                   MatrixOperations.BLOCK_SIZE)
+        
+        h = n // 2
+        add = MatrixOperations._add_blocks
+        sub = MatrixOperations._sub_blocks
+        a11 = [row[:h] for row in a[:h]]
+        a12 = [row[h:] for row in a[:h]]
+        a21 = [row[:h] for row in a[h:]]
+        a22 = [row[h:] for row in a[h:]]
+        b11 = [row[:h] for row in b[:h]]
+        b12 = [row[h:] for row in b[:h]]
+        b21 = [row[:h] for row in b[h:]]
+        b22 = [row[h:] for row in b[h:]]
+        
+        s1 = add(a21, a22)
+        s2 = sub(s1, a11)
+        s3 = sub(a11, a21)
+        s4 = sub(a12, s2)
+        t1 = sub(b12, b11)
+        t2 = sub(b22, t1)
+        t3 = sub(b22, b12)
+        t4 = sub(t2, b21)
+        
+        p1 = MatrixOperations._strassen(a11, b11, cutoff)
+        p2 = MatrixOperations._strassen(a12, b21, cutoff)
+        p3 = MatrixOperations._strassen(s4, b22, cutoff)
+        p4 = MatrixOperations._strassen(a22, t4, cutoff)
+        p5 = MatrixOperations._strassen(s1, t1, cutoff)
+        p6 = MatrixOperations._strassen(s2, t2, cutoff)
+        p7 = MatrixOperations._strassen(s3, t3, cutoff)
+        
+        u2 = add(p1, p6)
+        u3 = add(u2, p7)
+        u4 = add(u2, p5)
+        c11 = add(p1, p2)
+        c12 = add(u4, p3)
+        c21 = sub(u3, p4)
+        c22 = add(u3, p5)
+        
+        return [left + right for left, right in zip(c11, c12)] + \
+               [left + right for left, right in zip(c21, c22)]
+    
+    @staticmethod
+    def _add_blocks(block1, block2):
+        """
+        Adds two equally sized blocks
+        """
+        return [list(map(operator.add, row1, row2)) for row1, row2 in zip(block1, block2)]
+    
+    @staticmethod
+    def _sub_blocks(block1, block2):
+        """
+        Subtracts two equally sized blocks
+        """
+        return [list(map(operator.sub, row1, row2)) for row1, row2 in zip(block1, block2)]
     
     @staticmethod
-    def determinant(matrix):
+    def determinant(matrix, exact=None):
         """
-        Calculates the determinant of a square matrix using cofactor expansion
+        Calculates the determinant of a square matrix in O(n^3)
+        
+        Matrices of integers and fractions.Fraction values are reduced with
+        fraction-free Bareiss elimination, so the result is exact (an int for
+        integer input). Any other matrix goes through LU decomposition with
+        partial pivoting.
         :param matrix: Square matrix
+        :param exact: True forces exact elimination (floats are converted to
+                      Fraction), False forces floating-point LU, None picks
+                      the mode from the element types
         :return: Determinant of the matrix
         """
+        if isinstance(matrix, Matrix):
+            matrix = matrix.tolist()
+        
         n = len(matrix)
         
         for i in range(n):
             if len(matrix[i]) != n:
                 raise ValueError("Matrix must be square to calculate determinant")
         
-        if n == 1:
-            return matrix[0][0]
+        if exact is None:
+            if n == 1:
+                return matrix[0][0]
+            
+            if n == 2:
+                return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
+            
+            exact = MatrixOperations._is_exact(matrix)
         
-        if n == 2:
-            return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-        
-        det = 0
-        for j in range(n):
-            det += matrix[0][j] * MatrixOperations._cofactor(matrix, 0, j)
+        if exact:
+            return MatrixOperations._bareiss_determinant(matrix)
         
+        lu, _, sign = MatrixOperations.lu_decomposition(matrix)
+        det = sign
+        for i in range(n):
+            det *= lu[i][i]
         return det
     
     @staticmethod
-    def _cofactor(matrix, row, col):
+    def lu_decomposition(matrix, exact=False):
         """
-        Calculates the cofactor of a matrix element
-        :param matrix: Matrix
-        :param row: Row index
-        :param col: Column index
-        :return: Cofactor of the element at (row, col)
+        Computes the LU decomposition PA = LU using partial pivoting
+        :param matrix: Square matrix
+        :param exact: Eliminate with fractions.Fraction instead of floats
+        :return: Tuple (lu, permutation, sign) where lu holds U on and above the
+                 diagonal and the multipliers of the unit lower-triangular L
+                 below it, permutation[i] is the row of A that ended up in row i,
+                 and sign is the parity (+1/-1) of the row permutation
         """
+        if isinstance(matrix, Matrix):
+            matrix = matrix.tolist()
+        
         n = len(matrix)
-        minor = [[0 for _ in range(n - 1)] for _ in range(n - 1)]
         
         for i in range(n):
-            for j in range(n):
-                if i != row and j != col:
-                    minor_row = i if i < row else i - 1
-                    minor_col = j if j < col else j - 1
-                    minor[minor_row][minor_col] = matrix[i][j]
+            if len(matrix[i]) != n:
+                raise ValueError("Matrix must be square for LU decomposition")
+        
+        convert = Fraction if exact else float
+        lu = [[convert(val) if exact or isinstance(val, numbers.Rational) else val for val in row]
+              for row in matrix]
+        permutation = list(range(n))
+        sign = 1
+        
+        for k in range(n):
+            # Choose the largest remaining entry of column k as the pivot
+            pivot_row = max(range(k, n), key=lambda r: abs(lu[r][k]))
+            if lu[pivot_row][k] == 0:
+                # Singular column: nothing to eliminate, U[k][k] stays zero
+                continue
+            if pivot_row != k:
+                lu[k], lu[pivot_row] = lu[pivot_row], lu[k]
+                permutation[k], permutation[pivot_row] = permutation[pivot_row], permutation[k]
+                sign = -sign
+            
+            pivot = lu[k][k]
+            upper = lu[k][k + 1:]
+            for i in range(k + 1, n):
+                row = lu[i]
+                factor = row[k] / pivot
+                row[k] = factor
+                if factor:
+                    row[k + 1:] = [a - factor * b for a, b in zip(row[k + 1:], upper)]
+        
+        return lu, permutation, sign
+    
+    @staticmethod
+    def lu_factor(matrix, exact=None):
+        """
+        Returns the LU factorization of a square matrix, reusing a cached one
+        
+        Factorizations are kept in an LRU cache (FACTOR_CACHE_SIZE entries)
+        keyed by the matrix contents, so repeated solves against the same
+        system only pay for the O(n^3) elimination once.
+        :param matrix: Square matrix (list of lists, Matrix or sparse matrix)
+        :param exact: True factors with Fractions, False with floats, None picks
+                      exact mode for int/Fraction matrices
+        :return: LUFactorization(lu, permutation, sign, exact) with lu stored
+                 as a tuple of row tuples
+        """
+        matrix = MatrixOperations._dense(matrix)
+        if exact is None:
+            exact = MatrixOperations._is_exact(matrix)
+        return MatrixOperations._cached_factor()(tuple(map(tuple, matrix)), bool(exact))
+    
+    @staticmethod
+    def _cached_factor():
+        """
+        Returns the cached factorization function, rebuilding the cache when
+        FACTOR_CACHE_SIZE has changed since it was created
+        """
+        cache = MatrixOperations._factor_cache
+        size = MatrixOperations.FACTOR_CACHE_SIZE
+        if cache is None or cache.cache_parameters()["maxsize"] != size:
+            cache = functools.lru_cache(maxsize=size)(_lu_factor)
+            MatrixOperations._factor_cache = cache
+        return cache
+    
+    @staticmethod
+    def lu_solve(factorization, b):
+        """
+        Solves Ax = b using a factorization returned by lu_factor
+        :param factorization: LUFactorization of A
+        :param b: Right-hand side vector
+        :return: Solution vector x
+        """
+        lu, permutation = factorization.lu, factorization.permutation
+        n = len(lu)
+        if len(b) != n:
+            raise ValueError("Right-hand side length must equal the matrix size")
+        
+        # Forward substitution with the unit lower-triangular L
+        y = [b[p] for p in permutation]
+        if factorization.exact:
+            y = [val if isinstance(val, numbers.Rational) else Fraction(val) for val in y]
+        for i in range(1, n):
+            row = lu[i]
+            y[i] -= sum(map(operator.mul, row[:i], y[:i]))
+        
+        # Back substitution with U
+        x = [0] * n
+        for i in range(n - 1, -1, -1):
+            row = lu[i]
+            if row[i] == 0:
+                raise ValueError("Matrix is singular")
+            x[i] = (y[i] - sum(map(operator.mul, row[i + 1:], x[i + 1:]))) / row[i]
+        return x
+    
+    @staticmethod
+    def solve(matrix, b, exact=None):
+        """
+        Solves the linear system Ax = b
+        :param matrix: Square matrix A
+        :param b: Right-hand side vector
+        :param exact: See lu_factor
+        :return: Solution vector x
+        """
+        return MatrixOperations.lu_solve(MatrixOperations.lu_factor(matrix, exact), b)
+    
+    @staticmethod
+    def solve_many(matrix, right_hand_sides, exact=None):
+        """
+        Solves Ax = b for several right-hand sides with a single factorization
+        :param matrix: Square matrix A
+        :param right_hand_sides: Iterable of vectors b1..bk
+        :param exact: See lu_factor
+        :return: List of solution vectors
+        """
+        factorization = MatrixOperations.lu_factor(matrix, exact)
+        return [MatrixOperations.lu_solve(factorization, b) for b in right_hand_sides]
+    
+    @staticmethod
+    def inverse(matrix, exact=None):
+        """
+        Calculates the inverse of a square matrix
+        :param matrix: Square matrix
+        :param exact: See lu_factor; integer matrices give a Fraction inverse
+        :return: Inverse matrix
+        """
+        factorization = MatrixOperations.lu_factor(matrix, exact)
+        n = len(factorization.lu)
+        columns = [MatrixOperations.lu_solve(factorization, [int(i == j) for i in range(n)])
+                   for j in range(n)]
+        return [list(row) for row in zip(*columns)]
+    
+    @staticmethod
+    def clear_factor_cache():
+        """
+        Drops every cached factorization
+        """
+        if MatrixOperations._factor_cache is not None:
+            MatrixOperations._factor_cache.cache_clear()
+    
+    @staticmethod
+    def _dense(matrix):
+        """
+        Converts Matrix and sparse operands into a list of lists
+        """
+        if isinstance(matrix, Matrix):
+            return matrix.tolist()
+        if isinstance(matrix, (CSRMatrix, COOMatrix)):
+            return matrix.to_dense()
+        return matrix
+    
+    @staticmethod
+    def _is_exact(matrix):
+        """
+        Checks whether every element is an int or a Fraction
+        :param matrix: Matrix
+        :return: True if exact arithmetic can be used
+        """
+        return all(isinstance(val, numbers.Rational) for row in matrix for val in row)
+    
+    @staticmethod
+    def _bareiss_determinant(matrix):
+        """
+        Calculates the determinant with fraction-free Bareiss elimination
+        :param matrix: Square matrix of ints, Fractions or floats (converted to Fraction)
+        :return: Exact determinant
+        """
+        n = len(matrix)
+        if n == 0:
+            # Empty product: the determinant of the 0x0 matrix is 1
+            return 1
+        integral = all(type(val) is int for row in matrix for val in row)
+        if integral:
+            a = [list(row) for row in matrix]
+        else:
+            a = [[val if isinstance(val, numbers.Rational) else Fraction(val) for val in row]
+                 for row in matrix]
         
-        sign = 1 if (row + col) % 2 == 0 else -1
-        return sign * MatrixOperations.determinant(minor)
+        sign = 1
+        previous = 1
+        for k in range(n - 1):
+            if a[k][k] == 0:
+                swap = next((i for i in range(k + 1, n) if a[i][k] != 0), None)
+                if swap is None:
+                    return 0
+                a[k], a[swap] = a[swap], a[k]
+                sign = -sign
+            
+            pivot = a[k][k]
+            pivot_row = a[k]
+            for i in range(k + 1, n):
+                row = a[i]
+                lead = row[k]
+                # Every division here is exact (Sylvester's identity)
+                if integral:
+                    for j in range(k + 1, n):
+                        row[j] = (row[j] * pivot - lead * pivot_row[j]) // previous
+                else:
+                    for j in range(k + 1, n):
+                        row[j] = (row[j] * pivot - lead * pivot_row[j]) / previous
+            previous = pivot
+        
+        return sign * a[n - 1][n - 1]
     
     @staticmethod
     def print_matrix(matrix):
@@ -113,12 +581,50 @@ class MatrixOperations:
         Prints a matrix to the console
         :param matrix: Matrix to print
         """
+        if isinstance(matrix, Matrix):
+            matrix = matrix.tolist()
+        
         for row in matrix:
             print("[ ", end="")
             for val in row:
                 print(f"{val} ", end="")
             print("]")
 
+def _lu_factor(key, exact):
+    """
+    Factors a matrix given as a tuple of row tuples (the cache key)
+    :param key: Matrix contents
+    :param exact: Whether to factor with Fractions
+    :return: LUFactorization
+    """
+    lu, permutation, sign = MatrixOperations.lu_decomposition(key, exact)
+    return LUFactorization(tuple(map(tuple, lu)), tuple(permutation), sign, exact)
+
+def _multiply_shared_block(name, typecode, rows1, cols1, cols2, start, stop, block_size):
+    """
+    Worker entry point: multiplies rows start..stop of the first matrix
+    :param name: Name of the shared memory block holding matrix1 followed by
+                 the columns of matrix2, both row-major
+    :param typecode: Element type of the shared buffer ('d' or 'q')
+    :param rows1: Rows of the first matrix
+    :param cols1: Columns of the first matrix
+    :param cols2: Columns of the second matrix
+    :param start: First row of the block
+    :param stop: Row after the last row of the block
+    :param block_size: Number of columns per tile
+    :return: Rows of the product for this block
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = shm.buf.cast(typecode)
+        rows = [view[i * cols1:(i + 1) * cols1].tolist() for i in range(start, stop)]
+        base = rows1 * cols1
+        columns = [view[base + j * cols1:base + (j + 1) * cols1].tolist() for j in range(cols2)]
+        view.release()
+    finally:
+        shm.close()
+    return MatrixOperations._multiply_rows(rows, columns, block_size)
+
 def main():
     """
     Main function to demonstrate matrix operations
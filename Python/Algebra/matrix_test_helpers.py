@@ -0,0 +1,24 @@
+"""
+matrix_test_helpers.py
+Author: Андрій Будильников
+
+Input factories and comparisons shared by the algebra tests
+"""
+
+import random
+
+def random_matrix(rows, cols, seed, integer=False):
+    """rows x cols matrix of floats in [-2, 2], or of ints in [-9, 9]"""
+    rng = random.Random(seed)
+    if integer:
+        return [[rng.randint(-9, 9) for _ in range(cols)] for _ in range(rows)]
+    return [[rng.uniform(-2.0, 2.0) for _ in range(cols)] for _ in range(rows)]
+
+def assert_close(actual, expected, tolerance=1e-9):
+    """assert two flat sequences or lists of rows agree within tolerance"""
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if isinstance(e, list):
+            assert_close(a, e, tolerance)
+        else:
+            assert abs(a - e) <= tolerance * max(1.0, abs(e)), (a, e)
@@ -0,0 +1,491 @@
+"""
+Sparse Matrices
+Author: Андрій Будильников
+
+This module provides COOMatrix (coordinate list) and CSRMatrix (compressed
+sparse row) types. Only the non-zero entries are stored, in compact array
+buffers for the indices and the values, so memory and running time of the
+operations grow with the number of non-zeros (nnz) instead of rows * cols.
+"""
+
+import operator
+from array import array
+
+from matrix import OBJECT, Matrix, infer_typecode, make_buffer, result_buffer
+
+# Typecode of the index buffers
+INDEX_TYPECODE = "q"
+
+
+def _values_buffer(values):
+    """
+    Stores values in the most compact buffer that holds them exactly
+    :param values: List of values
+    :return: array or list
+    """
+    return make_buffer(infer_typecode(values), values)
+
+
+def _dense_rows(dense):
+    """
+    Returns a dense operand as a list of rows
+    :param dense: List of lists or Matrix
+    :return: List of lists
+    """
+    return dense.tolist() if isinstance(dense, Matrix) else dense
+
+
+def _zero_for(data):
+    """
+    Returns the zero used to fill dense results for the given value buffer
+    """
+    return 0.0 if isinstance(data, array) and data.typecode == "d" else 0
+
+
+def _is_vector(value):
+    """
+    Checks whether a dense operand is a flat vector rather than a list of rows
+    """
+    return len(value) > 0 and not isinstance(value[0], (list, tuple, array))
+
+
+class CSRMatrix:
+    """
+    Compressed sparse row matrix
+
+    The column indices and values of row i are indices[indptr[i]:indptr[i + 1]]
+    and data[indptr[i]:indptr[i + 1]], sorted by column.
+    """
+
+    __slots__ = ("shape", "indptr", "indices", "data")
+
+    def __init__(self, shape, indptr, indices, data):
+        """
+        Creates a CSR matrix from its buffers
+        :param shape: (rows, cols)
+        :param indptr: Row pointers, length rows + 1
+        :param indices: Column index of every stored value
+        :param data: Stored values
+        """
+        rows, cols = shape
+        if len(indptr) != rows + 1:
+            raise ValueError("indptr must have rows + 1 entries")
+        if len(indices) != len(data) or indptr[-1] != len(data):
+            raise ValueError("indices and data must both have indptr[-1] entries")
+        self.shape = (rows, cols)
+        self.indptr = indptr if isinstance(indptr, array) else array(INDEX_TYPECODE, indptr)
+        self.indices = indices if isinstance(indices, array) else array(INDEX_TYPECODE, indices)
+        self.data = data if isinstance(data, array) else _values_buffer(list(data))
+
+    @classmethod
+    def from_dense(cls, dense):
+        """
+        Builds a CSR matrix from a dense list of lists, dropping zeros
+        :param dense: List of lists or Matrix
+        :return: CSRMatrix
+        """
+        dense = _dense_rows(dense)
+        rows = len(dense)
+        cols = len(dense[0]) if rows else 0
+        indptr = array(INDEX_TYPECODE, [0])
+        indices = array(INDEX_TYPECODE)
+        values = []
+        for row in dense:
+            if len(row) != cols:
+                raise ValueError("All rows must have the same length")
+            for j, val in enumerate(row):
+                if val:
+                    indices.append(j)
+                    values.append(val)
+            indptr.append(len(values))
+        return cls((rows, cols), indptr, indices, _values_buffer(values))
+
+    @property
+    def nnz(self):
+        """
+        Number of stored values
+        """
+        return len(self.data)
+
+    def to_dense(self):
+        """
+        Converts the matrix into a dense list of lists
+        :return: List of rows
+        """
+        rows, cols = self.shape
+        zero = _zero_for(self.data)
+        indptr, indices, data = self.indptr, self.indices, self.data
+        dense = []
+        for i in range(rows):
+            row = [zero] * cols
+            for p in range(indptr[i], indptr[i + 1]):
+                row[indices[p]] = data[p]
+            dense.append(row)
+        return dense
+
+    def tocsr(self):
+        """
+        Returns self (for symmetry with COOMatrix.tocsr)
+        """
+        return self
+
+    def tocoo(self):
+        """
+        Converts the matrix into coordinate format
+        :return: COOMatrix
+        """
+        indptr = self.indptr
+        row = array(INDEX_TYPECODE)
+        for i in range(self.shape[0]):
+            row.extend(array(INDEX_TYPECODE, [i]) * (indptr[i + 1] - indptr[i]))
+        return COOMatrix(self.shape, row, array(INDEX_TYPECODE, self.indices), self.data[:])
+
+    def transpose(self):
+        """
+        Returns the transpose in CSR format (a counting sort over the columns)
+        :return: CSRMatrix
+        """
+        rows, cols = self.shape
+        indptr, indices, data = self.indptr, self.indices, self.data
+        counts = [0] * (cols + 1)
+        for j in indices:
+            counts[j + 1] += 1
+        for j in range(cols):
+            counts[j + 1] += counts[j]
+        new_indptr = array(INDEX_TYPECODE, counts)
+        position = counts[:-1]
+        new_indices = array(INDEX_TYPECODE, [0]) * len(data)
+        new_data = data[:]
+        for i in range(rows):
+            for p in range(indptr[i], indptr[i + 1]):
+                j = indices[p]
+                q = position[j]
+                new_indices[q] = i
+                new_data[q] = data[p]
+                position[j] = q + 1
+        return CSRMatrix((cols, rows), new_indptr, new_indices, new_data)
+
+    @property
+    def T(self):
+        """
+        Transposed matrix
+        """
+        return self.transpose()
+
+    def row_items(self, i):
+        """
+        Returns the stored entries of row i
+        :param i: Row index
+        :return: Tuple (column indices, values)
+        """
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def spmv(self, vector):
+        """
+        Sparse matrix-vector product
+        :param vector: Sequence of length cols
+        :return: List of length rows
+        """
+        if len(vector) != self.shape[1]:
+            raise ValueError("Vector length must equal the number of columns")
+        mul = operator.mul
+        take = vector.__getitem__
+        indptr, indices, data = self.indptr, self.indices, self.data
+        return [sum(map(mul, data[indptr[i]:indptr[i + 1]], map(take, indices[indptr[i]:indptr[i + 1]])))
+                for i in range(self.shape[0])]
+
+    def _combine(self, other, sign):
+        """
+        Adds (sign = 1) or subtracts (sign = -1) another sparse matrix row by row
+        """
+        if self.shape != other.shape:
+            raise ValueError("Matrices must have the same dimensions for addition")
+        indptr = array(INDEX_TYPECODE, [0])
+        indices = array(INDEX_TYPECODE)
+        values = []
+        for i in range(self.shape[0]):
+            cols1, vals1 = self.row_items(i)
+            acc = dict(zip(cols1, vals1))
+            cols2, vals2 = other.row_items(i)
+            for j, val in zip(cols2, vals2):
+                acc[j] = acc.get(j, 0) + val if sign > 0 else acc.get(j, 0) - val
+            for j in sorted(acc):
+                val = acc[j]
+                if val:
+                    indices.append(j)
+                    values.append(val)
+            indptr.append(len(values))
+        return CSRMatrix(self.shape, indptr, indices, _values_buffer(values))
+
+    def _dense_combine(self, dense, sign):
+        """
+        Adds a dense matrix, returning a dense list of lists
+        """
+        dense = _dense_rows(dense)
+        rows, cols = self.shape
+        if len(dense) != rows or (rows and len(dense[0]) != cols):
+            raise ValueError("Matrices must have the same dimensions for addition")
+        result = [list(row) if sign > 0 else [-val for val in row] for row in dense]
+        for i in range(rows):
+            out = result[i]
+            for j, val in zip(*self.row_items(i)):
+                out[j] += val
+        return result
+
+    def __add__(self, other):
+        if isinstance(other, (CSRMatrix, COOMatrix)):
+            return self._combine(other.tocsr(), 1)
+        if isinstance(other, (list, Matrix)):
+            return self._dense_combine(other, 1)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, (CSRMatrix, COOMatrix)):
+            return self._combine(other.tocsr(), -1)
+        if isinstance(other, (list, Matrix)):
+            return self._dense_combine(other, -1)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (list, Matrix)):
+            return [[-val for val in row] for row in self._dense_combine(other, -1)]
+        return NotImplemented
+
+    def __neg__(self):
+        typecode = self.data.typecode if isinstance(self.data, array) else OBJECT
+        return CSRMatrix(self.shape, self.indptr[:], self.indices[:],
+                         result_buffer(typecode, map(operator.neg, self.data)))
+
+    def _sparse_product(self, other):
+        """
+        Sparse x sparse product (Gustavson's row-by-row algorithm)
+        """
+        if self.shape[1] != other.shape[0]:
+            raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
+        indptr = array(INDEX_TYPECODE, [0])
+        indices = array(INDEX_TYPECODE)
+        values = []
+        for i in range(self.shape[0]):
+            acc = {}
+            for k, a in zip(*self.row_items(i)):
+                for j, b in zip(*other.row_items(k)):
+                    acc[j] = acc.get(j, 0) + a * b
+            for j in sorted(acc):
+                val = acc[j]
+                if val:
+                    indices.append(j)
+                    values.append(val)
+            indptr.append(len(values))
+        return CSRMatrix((self.shape[0], other.shape[1]), indptr, indices, _values_buffer(values))
+
+    def _dense_product(self, dense):
+        """
+        Sparse x dense product, returning a dense list of lists
+        """
+        dense = _dense_rows(dense)
+        if self.shape[1] != len(dense):
+            raise ValueError("Number of columns in first matrix must equal number of rows in second matrix")
+        cols = len(dense[0]) if dense else 0
+        result = []
+        for i in range(self.shape[0]):
+            out = [0] * cols
+            for k, a in zip(*self.row_items(i)):
+                out = [o + a * b for o, b in zip(out, dense[k])]
+            result.append(out)
+        return result
+
+    def __matmul__(self, other):
+        """
+        self @ other for a sparse matrix (CSR result), a dense list of lists
+        or Matrix (dense result) or a flat vector (SpMV, list result)
+        """
+        if isinstance(other, (CSRMatrix, COOMatrix)):
+            return self._sparse_product(other.tocsr())
+        if isinstance(other, Matrix):
+            return self._dense_product(other)
+        if isinstance(other, (list, tuple, array)):
+            return self.spmv(other) if _is_vector(other) else self._dense_product(other)
+        return NotImplemented
+
+    def __rmatmul__(self, other):
+        """
+        dense @ sparse, computed as (sparse^T @ dense^T)^T
+        """
+        if isinstance(other, Matrix):
+            other = other.tolist()
+        if not isinstance(other, list):
+            return NotImplemented
+        if _is_vector(other):
+            return self.transpose().spmv(other)
+        columns = [list(column) for column in zip(*other)]
+        return [list(row) for row in zip(*self.transpose()._dense_product(columns))]
+
+    def __eq__(self, other):
+        if isinstance(other, (CSRMatrix, COOMatrix)):
+            other = other.tocsr()
+            return (self.shape == other.shape and list(self.indptr) == list(other.indptr)
+                    and list(self.indices) == list(other.indices) and list(self.data) == list(other.data))
+        if isinstance(other, list):
+            return self.to_dense() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CSRMatrix(shape={self.shape}, nnz={self.nnz})"
+
+
+class COOMatrix:
+    """
+    Coordinate-list sparse matrix: entry p is data[p] at (row[p], col[p])
+
+    Duplicate coordinates are allowed and are summed when converting to CSR.
+    Arithmetic converts to CSR first.
+    """
+
+    __slots__ = ("shape", "row", "col", "data")
+
+    def __init__(self, shape, row, col, data):
+        """
+        Creates a COO matrix from its buffers
+        :param shape: (rows, cols)
+        :param row: Row index of every stored value
+        :param col: Column index of every stored value
+        :param data: Stored values
+        """
+        if not len(row) == len(col) == len(data):
+            raise ValueError("row, col and data must have the same length")
+        self.shape = tuple(shape)
+        self.row = row if isinstance(row, array) else array(INDEX_TYPECODE, row)
+        self.col = col if isinstance(col, array) else array(INDEX_TYPECODE, col)
+        self.data = data if isinstance(data, array) else _values_buffer(list(data))
+
+    @classmethod
+    def from_dense(cls, dense):
+        """
+        Builds a COO matrix from a dense list of lists, dropping zeros
+        :param dense: List of lists or Matrix
+        :return: COOMatrix
+        """
+        dense = _dense_rows(dense)
+        rows = len(dense)
+        cols = len(dense[0]) if rows else 0
+        row = array(INDEX_TYPECODE)
+        col = array(INDEX_TYPECODE)
+        values = []
+        for i, dense_row in enumerate(dense):
+            if len(dense_row) != cols:
+                raise ValueError("All rows must have the same length")
+            for j, val in enumerate(dense_row):
+                if val:
+                    row.append(i)
+                    col.append(j)
+                    values.append(val)
+        return cls((rows, cols), row, col, _values_buffer(values))
+
+    @property
+    def nnz(self):
+        """
+        Number of stored values (duplicates counted separately)
+        """
+        return len(self.data)
+
+    def to_dense(self):
+        """
+        Converts the matrix into a dense list of lists
+        :return: List of rows
+        """
+        rows, cols = self.shape
+        zero = _zero_for(self.data)
+        dense = [[zero] * cols for _ in range(rows)]
+        for i, j, val in zip(self.row, self.col, self.data):
+            dense[i][j] += val
+        return dense
+
+    def tocsr(self):
+        """
+        Converts the matrix into CSR format, summing duplicate entries
+        :return: CSRMatrix
+        """
+        rows, cols = self.shape
+        order = sorted(range(len(self.data)), key=lambda p: (self.row[p], self.col[p]))
+        indptr = array(INDEX_TYPECODE, [0]) * (rows + 1)
+        indices = array(INDEX_TYPECODE)
+        values = []
+        last = None
+        for p in order:
+            key = (self.row[p], self.col[p])
+            if key == last:
+                values[-1] += self.data[p]
+                continue
+            last = key
+            indices.append(key[1])
+            values.append(self.data[p])
+            indptr[key[0] + 1] += 1
+        for i in range(rows):
+            indptr[i + 1] += indptr[i]
+        return CSRMatrix((rows, cols), indptr, indices, _values_buffer(values))
+
+    def tocoo(self):
+        """
+        Returns self (for symmetry with CSRMatrix.tocoo)
+        """
+        return self
+
+    def transpose(self):
+        """
+        Returns the transpose (the index buffers are swapped, not copied)
+        :return: COOMatrix
+        """
+        return COOMatrix((self.shape[1], self.shape[0]), self.col, self.row, self.data)
+
+    @property
+    def T(self):
+        """
+        Transposed matrix
+        """
+        return self.transpose()
+
+    def spmv(self, vector):
+        """
+        Sparse matrix-vector product
+        :param vector: Sequence of length cols
+        :return: List of length rows
+        """
+        if len(vector) != self.shape[1]:
+            raise ValueError("Vector length must equal the number of columns")
+        result = [0] * self.shape[0]
+        for i, j, val in zip(self.row, self.col, self.data):
+            result[i] += val * vector[j]
+        return result
+
+    def __add__(self, other):
+        return self.tocsr().__add__(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.tocsr().__sub__(other)
+
+    def __rsub__(self, other):
+        return self.tocsr().__rsub__(other)
+
+    def __neg__(self):
+        return -self.tocsr()
+
+    def __matmul__(self, other):
+        return self.tocsr().__matmul__(other)
+
+    def __rmatmul__(self, other):
+        return self.tocsr().__rmatmul__(other)
+
+    def __eq__(self, other):
+        return self.tocsr().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"COOMatrix(shape={self.shape}, nnz={self.nnz})"
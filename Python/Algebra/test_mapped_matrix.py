@@ -0,0 +1,121 @@
+"""
+test_mapped_matrix.py
+Author: Андрій Будильников
+
+Test file for memory-mapped out-of-core matrices
+"""
+
+import os
+import struct
+import tempfile
+
+from mapped_matrix import HEADER_SIZE, MappedMatrix
+from matrix_operations import MatrixOperations
+from matrix_test_helpers import assert_close, random_matrix
+
+def test_round_trip():
+    """test that a saved matrix opens with the same shape, type and values"""
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [(random_matrix(5, 3, 1), (5, 3), "d"), (random_matrix(4, 7, 2, integer=True), (4, 7), "q"),
+                 ([], (0, 0), "q")]
+        for matrix, shape, typecode in cases:
+            path = os.path.join(directory, "matrix.bin")
+            MappedMatrix.from_list(path, matrix).close()
+            with MappedMatrix(path) as mapped:
+                assert mapped.tolist() == matrix
+                assert mapped.shape == shape and mapped.typecode == typecode
+            assert os.path.getsize(path) == HEADER_SIZE + shape[0] * shape[1] * 8
+        path = os.path.join(directory, "written.bin")
+        with MappedMatrix.create(path, 2, 3, "q") as mapped:
+            mapped[1, 2] = 42
+            mapped.write_tile(0, 1, [[7, 8]])
+        with MappedMatrix(path) as mapped:
+            assert mapped.tolist() == [[0, 7, 8], [0, 0, 42]]
+            assert mapped[1, 2] == 42
+    print("round trip tests passed")
+
+def test_bad_headers():
+    """test that files that are not matrix files are rejected"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "matrix.bin")
+        MappedMatrix.from_list(path, [[1.0, 2.0]]).close()
+        with open(path, "rb") as file:
+            good = file.read()
+        other_order = b">" if good[6:7] == b"<" else b"<"
+        bad_files = [
+            good[:HEADER_SIZE - 1],
+            b"XXXX" + good[4:],
+            good[:4] + struct.pack("B", 2) + good[5:],
+            good[:6] + other_order + good[7:],
+        ]
+        for content in bad_files:
+            with open(path, "wb") as file:
+                file.write(content)
+            try:
+                MappedMatrix(path)
+                assert False, "bad header must raise"
+            except ValueError:
+                pass
+        for call in (lambda: MappedMatrix(path, "w"), lambda: MappedMatrix.create(path, 1, 1, "f")):
+            try:
+                call()
+                assert False, "bad mode or typecode must raise"
+            except ValueError:
+                pass
+    print("bad header tests passed")
+
+def test_add_and_multiply():
+    """test add and multiply against the dense operations for several tile sizes"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = lambda name: os.path.join(directory, name)
+        for integer in (True, False):
+            a = MappedMatrix.from_list(path("a.bin"), random_matrix(7, 5, 3, integer))
+            b = MappedMatrix.from_list(path("b.bin"), random_matrix(5, 6, 4, integer))
+            c = MappedMatrix.from_list(path("c.bin"), random_matrix(7, 5, 5, integer))
+            expected = MatrixOperations.multiply_matrices(a.tolist(), b.tolist(), workers=1)
+            for tile_size in (1, 2, 3, 5, 64):
+                with a.multiply(b, path("product.bin"), tile_size=tile_size) as product:
+                    assert product.typecode == a.typecode
+                    if integer:
+                        assert product.tolist() == expected
+                    else:
+                        assert_close(product.tolist(), expected)
+            # a small memory limit forces single-row blocks and 1 x 1 tiles
+            with a.multiply(b, path("product.bin"), memory_limit=1) as product:
+                assert_close(product.tolist(), expected)
+            with a.add(c, path("sum.bin"), memory_limit=1) as total:
+                assert total.tolist() == MatrixOperations.add_matrices(a.tolist(), c.tolist())
+            try:
+                a.multiply(c, path("product.bin"))
+                assert False, "mismatched shapes must raise"
+            except ValueError:
+                pass
+            for matrix in (a, b, c):
+                matrix.close()
+    print("add and multiply tests passed")
+
+def test_int_overflow_widens():
+    """test that int results that could overflow int64 are stored as floats"""
+    big = 1 << 62
+    with tempfile.TemporaryDirectory() as directory:
+        path = lambda name: os.path.join(directory, name)
+        with MappedMatrix.from_list(path("a.bin"), [[big, 1], [2, 3]]) as a, \
+                MappedMatrix.from_list(path("b.bin"), [[big, 0], [0, 1]]) as b:
+            assert a.typecode == b.typecode == "q"
+            with a.add(b, path("sum.bin")) as total:
+                assert total.typecode == "d"
+                assert total.tolist() == [[2.0 * big, 1.0], [2.0, 4.0]]
+            with a.multiply(b, path("product.bin"), tile_size=1) as product:
+                assert product.typecode == "d"
+                assert product.tolist() == [[float(big * big), 1.0], [2.0 * big, 3.0]]
+        with MappedMatrix.from_list(path("small.bin"), [[1, 2], [3, 4]]) as small:
+            with small.multiply(small, path("square.bin")) as square:
+                assert square.typecode == "q" and square.tolist() == [[7, 10], [15, 22]]
+    print("int overflow tests passed")
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_bad_headers()
+    test_add_and_multiply()
+    test_int_overflow_widens()
+    print("all tests passed! 🎉")
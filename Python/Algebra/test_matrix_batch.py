@@ -0,0 +1,65 @@
+"""
+test_matrix_batch.py
+Author: Андрій Будильников
+
+Test file for batched small-matrix kernels
+"""
+
+from matrix_batch import MatrixBatch
+from matrix_operations import MatrixOperations
+from matrix_test_helpers import assert_close, random_matrix
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def test_unrolled_kernels():
+    """test the unrolled 2x2, 3x3 and 4x4 kernels against matrix operations"""
+    for n in (2, 3, 4):
+        matrices = [random_matrix(n, n, seed, integer=True) for seed in range(6)]
+        stack = MatrixBatch.pack(matrices, "q")
+        determinants = MatrixBatch.determinant_batch(stack, n)
+        assert list(determinants) == [MatrixOperations.determinant(matrix) for matrix in matrices]
+        products = MatrixBatch.unpack(MatrixBatch.multiply_batch(stack, stack, n), n)
+        assert products == [MatrixOperations.multiply_matrices(matrix, matrix) for matrix in matrices]
+    print("unrolled kernel tests passed")
+
+def test_integer_stacks_ignore_numpy_flag():
+    """test that use_numpy=True keeps integer stacks on the exact kernels"""
+    big = 1 << 40
+    stack = MatrixBatch.pack([[[big, 1], [3, big]], [[2, big], [big, 5]]], "q")
+    determinants = MatrixBatch.determinant_batch(stack, 2, use_numpy=True)
+    # exact values beyond 64 bits, which neither float64 nor int64 could hold
+    assert list(determinants) == [big * big - 3, 10 - big * big]
+    products = MatrixBatch.multiply_batch(stack, stack, 2, use_numpy=True)
+    assert list(products) == list(MatrixBatch.multiply_batch(stack, stack, 2, use_numpy=False))
+    print("integer stack tests passed")
+
+def test_numpy_path():
+    """test the numpy path against the pure-python kernels"""
+    stack = MatrixBatch.pack([random_matrix(2, 2, 1)])
+    if numpy is None:
+        try:
+            MatrixBatch.determinant_batch(stack, 2, use_numpy=True)
+            assert False, "use_numpy=True without numpy must raise"
+        except ImportError:
+            pass
+        print("numpy not installed, numpy path tests skipped")
+        return
+    for n in (2, 3, 4):
+        stack_a = MatrixBatch.pack([random_matrix(n, n, seed) for seed in range(20)])
+        stack_b = MatrixBatch.pack([random_matrix(n, n, seed) for seed in range(20, 40)])
+        fast = MatrixBatch.determinant_batch(stack_a, n, use_numpy=True)
+        slow = MatrixBatch.determinant_batch(stack_a, n, use_numpy=False)
+        assert_close(fast, slow)
+        fast = MatrixBatch.multiply_batch(stack_a, stack_b, n, use_numpy=True)
+        slow = MatrixBatch.multiply_batch(stack_a, stack_b, n, use_numpy=False)
+        assert_close(fast, slow)
+    print("numpy path tests passed")
+
+if __name__ == "__main__":
+    test_unrolled_kernels()
+    test_integer_stacks_ignore_numpy_flag()
+    test_numpy_path()
+    print("all tests passed! 🎉")
@@ -0,0 +1,242 @@
+"""
+test_matrix_operations.py
+Author: Андрій Будильников
+
+Test file for matrix operations module
+"""
+
+from fractions import Fraction
+
+from matrix import Matrix
+from matrix_operations import MatrixOperations
+from sparse_matrix import COOMatrix, CSRMatrix
+
+def test_determinant_integer():
+    """test exact determinant of integer matrices"""
+    assert MatrixOperations.determinant([[5]]) == 5
+    assert MatrixOperations.determinant([[1, 2], [3, 4]]) == -2
+    assert MatrixOperations.determinant([[2, -3, 1], [2, 0, -1], [1, 4, 5]]) == 49
+    assert MatrixOperations.determinant([[0, 0, 1], [0, 1, 0], [1, 0, 0]]) == -1
+    assert MatrixOperations.determinant([[1, 2, 3], [2, 4, 6], [1, 1, 1]]) == 0
+    # the empty matrix has determinant 1 in both modes
+    assert MatrixOperations.determinant([]) == 1
+    assert MatrixOperations.determinant([], exact=False) == 1
+    # result stays an int, no float round-off
+    det = MatrixOperations.determinant([[10 ** 20, 1, 0], [1, 10 ** 20, 1], [0, 1, 10 ** 20]])
+    assert det == 10 ** 60 - 2 * 10 ** 20
+    assert isinstance(det, int)
+    print("integer determinant tests passed")
+
+def test_determinant_fraction():
+    """test exact determinant of fraction matrices"""
+    half = Fraction(1, 2)
+    matrix = [[half, 1, 0], [1, half, 1], [0, 1, half]]
+    assert MatrixOperations.determinant(matrix) == Fraction(-7, 8)
+    print("fraction determinant tests passed")
+
+def test_determinant_float():
+    """test floating-point determinant via lu decomposition"""
+    matrix = [[2.0, -3.0, 1.0], [2.0, 0.0, -1.0], [1.0, 4.0, 5.0]]
+    assert abs(MatrixOperations.determinant(matrix) - 49) < 1e-9
+    assert abs(MatrixOperations.determinant([[2, -3, 1], [2, 0, -1], [1, 4, 5]], exact=False) - 49) < 1e-9
+    assert MatrixOperations.determinant([[0.5, 0.25, 0], [1, 1, 1], [2, 0, 0]], exact=True) == Fraction(1, 2)
+    print("float determinant tests passed")
+
+def test_lu_decomposition():
+    """test that p*a = l*u"""
+    matrix = [[1, 2, 3], [4, 5, 6], [7, 8, 10]]
+    lu, permutation, sign = MatrixOperations.lu_decomposition(matrix)
+    n = len(matrix)
+    for i in range(n):
+        for j in range(n):
+            value = sum((lu[i][k] if k < i else 1) * lu[k][j] for k in range(min(i, j) + 1))
+            assert abs(value - matrix[permutation[i]][j]) < 1e-12
+    assert sign in (1, -1)
+    print("lu decomposition tests passed")
+
+def test_multiply_matrices_parallel():
+    """test that the process-pool multiply matches the in-process one"""
+    matrix1 = [[(i * 7 + j * 3) % 11 - 5 for j in range(9)] for i in range(13)]
+    matrix2 = [[(i * 5 + j) % 7 + 0.5 for j in range(6)] for i in range(9)]
+    expected = MatrixOperations.multiply_matrices(matrix1, matrix2, workers=1)
+    threshold = MatrixOperations.PARALLEL_THRESHOLD
+    MatrixOperations.PARALLEL_THRESHOLD = 1
+    try:
+        assert MatrixOperations.multiply_matrices(matrix1, matrix2, workers=2) == expected
+    finally:
+        MatrixOperations.PARALLEL_THRESHOLD = threshold
+    assert MatrixOperations.multiply_matrices([[1, 2], [3, 4]], [[5, 6], [7, 8]]) == [[19, 22], [43, 50]]
+    print("parallel multiply tests passed")
+
+def test_multiply_matrices_parallel_exactness():
+    """test that large ints mixed with floats give the in-process result"""
+    big = (1 << 60) + 1
+    matrix1 = [[big if (i + j) % 3 == 0 else 1 for j in range(8)] for i in range(8)]
+    matrix2 = [[0.5 if j == 0 else big - i for j in range(8)] for i in range(8)]
+    expected = MatrixOperations.multiply_matrices(matrix1, matrix2, workers=1)
+    threshold = MatrixOperations.PARALLEL_THRESHOLD
+    MatrixOperations.PARALLEL_THRESHOLD = 1
+    try:
+        assert MatrixOperations.multiply_matrices(matrix1, matrix2, workers=2) == expected
+    finally:
+        MatrixOperations.PARALLEL_THRESHOLD = threshold
+    # exact int products of the int columns survive
+    assert expected[0][1] == sum(a * b for a, b in zip(matrix1[0], (row[1] for row in matrix2)))
+    print("parallel exactness tests passed")
+
+def test_multiply_matrices_ragged():
+    """test that rows of different lengths are rejected"""
+    for matrix1, matrix2 in (([[1, 2], [3]], [[1, 0], [0, 1]]), ([[1, 2]], [[1, 0], [0]])):
+        try:
+            MatrixOperations.multiply_matrices(matrix1, matrix2)
+            assert False, "ragged rows must raise"
+        except ValueError:
+            pass
+    print("ragged multiply tests passed")
+
+def test_multiply_strassen():
+    """test that strassen-winograd gives exact results for ints and fractions"""
+    matrix1 = [[(i * 7 + j * 3) % 11 - 5 for j in range(19)] for i in range(21)]
+    matrix2 = [[Fraction((i + 2 * j) % 9 - 4, j % 3 + 1) for j in range(17)] for i in range(19)]
+    expected = MatrixOperations.multiply_matrices(matrix1, matrix2)
+    assert MatrixOperations.multiply_strassen(matrix1, matrix2, cutoff=4) == expected
+    assert MatrixOperations.multiply_strassen(matrix1, matrix1[:19], cutoff=3) == \
+        MatrixOperations.multiply_matrices(matrix1, matrix1[:19])
+    print("strassen multiply tests passed")
+
+def test_solve_and_inverse():
+    """test cached lu factorization, solving and inversion"""
+    matrix = [[2, 1, 1], [1, 3, 2], [1, 0, 0]]
+    inverse = MatrixOperations.inverse(matrix)
+    assert MatrixOperations.multiply_matrices(matrix, inverse) == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    assert MatrixOperations.solve(matrix, [4, 5, 6]) == [6, 15, -23]
+    solutions = MatrixOperations.solve_many([[4.0, 7.0], [2.0, 6.0]], [[1, 0], [0, 1]])
+    assert abs(solutions[0][0] - 0.6) < 1e-12 and abs(solutions[1][1] - 0.4) < 1e-12
+    assert MatrixOperations.lu_factor(matrix) is MatrixOperations.lu_factor([row[:] for row in matrix])
+    try:
+        MatrixOperations.solve([[1, 2], [2, 4]], [1, 1])
+        assert False, "singular matrix must raise"
+    except ValueError:
+        pass
+    print("solve and inverse tests passed")
+
+def test_factor_cache_size():
+    """test that FACTOR_CACHE_SIZE set at runtime bounds the lu cache"""
+    size = MatrixOperations.FACTOR_CACHE_SIZE
+    MatrixOperations.FACTOR_CACHE_SIZE = 2
+    try:
+        matrices = [[[k + 2, 1], [1, 3]] for k in range(3)]
+        first = MatrixOperations.lu_factor(matrices[0])
+        assert MatrixOperations.lu_factor(matrices[0]) is first
+        MatrixOperations.lu_factor(matrices[1])
+        MatrixOperations.lu_factor(matrices[2])
+        # the oldest entry was evicted from the two-entry cache
+        assert MatrixOperations.lu_factor(matrices[0]) is not first
+        assert MatrixOperations._cached_factor().cache_info().maxsize == 2
+    finally:
+        MatrixOperations.FACTOR_CACHE_SIZE = size
+    assert MatrixOperations._cached_factor().cache_info().maxsize == size
+    print("factor cache tests passed")
+
+def test_matrix_views_and_operators():
+    """test array-backed matrix views and in-place operators"""
+    matrix = Matrix([[1, 2, 3], [4, 5, 6]])
+    assert matrix.typecode == "q"
+    assert matrix.T.tolist() == [[1, 4], [2, 5], [3, 6]]
+    assert matrix[:, 1].tolist() == [[2], [5]]
+    assert matrix[1, 2] == 6
+    row = matrix[0]
+    row += [[10, 10, 10]]
+    # the row view writes through to the shared buffer
+    assert matrix.tolist() == [[11, 12, 13], [4, 5, 6]]
+    product = matrix @ matrix.T
+    assert product == MatrixOperations.multiply_matrices(matrix.tolist(), matrix.T.tolist())
+    square = Matrix([[1, 2], [3, 4]])
+    square @= square
+    assert square == [[7, 10], [15, 22]]
+    assert MatrixOperations.add_matrices(square, [[1, 1], [1, 1]]) == [[8, 11], [16, 23]]
+    assert MatrixOperations.determinant(square) == 4
+    print("matrix type tests passed")
+
+def test_matrix_inplace_widening():
+    """test that in-place operators widen int storage like the binary ones"""
+    matrix = Matrix([[1, 2], [3, 4]])
+    matrix += Matrix([[0.5, 0.5], [0.5, 0.5]])
+    assert matrix.typecode == "d" and matrix == [[1.5, 2.5], [3.5, 4.5]]
+    big = 1 << 62
+    matrix = Matrix([[big, 1], [2, 3]])
+    matrix += [[big, 0], [0, 0]]
+    assert matrix == [[2 * big, 1], [2, 3]]
+    matrix -= [[-big, 0], [0, 0]]
+    assert matrix == [[3 * big, 1], [2, 3]]
+    square = Matrix([[1 << 40, 0], [0, 1]])
+    square @= square
+    assert square == [[1 << 80, 0], [0, 1]]
+    assert square == Matrix([[1 << 40, 0], [0, 1]]) @ Matrix([[1 << 40, 0], [0, 1]])
+    print("in-place widening tests passed")
+
+def test_matrix_scalar_and_index_types():
+    """test complex scalars and integer-like indices"""
+    matrix = Matrix([[1.5, 2.0], [0.0, -1.0]])
+    product = matrix * 2j
+    assert product.typecode == "O" and product == [[3j, 4j], [0j, -2j]]
+    assert (1j * Matrix([[1, 2]])) == [[1j, 2j]]
+    assert (matrix * 2).typecode == "d" and matrix * 2 == [[3.0, 4.0], [0.0, -2.0]]
+
+    class Index:
+        """stands in for numpy integer scalars, which implement __index__"""
+
+        def __init__(self, value):
+            self.value = value
+
+        def __index__(self):
+            return self.value
+
+    matrix = Matrix([[1, 2, 3], [4, 5, 6]])
+    assert matrix[Index(1), Index(2)] == 6
+    assert matrix[Index(-1)].tolist() == [[4, 5, 6]]
+    assert matrix[:, Index(0)].tolist() == [[1], [4]]
+    matrix[Index(0), Index(1)] = 20
+    assert matrix[0, 1] == 20
+    try:
+        matrix[0.5, 1]
+        assert False, "float index must raise"
+    except TypeError:
+        pass
+    print("scalar and index type tests passed")
+
+def test_sparse_matrices():
+    """test csr/coo conversion and arithmetic against the dense results"""
+    dense1 = [[0, 2, 0, 0], [0, 0, 0, 3], [1, 0, 0, 0]]
+    dense2 = [[0, 0, 4], [5, 0, 0], [0, 0, 0], [0, 6, 0]]
+    csr = CSRMatrix.from_dense(dense1)
+    coo = COOMatrix.from_dense(dense2)
+    assert csr.nnz == 3 and csr.to_dense() == dense1
+    assert coo.to_dense() == dense2
+    product = MatrixOperations.multiply_matrices(dense1, dense2)
+    assert (csr @ coo).to_dense() == product
+    assert MatrixOperations.multiply_matrices(csr, dense2) == product
+    assert MatrixOperations.multiply_matrices(dense1, coo) == product
+    assert csr @ [1, 1, 1, 1] == [2, 3, 1]
+    assert MatrixOperations.add_matrices(csr, csr).to_dense() == MatrixOperations.add_matrices(dense1, dense1)
+    assert csr.T.to_dense() == [list(column) for column in zip(*dense1)]
+    duplicates = COOMatrix((2, 2), [0, 0, 1], [1, 1, 0], [1, 2, 3])
+    assert duplicates.tocsr().to_dense() == [[0, 3], [3, 0]]
+    print("sparse matrix tests passed")
+
+if __name__ == "__main__":
+    test_determinant_integer()
+    test_determinant_fraction()
+    test_determinant_float()
+    test_lu_decomposition()
+    test_multiply_matrices_parallel()
+    test_multiply_matrices_parallel_exactness()
+    test_multiply_matrices_ragged()
+    test_multiply_strassen()
+    test_solve_and_inverse()
+    test_factor_cache_size()
+    test_matrix_views_and_operators()
+    test_matrix_inplace_widening()
+    test_matrix_scalar_and_index_types()
+    test_sparse_matrices()
+    print("all tests passed! 🎉")
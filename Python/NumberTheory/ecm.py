@@ -0,0 +1,263 @@
+"""
+Lenstra Elliptic Curve Factorization
+Author: Андрій Будильников
+
+This program finds a non-trivial factor of a composite number with Lenstra's
+elliptic curve method (ECM). Every curve is a Montgomery curve
+By^2 = x^3 + Ax^2 + x chosen with Suyama's parametrization, and points are
+kept as projective X:Z coordinates, so no modular inversions are needed while
+multiplying. Stage 1 multiplies the starting point by every prime power up to
+B1; stage 2 looks for one more prime between B1 and B2 with baby steps and
+giant steps. The bounds grow with the size of the factor being hunted, and
+independent curves run in parallel across a process pool.
+"""
+
+import functools
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+class ECM:
+    """
+    Provides methods for finding factors with the elliptic curve method
+    """
+
+    # (factor digits, B1, number of curves): the usual schedule for finding
+    # a factor of the given size with probability about 1 - 1/e per level
+    SCHEDULE = (
+        (15, 2000, 25),
+        (20, 11000, 90),
+        (25, 50000, 300),
+        (30, 250000, 700),
+        (35, 1000000, 1800),
+    )
+
+    # Stage 2 bound as a multiple of B1
+    B2_FACTOR = 100
+
+    # Giant step of stage 2 (2 * 3 * 5 * 7); baby steps are the odd
+    # residues below WHEEL / 2 coprime to it
+    WHEEL = 210
+
+    # Curves sent to a worker process in one task
+    CURVES_PER_TASK = 4
+
+    @staticmethod
+    def run_curve(number, sigma, b1, b2=None):
+        """
+        Runs both stages of ECM on the curve with Suyama parameter sigma
+        :param number: Odd composite number that is not a perfect power
+        :param sigma: Curve parameter (any integer other than 0, ±1, ±3, ±5)
+        :param b1: Stage 1 bound
+        :param b2: Stage 2 bound (B2_FACTOR * b1 by default)
+        :return: A factor d with 1 < d < number, or None if the curve failed
+        """
+        if b2 is None:
+            b2 = ECM.B2_FACTOR * b1
+        n = number
+
+        # Suyama's parametrization: starting point (u^3 : v^3) and
+        # (A + 2) / 4 = (v - u)^3 (3u + v) / (16 u^3 v)
+        u = (sigma * sigma - 5) % n
+        v = 4 * sigma % n
+        x = pow(u, 3, n)
+        z = pow(v, 3, n)
+        denominator = 16 * x * v % n
+        g = math.gcd(denominator, n)
+        if g != 1:
+            return g if g != n else None
+        a24 = pow(v - u, 3, n) * (3 * u + v) * pow(denominator, -1, n) % n
+
+        # Stage 1
+        x, z = _ladder(_stage1_multiplier(b1), x, z, a24, n)
+        g = math.gcd(z, n)
+        if g != 1:
+            return g if g != n else None
+
+        # Stage 2
+        g = _stage2(x, z, a24, n, b1, b2)
+        if g != 1 and g != n:
+            return g
+        return None
+
+    @staticmethod
+    def find_factor(number, max_digits=None, workers=1):
+        """
+        Looks for a factor with curves of growing bounds
+
+        Each level of SCHEDULE runs its curves before moving to larger bounds,
+        so small factors are found cheaply and the effort only grows while
+        the factor stays hidden.
+        :param number: Odd composite number that is not a perfect power
+        :param max_digits: Last factor size of SCHEDULE to try (all by default)
+        :param workers: Number of worker processes (1 stays in-process,
+                        None uses every CPU)
+        :return: A factor d with 1 < d < number, or None if every curve failed
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        levels = [level for level in ECM.SCHEDULE if max_digits is None or level[0] <= max_digits]
+
+        if workers <= 1:
+            for _, b1, curves in levels:
+                for _ in range(curves):
+                    factor = ECM.run_curve(number, random.randrange(6, number), b1)
+                    if factor:
+                        return factor
+            return None
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for _, b1, curves in levels:
+                pending = set()
+                for start in range(0, curves, ECM.CURVES_PER_TASK):
+                    sigmas = [random.randrange(6, number)
+                              for _ in range(min(ECM.CURVES_PER_TASK, curves - start))]
+                    pending.add(executor.submit(_run_curves, number, sigmas, b1))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        factor = future.result()
+                        if factor:
+                            return factor
+            return None
+        finally:
+            # Drops the curves still queued once a factor is found
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def _run_curves(number, sigmas, b1):
+    """
+    Worker entry point: runs several curves and stops at the first factor
+    """
+    for sigma in sigmas:
+        factor = ECM.run_curve(number, sigma, b1)
+        if factor:
+            return factor
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _sieve(limit):
+    """
+    Sieve of Eratosthenes: flags[i] is 1 when i is prime (i <= limit)
+    """
+    flags = bytearray([1]) * (limit + 1)
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return flags
+
+@functools.lru_cache(maxsize=8)
+def _stage1_multiplier(b1):
+    """
+    Product of the largest powers of every prime p <= B1 that stay below B1
+    """
+    flags = _sieve(b1)
+    k = 1
+    for p in range(2, b1 + 1):
+        if flags[p]:
+            q = p
+            while q * p <= b1:
+                q *= p
+            k *= q
+    return k
+
+def _double(x, z, a24, n):
+    """
+    Doubles the point X:Z on the Montgomery curve
+    """
+    s = (x + z) * (x + z) % n
+    d = (x - z) * (x - z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+def _add(x1, z1, x2, z2, x0, z0, n):
+    """
+    Adds the points X1:Z1 and X2:Z2 whose difference is X0:Z0
+    """
+    u = (x1 - z1) * (x2 + z2)
+    v = (x1 + z1) * (x2 - z2)
+    s = u + v
+    d = u - v
+    return z0 * s * s % n, x0 * d * d % n
+
+def _ladder(k, x, z, a24, n):
+    """
+    Computes [k](X:Z) with the Montgomery ladder
+    """
+    if k == 1:
+        return x, z
+    x1, z1 = x, z
+    x2, z2 = _double(x, z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            x1, z1 = _add(x1, z1, x2, z2, x, z, n)
+            x2, z2 = _double(x2, z2, a24, n)
+        else:
+            x2, z2 = _add(x1, z1, x2, z2, x, z, n)
+            x1, z1 = _double(x1, z1, a24, n)
+    return x1, z1
+
+def _stage2(x, z, a24, n, b1, b2):
+    """
+    Baby-step giant-step stage 2: every prime q = mD ± j in (B1, B2] is
+    covered by a factor X(mD)Z(j) - X(j)Z(mD) of one accumulated product
+    :return: gcd of the product with n
+    """
+    wheel = ECM.WHEEL
+    half = wheel // 2
+    flags = _sieve(b2 + half)
+
+    # Baby steps [j]Q for odd j < D / 2, kept when j is coprime to D
+    baby = []
+    x2, z2 = _double(x, z, a24, n)
+    previous = (x, z)
+    current = (x, z)
+    for j in range(1, half, 2):
+        if math.gcd(j, wheel) == 1:
+            baby.append((j, current[0], current[1]))
+        following = _add(current[0], current[1], x2, z2, previous[0], previous[1], n)
+        # [1]Q - [2]Q = -[1]Q has the same x-coordinate as [1]Q
+        previous, current = current, following
+
+    # Giant steps [mD]Q from just below B1 up to B2
+    m = max(2, b1 // wheel)
+    xd, zd = _ladder(wheel, x, z, a24, n)
+    xr, zr = _ladder(m * wheel, x, z, a24, n)
+    xt, zt = _ladder((m - 1) * wheel, x, z, a24, n)
+
+    product = 1
+    while m * wheel - half <= b2:
+        centre = m * wheel
+        for j, xj, zj in baby:
+            low = centre - j
+            high = centre + j
+            if (b1 < low <= b2 and flags[low]) or (b1 < high <= b2 and flags[high]):
+                product = product * (xr * zj - xj * zr) % n
+        (xr, zr), (xt, zt) = _add(xr, zr, xd, zd, xt, zt, n), (xr, zr)
+        m += 1
+    return math.gcd(product, n)
+
+def main():
+    """
+    Main function to demonstrate the elliptic curve method
+    """
+    print("Elliptic Curve Factorization")
+    print("============================")
+
+    # Products of two primes of 15-18 digits, out of reach of Pollard's rho
+    test_numbers = [
+        100000000000031 * 1000000000000000003,
+        123456789012419 * 99999999999999997,
+    ]
+
+    for number in test_numbers:
+        factor = ECM.find_factor(number, workers=None)
+        if factor:
+            print(f"{number} = {factor} × {number // factor}")
+        else:
+            print(f"{number}: no factor found")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Smallest Prime Factor Table
+Author: Андрій Будильников
+
+This program precomputes the smallest prime factor of every number up to a
+limit, so that any number in the table factors in O(log n) lookups instead
+of a fresh trial division. The table covers odd numbers only (even numbers
+have the smallest prime factor 2) and is stored in a compact array('I').
+Euler's totient, the divisor sum, the divisor count and the Mobius function
+are computed from the same table, one number at a time or in bulk.
+"""
+
+import math
+from array import array
+
+class FactorTable:
+    """
+    Factors numbers up to a fixed limit with a smallest prime factor table
+    """
+
+    def __init__(self, limit):
+        """
+        Builds the table
+        :param limit: Largest number that can be factored
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        # Entry i describes the odd number 2i + 1; 0 marks a prime (or 1)
+        size = (limit + 1) // 2
+        table = array("I", bytes(4 * size))
+
+        # Every odd composite n has its smallest prime factor p with p * p <= n,
+        # so marking the odd multiples of each odd prime from p * p onwards,
+        # largest prime first, leaves the smallest factor in every entry.
+        # The slice assignments run in C, unlike a linear sieve written in
+        # Python, which would touch every entry in the interpreter.
+        root = math.isqrt(limit)
+        small = bytearray([1]) * (root + 1)
+        for i in range(2, math.isqrt(root) + 1):
+            if small[i]:
+                small[i * i::i] = bytes(len(range(i * i, root + 1, i)))
+        for p in range(root - (root % 2 == 0), 2, -2):
+            if small[p]:
+                start = p * p // 2
+                table[start::p] = array("I", [p]) * len(range(start, size, p))
+        self._table = table
+
+    def smallest_prime_factor(self, number):
+        """
+        Returns the smallest prime factor of a number
+        :param number: Number between 2 and limit
+        :return: The smallest prime factor
+        """
+        self._check(number)
+        if number % 2 == 0:
+            return 2
+        return self._table[number >> 1] or number
+
+    def is_prime(self, number):
+        """
+        Tests primality by a table lookup
+        :param number: Number between 0 and limit
+        :return: True if the number is prime
+        """
+        if number < 2:
+            return False
+        return self.smallest_prime_factor(number) == number
+
+    def get_prime_factors(self, number):
+        """
+        Calculates the prime factors of a number
+        :param number: Number between 1 and limit
+        :return: A sorted list of prime factors (with repetition)
+        """
+        self._check(number)
+        factors = []
+        while number % 2 == 0:
+            factors.append(2)
+            number //= 2
+        table = self._table
+        while number > 1:
+            p = table[number >> 1] or number
+            factors.append(p)
+            number //= p
+        return factors
+
+    def factor_many(self, numbers):
+        """
+        Factors every number of an iterable
+        :param numbers: Iterable of numbers between 1 and limit
+        :return: List of sorted prime factor lists
+        """
+        return [self.get_prime_factors(number) for number in numbers]
+
+    def prime_powers(self, number):
+        """
+        Calculates the factorization as prime powers
+        :param number: Number between 1 and limit
+        :return: List of (prime, exponent) pairs in increasing order of primes
+        """
+        self._check(number)
+        powers = []
+        exponent = 0
+        while number % 2 == 0:
+            exponent += 1
+            number //= 2
+        if exponent:
+            powers.append((2, exponent))
+        table = self._table
+        while number > 1:
+            p = table[number >> 1] or number
+            exponent = 0
+            while number % p == 0:
+                exponent += 1
+                number //= p
+            powers.append((p, exponent))
+        return powers
+
+    def phi(self, number):
+        """
+        Euler's totient: the count of numbers up to n coprime to n
+        """
+        result = number
+        for p, _ in self.prime_powers(number):
+            result -= result // p
+        return result
+
+    def sigma(self, number):
+        """
+        Sum of all divisors of a number
+        """
+        result = 1
+        for p, exponent in self.prime_powers(number):
+            result *= (p ** (exponent + 1) - 1) // (p - 1)
+        return result
+
+    def divisor_count(self, number):
+        """
+        Number of divisors of a number
+        """
+        result = 1
+        for _, exponent in self.prime_powers(number):
+            result *= exponent + 1
+        return result
+
+    def mobius(self, number):
+        """
+        Mobius function: 0 if a square divides n, otherwise (-1)^(number of primes)
+        """
+        powers = self.prime_powers(number)
+        for _, exponent in powers:
+            if exponent > 1:
+                return 0
+        return -1 if len(powers) % 2 else 1
+
+    def phi_many(self, numbers):
+        """
+        Euler's totient of every number of an iterable
+        :return: array('Q') of values
+        """
+        return array("Q", map(self.phi, numbers))
+
+    def sigma_many(self, numbers):
+        """
+        Divisor sums of every number of an iterable
+        :return: array('Q') of values
+        """
+        return array("Q", map(self.sigma, numbers))
+
+    def divisor_count_many(self, numbers):
+        """
+        Divisor counts of every number of an iterable
+        :return: array('I') of values
+        """
+        return array("I", map(self.divisor_count, numbers))
+
+    def mobius_many(self, numbers):
+        """
+        Mobius function of every number of an iterable
+        :return: array('b') of values
+        """
+        return array("b", map(self.mobius, numbers))
+
+    def _check(self, number):
+        if not 0 < number <= self.limit:
+            raise ValueError(f"number must be between 1 and {self.limit}")
+
+def main():
+    """
+    Main function to demonstrate the factor table
+    """
+    print("Smallest Prime Factor Table")
+    print("===========================")
+
+    table = FactorTable(10 ** 6)
+    numbers = [12, 315, 1024, 97, 1000, 2310, 999983, 720720]
+    for number, factors in zip(numbers, table.factor_many(numbers)):
+        print(f"{number} = {' × '.join(map(str, factors))}")
+
+    print(f"\nphi:     {list(table.phi_many(numbers))}")
+    print(f"sigma:   {list(table.sigma_many(numbers))}")
+    print(f"d(n):    {list(table.divisor_count_many(numbers))}")
+    print(f"mobius:  {list(table.mobius_many(numbers))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+number_theory_test_helpers.py
+Author: Андрій Будильников
+
+Reference implementations shared by the number theory tests
+"""
+
+def trial_division(number):
+    """reference factorization by plain trial division"""
+    factors = []
+    divisor = 2
+    while divisor * divisor <= number:
+        while number % divisor == 0:
+            factors.append(divisor)
+            number //= divisor
+        divisor += 1
+    if number > 1:
+        factors.append(number)
+    return factors
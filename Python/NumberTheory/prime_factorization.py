@@ -3,21 +3,165 @@ Prime Factorization Calculator
 Author: Андрій Будильников
 
 This program calculates the prime factorization of a given number.
+Small factors are removed by trial division, the cofactor is tested with
+the Miller-Rabin primality test, and composite cofactors are split with
+Brent's variant of Pollard's rho method, so numbers of 20-40 digits factor
+in milliseconds. Cofactors that rho cannot split within its budget are
+handed to the elliptic curve method (ecm.py), which finds prime factors of
+15-30 digits.
 """
 
+import math
+import random
 from collections import Counter
 
+from ecm import ECM
+
+def _primes_below(limit):
+    """
+    Simple sieve of Eratosthenes used for the trial division table
+    """
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
 class PrimeFactorization:
     """
     Provides methods for calculating prime factorization of numbers
     """
     
+    # Primes below this bound are removed by trial division before the
+    # cofactor is handed to Miller-Rabin and Pollard's rho
+    TRIAL_DIVISION_LIMIT = 1000
+    
+    # Miller-Rabin with these bases is deterministic for n < 3.3 * 10^24
+    MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    DETERMINISTIC_LIMIT = 3317044064679887385961981
+    
+    # Extra random bases for larger n (error probability below 4^-ROUNDS)
+    RANDOM_ROUNDS = 20
+    
+    # Pollard's rho steps spent on a cofactor before escalating to ECM
+    # (enough for prime factors of about 10 digits)
+    RHO_ITERATIONS = 1 << 16
+    
+    _small_primes = _primes_below(TRIAL_DIVISION_LIMIT)
+    
     @staticmethod
-    def get_prime_factors(number):
+    def is_prime(number):
+        """
+        Tests primality with the Miller-Rabin test
+        :param number: The number to test
+        :return: True if the number is prime (deterministic below
+                 DETERMINISTIC_LIMIT, with negligible error above it)
+        """
+        if number < 2:
+            return False
+        for p in PrimeFactorization._small_primes[:25]:
+            if number % p == 0:
+                return number == p
+        
+        d = number - 1
+        s = 0
+        while d % 2 == 0:
+            d //= 2
+            s += 1
+        
+        bases = PrimeFactorization.MILLER_RABIN_BASES
+        if number >= PrimeFactorization.DETERMINISTIC_LIMIT:
+            bases = bases + tuple(random.randrange(2, number - 1)
+                                  for _ in range(PrimeFactorization.RANDOM_ROUNDS))
+        for a in bases:
+            x = pow(a, d, number)
+            if x == 1 or x == number - 1:
+                continue
+            for _ in range(s - 1):
+                x = x * x % number
+                if x == number - 1:
+                    break
+            else:
+                return False
+        return True
+    
+    @staticmethod
+    def _pollard_brent(number, max_iterations=None):
+        """
+        Finds a non-trivial factor of an odd composite number with Brent's
+        variant of Pollard's rho method
+        :param number: Odd composite number
+        :param max_iterations: Step budget (unlimited by default)
+        :return: A factor d with 1 < d < number, or None when the budget ran out
+        """
+        # Products of this many differences share one gcd computation
+        batch = 128
+        steps = 0
+        while True:
+            y = random.randrange(1, number)
+            c = random.randrange(1, number)
+            g = r = q = 1
+            while g == 1:
+                x = y
+                for _ in range(r):
+                    y = (y * y + c) % number
+                k = 0
+                while k < r and g == 1:
+                    saved = y
+                    for _ in range(min(batch, r - k)):
+                        y = (y * y + c) % number
+                        q = q * abs(x - y) % number
+                    g = math.gcd(q, number)
+                    k += batch
+                steps += 2 * r
+                r *= 2
+                if g == 1 and max_iterations is not None and steps >= max_iterations:
+                    return None
+            if g == number:
+                # The batch overshot: step back one difference at a time
+                g = 1
+                while g == 1:
+                    saved = (saved * saved + c) % number
+                    g = math.gcd(abs(x - saved), number)
+            if g != number:
+                return g
+    
+    @staticmethod
+    def _split(number, factors, workers=1):
+        """
+        Appends the prime factors of a number without small factors,
+        escalating from Pollard's rho to ECM for cofactors that resist rho
+        """
+        stack = [number]
+        while stack:
+            n = stack.pop()
+            if n == 1:
+                continue
+            if PrimeFactorization.is_prime(n):
+                factors.append(n)
+                continue
+            root = math.isqrt(n)
+            if root * root == n:
+                stack.extend((root, root))
+                continue
+            d = PrimeFactorization._pollard_brent(n, PrimeFactorization.RHO_ITERATIONS)
+            if d is None:
+                d = ECM.find_factor(n, workers=workers)
+            if d is None:
+                # Factors beyond the ECM schedule: keep running rho
+                d = PrimeFactorization._pollard_brent(n)
+            stack.extend((d, n // d))
+    
+    @staticmethod
+    def get_prime_factors(number, workers=1):
         """
         Calculates the prime factors of a given number
         :param number: The number to factorize
-        :return: A list of prime factors
+        :param workers: Worker processes for the ECM stage (1 stays in-process,
+                        None uses every CPU; a process pool needs the calling
+                        script to be guarded by if __name__ == "__main__")
+        :return: A sorted list of prime factors (with repetition)
         """
         factors = []
         
@@ -25,23 +169,22 @@ class PrimeFactorization:
         if number <= 1:
             return factors
         
-        # Check for factor 2
-        while number % 2 == 0:
-            factors.append(2)
-            number //= 2
-        
-        # Check for odd factors from 3 onwards
-        i = 3
-        while i * i <= number:
-            while number % i == 0:
-                factors.append(i)
-                number //= i
-            i += 2
+        # Trial division by the small primes
+        for p in PrimeFactorization._small_primes:
+            if p * p > number:
+                break
+            while number % p == 0:
+                factors.append(p)
+                number //= p
         
-        # If number is still greater than 1, then it's a prime factor
         if number > 1:
-            factors.append(number)
+            if number < PrimeFactorization.TRIAL_DIVISION_LIMIT ** 2:
+                # No factor below the limit, so the cofactor is prime
+                factors.append(number)
+            else:
+                PrimeFactorization._split(number, factors, workers)
         
+        factors.sort()
         return factors
     
     @staticmethod
@@ -75,7 +218,8 @@ def main():
     print("=============================")
     
     # Test cases
-    test_numbers = [12, 315, 1024, 97, 1000, 2310]
+    test_numbers = [12, 315, 1024, 97, 1000, 2310, 10000000019 * 1000000000039 * 600851475143,
+                    100000000000031 * 1000000000000000003]
     
     for number in test_numbers:
         factors = PrimeFactorization.get_prime_factors(number)
@@ -0,0 +1,159 @@
+"""
+Segmented Sieve of Eratosthenes
+Author: Андрій Будильников
+
+This program generates the primes of a range [lo, hi) with a segmented sieve
+of Eratosthenes. Only odd numbers are stored, one byte each, and the range is
+processed one fixed-size segment at a time, so memory stays bounded by the
+segment size plus the primes below sqrt(hi) however far the range reaches.
+Primes are produced lazily; counting and summing skip building the numbers
+altogether and can be split by segment across worker processes.
+"""
+
+import functools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+
+class PrimeSieve:
+    """
+    Provides methods for generating, counting and summing primes in a range
+    """
+
+    # Odd numbers per segment (one byte each)
+    SEGMENT_SIZE = 1 << 20
+
+    @staticmethod
+    def _segments(lo, hi):
+        """
+        Sieves [lo, hi) segment by segment
+        :return: Generator of (first odd number, flags) pairs; flags[i] is 1
+                 when first + 2i is prime
+        """
+        base = _base_primes(math.isqrt(max(hi - 1, 0)))
+        start = max(lo, 3) | 1
+        size = PrimeSieve.SEGMENT_SIZE
+        zeros = memoryview(bytes(size))
+        while start < hi:
+            count = min(size, (hi - start + 1) // 2)
+            end = start + 2 * count
+            flags = bytearray([1]) * count
+            for p in base:
+                square = p * p
+                if square >= end:
+                    break
+                if square >= start:
+                    first = square
+                else:
+                    # First odd multiple of p in the segment
+                    first = (start + p - 1) // p * p
+                    if first % 2 == 0:
+                        first += p
+                index = (first - start) // 2
+                if index < count:
+                    flags[index::p] = zeros[:len(range(index, count, p))]
+            yield start, flags
+            start = end
+
+    @staticmethod
+    def primes(lo, hi):
+        """
+        Generates the primes p with lo <= p < hi in increasing order
+        :param lo: Lower bound (inclusive)
+        :param hi: Upper bound (exclusive)
+        :return: Generator of primes
+        """
+        if lo <= 2 < hi:
+            yield 2
+        for start, flags in PrimeSieve._segments(lo, hi):
+            yield from compress(range(start, start + 2 * len(flags), 2), flags)
+
+    @staticmethod
+    def count(lo, hi, workers=1):
+        """
+        Counts the primes p with lo <= p < hi
+        :param lo: Lower bound (inclusive)
+        :param hi: Upper bound (exclusive)
+        :param workers: Number of worker processes (None uses every CPU)
+        :return: Number of primes
+        """
+        return PrimeSieve._reduce(_count_range, lo, hi, workers)
+
+    @staticmethod
+    def sum(lo, hi, workers=1):
+        """
+        Sums the primes p with lo <= p < hi
+        :param lo: Lower bound (inclusive)
+        :param hi: Upper bound (exclusive)
+        :param workers: Number of worker processes (None uses every CPU)
+        :return: Sum of primes
+        """
+        return PrimeSieve._reduce(_sum_range, lo, hi, workers)
+
+    @staticmethod
+    def _reduce(function, lo, hi, workers):
+        """
+        Applies a range function to [lo, hi), splitting the range into runs
+        of whole segments for worker processes, and adds up the results
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        span = 2 * PrimeSieve.SEGMENT_SIZE
+        segments = -(-(hi - lo) // span)
+        if workers <= 1 or segments <= 1:
+            return function(lo, hi)
+
+        # About four tasks per worker, each a run of whole segments
+        per_task = -(-segments // (workers * 4))
+        bounds = [lo + i * per_task * span for i in range(-(-segments // per_task))] + [hi]
+        bounds = [min(bound, hi) for bound in bounds]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(function, bounds[:-1], bounds[1:]))
+
+def _count_range(lo, hi):
+    """
+    Worker entry point: counts the primes of [lo, hi)
+    """
+    total = 1 if lo <= 2 < hi else 0
+    for _, flags in PrimeSieve._segments(lo, hi):
+        total += flags.count(1)
+    return total
+
+def _sum_range(lo, hi):
+    """
+    Worker entry point: sums the primes of [lo, hi)
+    """
+    total = 2 if lo <= 2 < hi else 0
+    for start, flags in PrimeSieve._segments(lo, hi):
+        total += sum(compress(range(start, start + 2 * len(flags), 2), flags))
+    return total
+
+@functools.lru_cache(maxsize=4)
+def _base_primes(limit):
+    """
+    Odd primes up to limit, used to sieve the segments
+    """
+    if limit < 3:
+        return ()
+    flags = bytearray([1]) * (limit + 1)
+    for i in range(3, math.isqrt(limit) + 1, 2):
+        if flags[i]:
+            flags[i * i::2 * i] = bytes(len(range(i * i, limit + 1, 2 * i)))
+    return tuple(p for p in range(3, limit + 1, 2) if flags[p])
+
+def main():
+    """
+    Main function to demonstrate the segmented sieve
+    """
+    print("Segmented Sieve of Eratosthenes")
+    print("===============================")
+
+    print(f"Primes below 50: {list(PrimeSieve.primes(0, 50))}")
+    print(f"Primes in [10^12, 10^12 + 100): {list(PrimeSieve.primes(10 ** 12, 10 ** 12 + 100))}")
+    print(f"Number of primes below 10^7: {PrimeSieve.count(0, 10 ** 7)}")
+    print(f"Sum of primes below 2 * 10^6: {PrimeSieve.sum(0, 2 * 10 ** 6)}")
+    print(f"Number of primes in [10^12, 10^12 + 10^7): {PrimeSieve.count(10 ** 12, 10 ** 12 + 10 ** 7, workers=None)}")
+
+if __name__ == "__main__":
+    main()
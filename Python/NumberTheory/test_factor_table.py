@@ -0,0 +1,78 @@
+"""
+test_factor_table.py
+Author: Андрій Будильников
+
+Test file for the smallest prime factor table
+"""
+
+import math
+
+from factor_table import FactorTable
+from number_theory_test_helpers import trial_division
+
+LIMIT = 3000
+
+def divisors(number):
+    """every positive divisor by trial"""
+    return [d for d in range(1, number + 1) if number % d == 0]
+
+def test_factorize():
+    """test factorizations and smallest prime factors against trial division"""
+    table = FactorTable(LIMIT)
+    numbers = list(range(1, LIMIT + 1))
+    assert table.factor_many(numbers) == [trial_division(n) for n in numbers]
+    for n in range(2, LIMIT + 1):
+        assert table.smallest_prime_factor(n) == trial_division(n)[0]
+        assert table.is_prime(n) == (trial_division(n) == [n])
+    assert not table.is_prime(0) and not table.is_prime(1)
+    # tiny limits that leave the sieve loop empty
+    for limit in (1, 2, 3, 8, 9):
+        small = FactorTable(limit)
+        assert small.factor_many(range(1, limit + 1)) == [trial_division(n) for n in range(1, limit + 1)]
+    print("factorization tests passed")
+
+def test_multiplicative_functions():
+    """test phi, sigma, divisor count and mobius against brute force"""
+    table = FactorTable(LIMIT)
+    numbers = range(1, 400)
+    for n in numbers:
+        n_divisors = divisors(n)
+        factors = trial_division(n)
+        assert table.phi(n) == sum(1 for k in range(1, n + 1) if math.gcd(k, n) == 1)
+        assert table.sigma(n) == sum(n_divisors)
+        assert table.divisor_count(n) == len(n_divisors)
+        squarefree = len(set(factors)) == len(factors)
+        assert table.mobius(n) == ((-1) ** len(factors) if squarefree else 0)
+    assert list(table.phi_many(numbers)) == [table.phi(n) for n in numbers]
+    assert list(table.sigma_many(numbers)) == [table.sigma(n) for n in numbers]
+    assert list(table.divisor_count_many(numbers)) == [table.divisor_count(n) for n in numbers]
+    assert list(table.mobius_many(numbers)) == [table.mobius(n) for n in numbers]
+    print("multiplicative function tests passed")
+
+def test_limit_errors():
+    """test that numbers outside the table raise valueerror"""
+    table = FactorTable(100)
+    for call in (table.get_prime_factors, table.smallest_prime_factor, table.sigma,
+                 table.mobius, table.is_prime):
+        try:
+            call(101)
+            assert False, "number beyond the limit must raise"
+        except ValueError:
+            pass
+    try:
+        table.get_prime_factors(0)
+        assert False, "zero must raise"
+    except ValueError:
+        pass
+    try:
+        FactorTable(0)
+        assert False, "limit below 1 must raise"
+    except ValueError:
+        pass
+    print("limit error tests passed")
+
+if __name__ == "__main__":
+    test_factorize()
+    test_multiplicative_functions()
+    test_limit_errors()
+    print("all tests passed! 🎉")
@@ -0,0 +1,101 @@
+"""
+test_prime_factorization.py
+Author: Андрій Будильников
+
+Test file for the prime factorization module
+"""
+
+import math
+import random
+
+from ecm import ECM
+from number_theory_test_helpers import trial_division
+from prime_factorization import PrimeFactorization
+
+def test_small_numbers():
+    """test against trial division for every number below 5000"""
+    for number in range(-2, 5000):
+        assert PrimeFactorization.get_prime_factors(number) == trial_division(number)
+    print("small number tests passed")
+
+def test_carmichael_numbers():
+    """test that carmichael numbers are composite and factor correctly"""
+    carmichael = [561, 1105, 1729, 2465, 2821, 6601, 8911, 41041, 825265, 321197185, 3215031751]
+    for number in carmichael:
+        assert not PrimeFactorization.is_prime(number)
+        assert PrimeFactorization.get_prime_factors(number) == trial_division(number)
+    print("carmichael tests passed")
+
+def test_strong_pseudoprimes():
+    """test the smallest strong pseudoprimes to the first prime bases"""
+    pseudoprimes = [2047, 1373653, 25326001, 3215031751, 2152302898747, 3474749660383,
+                    341550071728321, 3825123056546413051, 318665857834031151167461,
+                    3317044064679887385961981]
+    for number in pseudoprimes:
+        assert not PrimeFactorization.is_prime(number)
+        factors = PrimeFactorization.get_prime_factors(number)
+        assert math.prod(factors) == number and len(factors) > 1
+        assert all(PrimeFactorization.is_prime(p) for p in factors)
+    primes = [2, 3, 97, 999983, 2 ** 61 - 1, 2 ** 89 - 1, 10 ** 20 + 39]
+    for p in primes:
+        assert PrimeFactorization.is_prime(p)
+        assert PrimeFactorization.get_prime_factors(p) == [p]
+    print("strong pseudoprime tests passed")
+
+def test_prime_powers():
+    """test squares and higher powers of primes"""
+    cases = [
+        (1000003, 2), (999983, 3), (2 ** 31 - 1, 2), (2 ** 61 - 1, 2),
+        (3, 40), (10 ** 9 + 7, 3), (2 ** 89 - 1, 2),
+    ]
+    for p, exponent in cases:
+        assert PrimeFactorization.get_prime_factors(p ** exponent) == [p] * exponent
+    number = (10 ** 9 + 7) ** 2 * (10 ** 9 + 9)
+    assert PrimeFactorization.get_prime_factors(number) == [10 ** 9 + 7, 10 ** 9 + 7, 10 ** 9 + 9]
+    print("prime power tests passed")
+
+def test_rho_semiprime():
+    """test a 24-digit semiprime split by pollard's rho"""
+    p, q = 1000000007, 100000000000000003
+    assert PrimeFactorization.get_prime_factors(p * q * 12) == [2, 2, 3, p, q]
+    print("rho tests passed")
+
+def test_ecm_semiprime():
+    """test a 41-digit semiprime of 20- and 21-digit primes that needs ecm"""
+    p, q = 10 ** 19 + 51, 10 ** 20 + 39
+    calls = []
+    find_factor = ECM.find_factor
+
+    def counting_find_factor(number, max_digits=None, workers=1):
+        calls.append(workers)
+        return find_factor(number, max_digits, workers)
+
+    state = random.getstate()
+    # a fixed seed picks curves that find the factor quickly
+    random.seed(92)
+    ECM.find_factor = staticmethod(counting_find_factor)
+    try:
+        assert PrimeFactorization.get_prime_factors(p * q) == [p, q]
+    finally:
+        ECM.find_factor = staticmethod(find_factor)
+        random.setstate(state)
+    # rho gave up and the in-process ecm stage split the number
+    assert calls == [1]
+    print("ecm tests passed")
+
+def test_ecm_workers():
+    """test ecm curves spread over a process pool"""
+    p, q = 100000000000031, 1000000000000000003
+    factor = ECM.find_factor(p * q, workers=2)
+    assert factor in (p, q)
+    print("ecm worker tests passed")
+
+if __name__ == "__main__":
+    test_small_numbers()
+    test_carmichael_numbers()
+    test_strong_pseudoprimes()
+    test_prime_powers()
+    test_rho_semiprime()
+    test_ecm_semiprime()
+    test_ecm_workers()
+    print("all tests passed! 🎉")
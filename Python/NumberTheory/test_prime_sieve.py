@@ -0,0 +1,84 @@
+"""
+test_prime_sieve.py
+Author: Андрій Будильников
+
+Test file for the segmented sieve of eratosthenes
+"""
+
+from prime_sieve import PrimeSieve
+
+LIMIT = 20000
+
+def simple_sieve(limit):
+    """reference list of primes below limit"""
+    flags = [True] * max(limit, 2)
+    flags[0] = flags[1] = False
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = [False] * len(range(i * i, limit, i))
+    return [p for p in range(limit) if flags[p]]
+
+PRIMES = simple_sieve(LIMIT)
+
+def expected(lo, hi):
+    return [p for p in PRIMES if lo <= p < hi]
+
+def check_range(lo, hi, workers=1):
+    primes = expected(lo, hi)
+    assert list(PrimeSieve.primes(lo, hi)) == primes, (lo, hi)
+    assert PrimeSieve.count(lo, hi, workers) == len(primes), (lo, hi)
+    assert PrimeSieve.sum(lo, hi, workers) == sum(primes), (lo, hi)
+
+def test_small_ranges():
+    """test every range with small bounds against a simple sieve"""
+    for lo in range(-3, 40):
+        for hi in range(-3, 60):
+            check_range(lo, hi)
+    check_range(0, LIMIT)
+    check_range(9973, 10007)
+    print("small range tests passed")
+
+def test_empty_ranges():
+    """test that reversed and empty ranges produce nothing"""
+    for lo, hi in ((100, 50), (3, 2), (2, 2), (1000, 1000), (24, 28), (-10, -5)):
+        assert list(PrimeSieve.primes(lo, hi)) == []
+        assert PrimeSieve.count(lo, hi) == 0
+        assert PrimeSieve.sum(lo, hi) == 0
+    assert PrimeSieve.count(100, 50, workers=2) == 0
+    print("empty range tests passed")
+
+def test_segment_boundaries():
+    """test ranges that start, end and straddle segment edges"""
+    segment_size = PrimeSieve.SEGMENT_SIZE
+    PrimeSieve.SEGMENT_SIZE = 16
+    try:
+        span = 2 * PrimeSieve.SEGMENT_SIZE
+        check_range(0, LIMIT)
+        for edge in (3 + span, 3 + 5 * span, 3 + 40 * span):
+            for lo in range(edge - 3, edge + 3):
+                for hi in (edge - 1, edge, edge + 1, edge + span, edge + 3 * span + 1):
+                    check_range(lo, hi)
+        # a prime square landing exactly on a segment start
+        check_range(289, 289 + 3 * span)
+    finally:
+        PrimeSieve.SEGMENT_SIZE = segment_size
+    print("segment boundary tests passed")
+
+def test_workers():
+    """test counting and summing split across worker processes"""
+    segment_size = PrimeSieve.SEGMENT_SIZE
+    PrimeSieve.SEGMENT_SIZE = 64
+    try:
+        check_range(0, LIMIT, workers=2)
+        check_range(1001, LIMIT - 7, workers=3)
+        check_range(2, 700, workers=2)
+    finally:
+        PrimeSieve.SEGMENT_SIZE = segment_size
+    print("worker tests passed")
+
+if __name__ == "__main__":
+    test_small_ranges()
+    test_empty_ranges()
+    test_segment_boundaries()
+    test_workers()
+    print("all tests passed! 🎉")
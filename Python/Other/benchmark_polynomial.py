@@ -0,0 +1,109 @@
+"""
+Polynomial Multiplication Crossover Benchmark
+Author: Андрій Будильников
+
+This program times schoolbook, Karatsuba and transform-based multiplication
+of random polynomials of growing length and reports the lengths at which the
+faster asymptotic method starts to win on this machine. The suggested values
+can be assigned to PolynomialMultiplication.KARATSUBA_THRESHOLD,
+FFT_THRESHOLD and NTT_THRESHOLD.
+"""
+
+import argparse
+import random
+import time
+
+from polynomial_multiplication import PolynomialMultiplication
+
+def random_polynomial(n, kind):
+    """
+    Creates a random polynomial
+    :param n: Number of coefficients
+    :param kind: "int" (small integers), "bigint" (integers beyond float
+                 precision) or "float"
+    :return: Coefficient list
+    """
+    if kind == "int":
+        return [random.randint(-1000, 1000) for _ in range(n)]
+    if kind == "bigint":
+        return [random.getrandbits(64) - (1 << 63) for _ in range(n)]
+    return [random.uniform(-1.0, 1.0) for _ in range(n)]
+
+def best_time(function, repeat):
+    """
+    Runs a function several times and returns the fastest run
+    :param function: Function without arguments
+    :param repeat: Number of runs
+    :return: Best time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def find_crossover(slow, fast, kind, min_size=8, max_size=4096, repeat=3):
+    """
+    Finds the smallest length from which one method stays faster than another
+    :param slow: Function (a, b, length) using the method that wins on short operands
+    :param fast: Function (a, b, length) using the method that wins on long operands
+    :param kind: Coefficient kind passed to random_polynomial
+    :param min_size: First length to test
+    :param max_size: Last length to test
+    :param repeat: Runs per measurement
+    :return: Tuple (crossover length or None, list of (length, slow, fast) timings)
+    """
+    timings = []
+    crossover = None
+    size = min_size
+    while size <= max_size:
+        a = random_polynomial(size, kind)
+        b = random_polynomial(size, kind)
+        slow_time = best_time(lambda: slow(a, b, size), repeat)
+        fast_time = best_time(lambda: fast(a, b, size), repeat)
+        timings.append((size, slow_time, fast_time))
+        if fast_time < slow_time and crossover is None:
+            crossover = size
+        elif fast_time >= slow_time:
+            crossover = None
+        size *= 2
+    return crossover, timings
+
+def main():
+    """
+    Main function to run the crossover benchmark
+    """
+    parser = argparse.ArgumentParser(description="Find the polynomial multiplication crossover lengths")
+    parser.add_argument("--min-size", type=int, default=8)
+    parser.add_argument("--max-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("Polynomial Multiplication Crossover Benchmark")
+    print("=============================================")
+
+    schoolbook = lambda a, b, size: PolynomialMultiplication.schoolbook(a, b)
+    # A threshold just above size / 2 means exactly one level of recursion
+    # above schoolbook blocks
+    karatsuba_level = lambda a, b, size: PolynomialMultiplication.karatsuba(a, b, size // 2 + 1)
+    karatsuba = lambda a, b, size: PolynomialMultiplication.karatsuba(a, b)
+    transform = lambda a, b, size: PolynomialMultiplication.multiply(a, b, "fft")
+    comparisons = [
+        ("KARATSUBA_THRESHOLD", "schoolbook", schoolbook, "karatsuba", karatsuba_level, "int"),
+        ("FFT_THRESHOLD", "karatsuba", karatsuba, "fft", transform, "float"),
+        ("NTT_THRESHOLD", "karatsuba", karatsuba, "ntt", transform, "bigint"),
+    ]
+    for name, slow_name, slow, fast_name, fast, kind in comparisons:
+        print(f"\n{slow_name} vs {fast_name} ({kind} coefficients)")
+        print(f"{'length':>7} {slow_name + ', s':>14} {fast_name + ', s':>14}")
+        crossover, timings = find_crossover(slow, fast, kind, args.min_size, args.max_size, args.repeat)
+        for size, slow_time, fast_time in timings:
+            print(f"{size:>7} {slow_time:>14.5f} {fast_time:>14.5f}")
+        if crossover is None:
+            print(f"{slow_name} was faster up to {args.max_size}; keep {name} at {args.max_size} or more")
+        else:
+            print(f"Suggested PolynomialMultiplication.{name} = {crossover}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Complex Array Implementation
+Author: Андрій Будильников
+
+This module provides ComplexArray, a sequence of complex numbers stored as two
+array('d') buffers (real parts and imaginary parts) instead of one heap object
+per value. Arithmetic, magnitudes and phases are computed for the whole array
+at once, slices are views that share the buffers, and the buffers can be
+exported through the buffer protocol. FFT.fft and FFT.ifft accept a
+ComplexArray and return one.
+"""
+
+import math
+import numbers
+import operator
+from array import array
+from itertools import repeat
+
+from complex_number import ComplexNumber
+
+_get_real = operator.attrgetter("real")
+_get_imag = operator.attrgetter("imag")
+
+class ComplexArray:
+    """
+    A fixed-length array of complex numbers in struct-of-arrays layout.
+    """
+
+    __slots__ = ("_real", "_imag")
+
+    def __init__(self, real=(), imag=None):
+        """
+        Initialize from sequences of real and imaginary parts.
+
+        Arguments that already are array('d') buffers are used without copying;
+        imag defaults to zeros.
+        """
+        if not (isinstance(real, array) and real.typecode == "d"):
+            real = array("d", real)
+        if imag is None:
+            imag = array("d", bytes(8 * len(real)))
+        elif not (isinstance(imag, array) and imag.typecode == "d"):
+            imag = array("d", imag)
+        if len(real) != len(imag):
+            raise ValueError("Real and imaginary parts must have the same length")
+        self._real = memoryview(real)
+        self._imag = memoryview(imag)
+
+    @classmethod
+    def _view(cls, real, imag):
+        """
+        Wrap two memoryviews without copying them.
+        """
+        result = cls.__new__(cls)
+        result._real = real
+        result._imag = imag
+        return result
+
+    @classmethod
+    def zeros(cls, n):
+        """
+        Create an array of n zeros.
+        """
+        return cls(array("d", bytes(8 * n)), array("d", bytes(8 * n)))
+
+    @classmethod
+    def from_complex(cls, values):
+        """
+        Create an array from builtin complex numbers, ComplexNumber objects or
+        any values accepted by complex().
+        """
+        values = list(map(complex, values))
+        return cls(array("d", map(_get_real, values)), array("d", map(_get_imag, values)))
+
+    @classmethod
+    def from_polar(cls, magnitude, phase):
+        """
+        Create an array from sequences of magnitudes and phases.
+        """
+        if len(magnitude) != len(phase):
+            raise ValueError("Magnitude and phase must have the same length")
+        return cls(array("d", map(operator.mul, magnitude, map(math.cos, phase))),
+                   array("d", map(operator.mul, magnitude, map(math.sin, phase))))
+
+    @property
+    def real(self):
+        """
+        Real parts as a memoryview of doubles (buffer protocol export).
+        """
+        return self._real
+
+    @property
+    def imag(self):
+        """
+        Imaginary parts as a memoryview of doubles (buffer protocol export).
+        """
+        return self._imag
+
+    def tocomplex(self):
+        """
+        Return the values as a list of builtin complex numbers.
+        """
+        return list(map(complex, self._real, self._imag))
+
+    def copy(self):
+        """
+        Return a copy with its own contiguous buffers.
+        """
+        return ComplexArray(array("d", self._real), array("d", self._imag))
+
+    def __len__(self):
+        return len(self._real)
+
+    def __iter__(self):
+        return map(complex, self._real, self._imag)
+
+    def __getitem__(self, key):
+        """
+        An integer index returns a builtin complex; a slice returns a view
+        sharing the buffers.
+        """
+        if isinstance(key, slice):
+            return ComplexArray._view(self._real[key], self._imag[key])
+        return complex(self._real[key], self._imag[key])
+
+    def __setitem__(self, key, value):
+        """
+        Assign a single value or, for a slice, a sequence of values.
+        """
+        if isinstance(key, slice):
+            if not isinstance(value, ComplexArray):
+                value = ComplexArray.from_complex(value)
+            self._real[key] = array("d", value._real)
+            self._imag[key] = array("d", value._imag)
+        else:
+            value = complex(value)
+            self._real[key] = value.real
+            self._imag[key] = value.imag
+
+    def __repr__(self):
+        """
+        Return a string representation for debugging.
+        """
+        return f"ComplexArray({self.tocomplex()})"
+
+    def __eq__(self, other):
+        """
+        Compare element-wise with another ComplexArray or a list or tuple of
+        numbers.
+        """
+        if isinstance(other, ComplexArray):
+            return self._real == other._real and self._imag == other._imag
+        if isinstance(other, (list, tuple)):
+            return self.tocomplex() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def _operand(self, other):
+        """
+        Return (real parts, imaginary parts, is_scalar) for an array operand of
+        the same length or a scalar, or None for unsupported operands.
+        """
+        if isinstance(other, ComplexArray):
+            if len(other) != len(self):
+                raise ValueError("Arrays must have the same length")
+            return other._real, other._imag, False
+        if isinstance(other, (numbers.Complex, ComplexNumber)):
+            return other.real, other.imag, True
+        return None
+
+    def __add__(self, other):
+        """
+        Element-wise addition of an array or a scalar.
+        """
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        c, d, scalar = operand
+        if scalar:
+            c, d = repeat(c), repeat(d)
+        return ComplexArray(array("d", map(operator.add, self._real, c)),
+                            array("d", map(operator.add, self._imag, d)))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """
+        Element-wise subtraction of an array or a scalar.
+        """
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        c, d, scalar = operand
+        if scalar:
+            c, d = repeat(c), repeat(d)
+        return ComplexArray(array("d", map(operator.sub, self._real, c)),
+                            array("d", map(operator.sub, self._imag, d)))
+
+    def __rsub__(self, other):
+        """
+        Scalar minus array.
+        """
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        c, d, _ = operand
+        return ComplexArray(array("d", map(operator.sub, repeat(c), self._real)),
+                            array("d", map(operator.sub, repeat(d), self._imag)))
+
+    def __mul__(self, other):
+        """
+        Element-wise multiplication by an array or a scalar.
+        """
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        c, d, scalar = operand
+        mul = operator.mul
+        if scalar:
+            if d == 0:
+                return ComplexArray(array("d", map(mul, self._real, repeat(c))),
+                                    array("d", map(mul, self._imag, repeat(c))))
+            c, d = repeat(c), repeat(d)
+        # (a + bi)(c + di) = (ac - bd) + (ad + bc)i
+        a, b = self._real, self._imag
+        return ComplexArray(array("d", map(operator.sub, map(mul, a, c), map(mul, b, d))),
+                            array("d", map(operator.add, map(mul, a, d), map(mul, b, c))))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """
+        Element-wise division by an array or a scalar.
+        """
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        c, d, scalar = operand
+        if scalar:
+            c, d = repeat(c, len(self)), repeat(d, len(self))
+        real = []
+        imag = []
+        for a, b, c, d in zip(self._real, self._imag, c, d):
+            # (a + bi) / (c + di) = [(a + bi)(c - di)] / (c² + d²)
+            denominator = c * c + d * d
+            real.append((a * c + b * d) / denominator)
+            imag.append((b * c - a * d) / denominator)
+        return ComplexArray(array("d", real), array("d", imag))
+
+    def __rtruediv__(self, other):
+        """
+        Scalar divided by array.
+        """
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        c, d, _ = operand
+        n = len(self)
+        return ComplexArray(array("d", repeat(c, n)), array("d", repeat(d, n))) / self
+
+    def __neg__(self):
+        return ComplexArray(array("d", map(operator.neg, self._real)),
+                            array("d", map(operator.neg, self._imag)))
+
+    def conjugate(self):
+        """
+        Return the element-wise complex conjugate.
+        """
+        return ComplexArray(array("d", self._real), array("d", map(operator.neg, self._imag)))
+
+    def magnitude(self):
+        """
+        Return the magnitudes as an array('d').
+        """
+        return array("d", map(math.hypot, self._real, self._imag))
+
+    def phase(self):
+        """
+        Return the phases in radians as an array('d').
+        """
+        return array("d", map(math.atan2, self._imag, self._real))
+
+    def to_polar(self):
+        """
+        Convert to polar form (magnitudes, phases).
+        """
+        return (self.magnitude(), self.phase())
+
+def main():
+    """
+    Main function to demonstrate the complex array class.
+    """
+    z = ComplexArray([3, 1, 0], [4, -2, 1])
+    w = ComplexArray.from_complex([1 + 1j, 2, -1j])
+
+    print("Complex Arrays:")
+    print(f"z = {z}")
+    print(f"w = {w}")
+
+    print("\nElement-wise Operations:")
+    print(f"z + w = {z + w}")
+    print(f"z * w = {z * w}")
+    print(f"z / 2 = {z / 2}")
+    print(f"Magnitudes of z = {z.magnitude().tolist()}")
+
+    print("\nViews:")
+    view = z[::2]
+    view[0] = 5 + 5j
+    print(f"z[::2] = {view}, z after writing through the view = {z}")
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,32 @@ This module provides a ComplexNumber class for working with complex numbers.
 """
 
 import math
+import numbers
+
+# Builtin real types handled by the operator fast paths
+_REAL_TYPES = (int, float)
+
+def _coerce(value):
+    """
+    Converts operands outside the fast paths (subclasses, Fractions and other
+    numbers.Complex types) to a ComplexNumber, or returns None.
+    """
+    if isinstance(value, (ComplexNumber, numbers.Complex)):
+        return ComplexNumber(value.real, value.imag)
+    return None
 
 class ComplexNumber:
     """
     A class representing a complex number with real and imaginary parts.
+    
+    Instances have no __dict__. They are mutable, so like Matrix they are
+    unhashable; use complex(z) as a dict key or set member. Builtin int,
+    float and complex operands are accepted everywhere, and complex(z) and
+    abs(z) work, so values can be passed directly to cmath and FFT.fft.
     """
     
+    __slots__ = ("real", "imag")
+    
     def __init__(self, real=0, imag=0):
         """
         Initialize a complex number with real and imaginary parts.
@@ -19,6 +39,30 @@ class ComplexNumber:
         self.real = real
         self.imag = imag
     
+    @classmethod
+    def from_complex(cls, value):
+        """
+        Create a complex number from a builtin complex (or any number).
+        """
+        if type(value) is complex:
+            return cls(value.real, value.imag)
+        if isinstance(value, ComplexNumber):
+            return cls(value.real, value.imag)
+        value = complex(value)
+        return cls(value.real, value.imag)
+    
+    def to_complex(self):
+        """
+        Return the value as a builtin complex.
+        """
+        return complex(self.real, self.imag)
+    
+    def __complex__(self):
+        """
+        Conversion used by complex(), cmath and FFT.fft.
+        """
+        return complex(self.real, self.imag)
+    
     def __str__(self):
         """
         Return a string representation of the complex number.
@@ -38,12 +82,15 @@ class ComplexNumber:
         """
         Add two complex numbers.
         """
-        if isinstance(other, ComplexNumber):
+        cls = type(other)
+        if cls is ComplexNumber or cls is complex:
             return ComplexNumber(self.real + other.real, self.imag + other.imag)
-        elif isinstance(other, (int, float)):
+        elif cls in _REAL_TYPES:
             return ComplexNumber(self.real + other, self.imag)
-        else:
-            raise TypeError("Unsupported operand type for +")
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self + other
     
     def __radd__(self, other):
         """
@@ -55,35 +102,46 @@ class ComplexNumber:
         """
         Subtract two complex numbers.
         """
-        if isinstance(other, ComplexNumber):
+        cls = type(other)
+        if cls is ComplexNumber or cls is complex:
             return ComplexNumber(self.real - other.real, self.imag - other.imag)
-        elif isinstance(other, (int, float)):
+        elif cls in _REAL_TYPES:
             return ComplexNumber(self.real - other, self.imag)
-        else:
-            raise TypeError("Unsupported operand type for -")
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self - other
     
     def __rsub__(self, other):
         """
         Right subtraction (when complex number is on the right side of -).
         """
-        if isinstance(other, (int, float)):
+        cls = type(other)
+        if cls is complex:
+            return ComplexNumber(other.real - self.real, other.imag - self.imag)
+        elif cls in _REAL_TYPES:
             return ComplexNumber(other - self.real, -self.imag)
-        else:
-            raise TypeError("Unsupported operand type for -")
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return other - self
     
     def __mul__(self, other):
         """
         Multiply two complex numbers.
         """
-        if isinstance(other, ComplexNumber):
+        cls = type(other)
+        if cls is ComplexNumber or cls is complex:
             # (a + bi) * (c + di) = (ac - bd) + (ad + bc)i
-            real_part = self.real * other.real - self.imag * other.imag
-            imag_part = self.real * other.imag + self.imag * other.real
-            return ComplexNumber(real_part, imag_part)
-        elif isinstance(other, (int, float)):
+            a, b = self.real, self.imag
+            c, d = other.real, other.imag
+            return ComplexNumber(a * c - b * d, a * d + b * c)
+        elif cls in _REAL_TYPES:
             return ComplexNumber(self.real * other, self.imag * other)
-        else:
-            raise TypeError("Unsupported operand type for *")
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self * other
     
     def __rmul__(self, other):
         """
@@ -95,48 +153,106 @@ class ComplexNumber:
         """
         Divide two complex numbers.
         """
-        if isinstance(other, ComplexNumber):
+        cls = type(other)
+        if cls is ComplexNumber or cls is complex:
             # (a + bi) / (c + di) = [(a + bi)(c - di)] / (c² + d²)
-            denominator = other.real**2 + other.imag**2
+            a, b = self.real, self.imag
+            c, d = other.real, other.imag
+            denominator = c * c + d * d
             if denominator == 0:
                 raise ZeroDivisionError("Division by zero complex number")
             
-            real_part = (self.real * other.real + self.imag * other.imag) / denominator
-            imag_part = (self.imag * other.real - self.real * other.imag) / denominator
-            return ComplexNumber(real_part, imag_part)
-        elif isinstance(other, (int, float)):
+            return ComplexNumber((a * c + b * d) / denominator, (b * c - a * d) / denominator)
+        elif cls in _REAL_TYPES:
             if other == 0:
                 raise ZeroDivisionError("Division by zero")
             return ComplexNumber(self.real / other, self.imag / other)
-        else:
-            raise TypeError("Unsupported operand type for /")
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self / other
     
     def __rtruediv__(self, other):
         """
         Right division (when complex number is on the right side of /).
         """
-        if isinstance(other, (int, float)):
+        cls = type(other)
+        if cls is complex:
+            return ComplexNumber(other.real, other.imag) / self
+        elif cls in _REAL_TYPES:
             # other / self
-            denominator = self.real**2 + self.imag**2
+            denominator = self.real * self.real + self.imag * self.imag
             if denominator == 0:
                 raise ZeroDivisionError("Division by zero complex number")
             
             real_part = (other * self.real) / denominator
             imag_part = (-other * self.imag) / denominator
             return ComplexNumber(real_part, imag_part)
-        else:
-            raise TypeError("Unsupported operand type for /")
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return other / self
+    
+    def __pow__(self, exponent):
+        """
+        Raise the complex number to a power.
+        
+        Integer exponents use repeated squaring, so integer parts stay exact;
+        other exponents go through the builtin complex power.
+        """
+        if type(exponent) is int:
+            if exponent < 0:
+                return 1 / self.__pow__(-exponent)
+            result_real, result_imag = 1, 0
+            a, b = self.real, self.imag
+            while exponent:
+                if exponent & 1:
+                    result_real, result_imag = result_real * a - result_imag * b, result_real * b + result_imag * a
+                exponent >>= 1
+                if exponent:
+                    a, b = a * a - b * b, 2 * a * b
+            return ComplexNumber(result_real, result_imag)
+        if type(exponent) in (float, complex, ComplexNumber):
+            return ComplexNumber.from_complex(complex(self) ** complex(exponent))
+        return NotImplemented
+    
+    def __rpow__(self, base):
+        """
+        Raise a real or builtin complex number to a complex power.
+        """
+        if type(base) in (int, float, complex):
+            return ComplexNumber.from_complex(complex(base) ** complex(self))
+        return NotImplemented
+    
+    def __neg__(self):
+        """
+        Return the negated complex number.
+        """
+        return ComplexNumber(-self.real, -self.imag)
+    
+    def __abs__(self):
+        """
+        Return the magnitude, so abs(z) works like for builtin numbers.
+        """
+        return math.hypot(self.real, self.imag)
     
     def __eq__(self, other):
         """
         Check equality of two complex numbers.
         """
-        if isinstance(other, ComplexNumber):
+        cls = type(other)
+        if cls is ComplexNumber or cls is complex:
             return self.real == other.real and self.imag == other.imag
-        elif isinstance(other, (int, float)):
+        elif cls in _REAL_TYPES:
             return self.real == other and self.imag == 0
-        else:
+        other = _coerce(other)
+        if other is None:
             return False
+        return self.real == other.real and self.imag == other.imag
+    
+    # Mutable values must not be hashed: a changed value would be lost
+    # inside a dict or set
+    __hash__ = None
     
     def conjugate(self):
         """
@@ -148,7 +264,7 @@ class ComplexNumber:
         """
         Return the magnitude (absolute value) of the complex number.
         """
-        return math.sqrt(self.real**2 + self.imag**2)
+        return math.hypot(self.real, self.imag)
     
     def phase(self):
         """
@@ -203,6 +319,13 @@ def main():
     # Create from polar
     z3 = ComplexNumber.from_polar(5, 0.927)  # Should be close to 3 + 4i
     print(f"From polar (5, 0.927): {z3}")
+    
+    # Interoperability with builtin complex numbers
+    print("\nInteroperability:")
+    print(f"z1 ** 2 = {z1 ** 2}")
+    print(f"abs(z1) = {abs(z1)}")
+    print(f"complex(z1) = {complex(z1)}")
+    print(f"z1 + 1j = {z1 + 1j}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,56 +1,455 @@
 import cmath
 import math
+import operator
+import os
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from complex_array import ComplexArray
+from ntt import NTT
 
 class FFT:
     
+    # Maximum number of transform sizes whose plans (bit-reversal permutation
+    # and per-stage twiddle factors) are kept in memory
+    PLAN_CACHE_SIZE = 32
+    
+    _plans = OrderedDict()
+    
+    # polynomial_multiply switches integer inputs to the exact NTT backend when
+    # max|a| * max|b| * min(len) * log2(N) exceeds this
+    FLOAT_EXACT_LIMIT = 2 ** 40
+    
+    # Batches of at least this many samples (signals * length) are split
+    # across worker processes by fft_batch, fft2 and ifft2
+    PARALLEL_THRESHOLD = 1 << 20
+    
     @staticmethod
-    def fft(x):
-        x = [complex(val) for val in x]
+    def _cached(key, build):
+        plans = FFT._plans
+        plan = plans.get(key)
+        if plan is not None:
+            plans.move_to_end(key)
+            return plan
+        
+        plan = build()
+        plans[key] = plan
+        if len(plans) > FFT.PLAN_CACHE_SIZE:
+            plans.popitem(last=False)
+        return plan
+    
+    @staticmethod
+    def _plan(n):
+        return FFT._cached(n, lambda: FFT._build_plan(n))
+    
+    @staticmethod
+    def _build_plan(n):
+        reverse = [0]
+        while len(reverse) < n:
+            reverse = [2 * r for r in reverse] + [2 * r + 1 for r in reverse]
+        
+        twiddles = [cmath.exp(-2j * cmath.pi * k / n) for k in range(n // 2)]
+        stages = []
+        half = 1
+        while half < n:
+            stages.append((half, twiddles[::n // (2 * half)]))
+            half *= 2
+        
+        return (reverse, stages)
+    
+    @staticmethod
+    def _real_twiddles(n):
+        # e^(-2*pi*i*k/n) for k = 0..n/2, used to split a packed real transform
+        return FFT._cached(("real", n),
+                           lambda: [cmath.exp(-2j * cmath.pi * k / n) for k in range(n // 2 + 1)])
+    
+    @staticmethod
+    def clear_plan_cache():
+        FFT._plans.clear()
+    
+    @staticmethod
+    def fft_inplace(x):
+        # Iterative radix-2 transform of a list whose length is a power of two;
+        # the list is overwritten with its spectrum and returned
+        n = len(x)
+        if n & (n - 1):
+            raise ValueError("In-place FFT length must be a power of two")
+        if n <= 1:
+            return x
+        
+        reverse, stages = FFT._plan(n)
+        x[:] = [x[r] for r in reverse]
+        
+        add = operator.add
+        sub = operator.sub
+        mul = operator.mul
+        for half, twiddles in stages:
+            size = 2 * half
+            if half >= n // size:
+                # Few long blocks: butterfly each block with contiguous slices
+                for start in range(0, n, size):
+                    mid = start + half
+                    end = start + size
+                    even = x[start:mid]
+                    odd = list(map(mul, twiddles, x[mid:end]))
+                    x[start:mid] = map(add, even, odd)
+                    x[mid:end] = map(sub, even, odd)
+            else:
+                # Many short blocks: handle butterfly k of every block at once
+                for k in range(half):
+                    w = twiddles[k]
+                    even = x[k::size]
+                    odd = [w * v for v in x[k + half::size]]
+                    x[k::size] = list(map(add, even, odd))
+                    x[k + half::size] = list(map(sub, even, odd))
+        return x
+    
+    @staticmethod
+    def ifft_inplace(X):
+        n = len(X)
+        X[:] = [complex(v).conjugate() for v in X]
+        FFT.fft_inplace(X)
+        X[:] = [v.conjugate() / n for v in X]
+        return X
+    
+    @staticmethod
+    def fft(x, pad=False):
+        # Exact N-point DFT for any N: radix-2 for powers of two, mixed radix
+        # 2/3/5 for sizes with no other prime factors and Bluestein's chirp-z
+        # algorithm otherwise, so the output has exactly len(x) bins. Earlier
+        # versions zero-padded to the next power of two and returned that many
+        # bins; pad=True restores that behavior. A ComplexArray input gives a
+        # ComplexArray output; it is transformed as a list of builtin complex
+        # values (tocomplex) and the result is split back into its two buffers
+        if isinstance(x, ComplexArray):
+            return ComplexArray.from_complex(FFT.fft(x.tocomplex(), pad))
+        
+        x = list(map(complex, x))
         
         N = len(x)
         
-        if N & (N - 1) != 0:
-            next_power_of_2 = 1
-            while next_power_of_2 < N:
-                next_power_of_2 <<= 1
-            x.extend([0] * (next_power_of_2 - N))
+        if pad and N & (N - 1) != 0:
+            x.extend([0] * (FFT._next_power_of_2(N) - N))
             N = len(x)
         
         if N <= 1:
             return x
         
-        even = FFT.fft(x[0::2])
-        odd = FFT.fft(x[1::2])
+        if N & (N - 1) == 0:
+            return FFT.fft_inplace(x)
         
-        T = [cmath.exp(-2j * cmath.pi * k / N) * odd[k] for k in range(N // 2)]
-        return [even[k] + T[k] for k in range(N // 2)] + \
-               [even[k] - T[k] for k in range(N // 2)]
+        if FFT._is_smooth(N):
+            return FFT._mixed_radix(x)
+        
+        return FFT._bluestein(x)
 
     @staticmethod
-    def ifft(X):
+    def ifft(X, pad=False):
+        if isinstance(X, ComplexArray):
+            return ComplexArray.from_complex(FFT.ifft(X.tocomplex(), pad))
+        
         N = len(X)
-        X_conj = [x.conjugate() for x in X]
-        result = FFT.fft(X_conj)
+        X_conj = [complex(x).conjugate() for x in X]
+        result = FFT.fft(X_conj, pad)
         return [x.conjugate() / N for x in result]
 
     @staticmethod
-    def polynomial_multiply(poly1, poly2):
-        n = len(poly1) + len(poly2) - 1
+    def _is_smooth(n):
+        for p in (2, 3, 5):
+            while n % p == 0:
+                n //= p
+        return n == 1
+    
+    @staticmethod
+    def _roots_of_unity(n):
+        # e^(-2*pi*i*t/n) for t = 0..n-1
+        return FFT._cached(("roots", n),
+                           lambda: [cmath.exp(-2j * cmath.pi * t / n) for t in range(n)])
+    
+    @staticmethod
+    def _mixed_radix(x):
+        # Decimation in time: split off factors of 3 and 5 until the remaining
+        # length is a power of two, which goes to the radix-2 kernel
+        n = len(x)
+        if n & (n - 1) == 0:
+            return FFT.fft_inplace(x)
+        
+        radix = 3 if n % 3 == 0 else 5
+        m = n // radix
+        roots = FFT._roots_of_unity(n)
+        subs = [FFT._mixed_radix(x[j::radix]) for j in range(radix)]
+        
+        # Twiddle the j-th subsequence by w^(j*k)
+        twiddled = [subs[0]] + [list(map(operator.mul, roots[0:j * m:j], subs[j]))
+                                for j in range(1, radix)]
+        
+        result = []
+        for q in range(radix):
+            acc = twiddled[0]
+            for j in range(1, radix):
+                c = roots[(j * q * m) % n]
+                acc = [a + c * b for a, b in zip(acc, twiddled[j])]
+            result.extend(acc)
+        return result
+    
+    @staticmethod
+    def _bluestein_plan(n):
+        # Chirp w_k = e^(-pi*i*k^2/n) and the spectrum of the conjugate chirp
+        # laid out for a circular convolution of power-of-two length M >= 2n - 1
+        chirp = [cmath.exp(-1j * cmath.pi * ((k * k) % (2 * n)) / n) for k in range(n)]
+        M = FFT._next_power_of_2(2 * n - 1)
+        b = [0j] * M
+        b[0] = chirp[0].conjugate()
+        for k in range(1, n):
+            b[k] = b[M - k] = chirp[k].conjugate()
+        return chirp, M, FFT.fft_inplace(b)
+    
+    @staticmethod
+    def _bluestein(x):
+        n = len(x)
+        chirp, M, b_spectrum = FFT._cached(("bluestein", n), lambda: FFT._bluestein_plan(n))
+        
+        a = list(map(operator.mul, x, chirp))
+        a.extend([0j] * (M - n))
+        FFT.fft_inplace(a)
+        a[:] = map(operator.mul, a, b_spectrum)
+        FFT.ifft_inplace(a)
+        
+        return list(map(operator.mul, a[:n], chirp))
+
+    @staticmethod
+    def _next_power_of_2(n):
         next_power_of_2 = 1
         while next_power_of_2 < n:
             next_power_of_2 <<= 1
+        return next_power_of_2
+    
+    @staticmethod
+    def rfft(x):
+        # Transform of a real signal, zero-padded to a power of two N. The N
+        # samples are packed into N/2 complex values z[k] = x[2k] + i*x[2k+1],
+        # transformed with one N/2-point FFT and split into the N/2 + 1
+        # non-redundant bins X[0..N/2] (the rest are their conjugates)
+        x = [float(val) for val in x]
+        N = FFT._next_power_of_2(len(x))
+        x.extend([0.0] * (N - len(x)))
+        
+        if N == 1:
+            return [complex(x[0])]
+        
+        half = N // 2
+        z = FFT.fft_inplace(list(map(complex, x[0::2], x[1::2])))
+        twiddles = FFT._real_twiddles(N)
+        
+        spectrum = []
+        for k in range(half + 1):
+            a = z[k % half]
+            b = z[-k % half].conjugate()
+            spectrum.append((a + b) * 0.5 - 0.5j * twiddles[k] * (a - b))
+        return spectrum
+    
+    @staticmethod
+    def irfft(X, n=None):
+        # Inverse of rfft: X holds bins 0..N/2 of a real signal of length
+        # N = 2 * (len(X) - 1); returns the first n samples (all N by default)
+        half = len(X) - 1
+        if half < 1:
+            return [complex(val).real for val in X][:n]
+        N = 2 * half
+        if N & (N - 1):
+            raise ValueError("irfft expects N/2 + 1 bins of a power-of-two transform")
+        
+        twiddles = FFT._real_twiddles(N)
+        z = []
+        for k in range(half):
+            a = complex(X[k])
+            b = complex(X[half - k]).conjugate()
+            z.append((a + b) * 0.5 + 0.5j * (a - b) * twiddles[k].conjugate())
+        
+        FFT.ifft_inplace(z)
+        
+        result = [0.0] * N
+        result[0::2] = [v.real for v in z]
+        result[1::2] = [v.imag for v in z]
+        return result if n is None else result[:n]
+    
+    @staticmethod
+    def _transform_rows(rows, inverse=False):
+        # Transforms a list of equal-length complex lists in place; every row
+        # goes through the same cached plan
+        if not rows:
+            return rows
+        n = len(rows[0])
+        if n & (n - 1) == 0:
+            transform = FFT.ifft_inplace if inverse else FFT.fft_inplace
+            for row in rows:
+                transform(row)
+        else:
+            transform = FFT.ifft if inverse else FFT.fft
+            rows[:] = [transform(row) for row in rows]
+        return rows
+    
+    @staticmethod
+    def _split_rows(signals, length):
+        # Turns a list of signals or a flat buffer of count * length samples
+        # into a list of complex rows of equal length
+        if length is None:
+            rows = [list(map(complex, signal)) for signal in signals]
+            if any(len(row) != len(rows[0]) for row in rows):
+                raise ValueError("All signals in a batch must have the same length")
+            return rows
+        if length < 1 or len(signals) % length:
+            raise ValueError("Buffer length must be a multiple of the signal length")
+        return [list(map(complex, signals[start:start + length]))
+                for start in range(0, len(signals), length)]
+    
+    @staticmethod
+    def fft_batch(signals, length=None, inverse=False, workers=None):
+        # Transforms many signals of one length. signals is a list of
+        # sequences, or a flat buffer (list or array('d')) of count * length
+        # samples when length is given. Large batches are split across
+        # worker processes over shared memory (workers=None uses every CPU,
+        # 1 stays in-process); each worker builds the plan for the length once
+        rows = FFT._split_rows(signals, length)
+        if not rows:
+            return rows
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(rows) > 1 and len(rows) * len(rows[0]) >= FFT.PARALLEL_THRESHOLD:
+            return FFT._transform_parallel(rows, inverse, workers)
+        
+        return FFT._transform_rows(rows, inverse)
+    
+    @staticmethod
+    def _transform_parallel(rows, inverse, workers):
+        # Shared buffer layout: the real parts of all rows followed by their
+        # imaginary parts, each row-major
+        count = len(rows)
+        length = len(rows[0])
+        total = count * length
+        data = array("d", [v.real for row in rows for v in row])
+        data.extend([v.imag for row in rows for v in row])
+        
+        shm = shared_memory.SharedMemory(create=True, size=data.itemsize * len(data))
+        try:
+            shm.buf[:data.itemsize * len(data)] = memoryview(data).cast("B")
+            
+            chunk = max(1, -(-count // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_transform_shared_rows, shm.name, count, length,
+                                           start, min(start + chunk, count), inverse)
+                           for start in range(0, count, chunk)]
+                for future in futures:
+                    future.result()
+            
+            view = shm.buf.cast("d")
+            real = view[:total].tolist()
+            imag = view[total:2 * total].tolist()
+            view.release()
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        return [list(map(complex, real[start:start + length], imag[start:start + length]))
+                for start in range(0, total, length)]
+    
+    @staticmethod
+    def _transform_2d(matrix, shape, inverse, workers):
+        if shape is not None:
+            rows, cols = shape
+            if rows * cols != len(matrix):
+                raise ValueError("Buffer length must equal rows * cols")
+            matrix = [matrix[start:start + cols] for start in range(0, rows * cols, cols)]
+        if not matrix:
+            return []
+        
+        # Transform the rows, then the columns of the result
+        rows = FFT.fft_batch(matrix, inverse=inverse, workers=workers)
+        columns = FFT.fft_batch(list(zip(*rows)), inverse=inverse, workers=workers)
+        return [list(row) for row in zip(*columns)]
+    
+    @staticmethod
+    def fft2(matrix, shape=None, workers=None):
+        # 2D transform of a list of equal-length rows, or of a flat row-major
+        # buffer when shape=(rows, cols) is given
+        return FFT._transform_2d(matrix, shape, False, workers)
+    
+    @staticmethod
+    def ifft2(matrix, shape=None, workers=None):
+        return FFT._transform_2d(matrix, shape, True, workers)
+    
+    @staticmethod
+    def _exceeds_float_precision(poly1, poly2, length):
+        # Rounding error of the float transform grows like eps * bound * log2(N);
+        # leave a wide margin below the 53-bit mantissa
+        bound = max(map(abs, poly1), default=0) * max(map(abs, poly2), default=0) * \
+            min(len(poly1), len(poly2))
+        return bound * max(1, length.bit_length()) > FFT.FLOAT_EXACT_LIMIT
+    
+    @staticmethod
+    def polynomial_multiply(poly1, poly2, backend="auto"):
+        # backend: "float" (complex/real FFT, results rounded to 10 digits),
+        # "ntt" (exact integer arithmetic, integer coefficients only) or "auto",
+        # which picks NTT for integer inputs whose products could exceed the
+        # precision of the floating-point transform. Integer inputs give
+        # integer coefficients whenever the result is exact; forcing "float"
+        # on integers too large for it returns the rounded floats instead of
+        # integers that could be wrong
+        if backend not in ("auto", "float", "ntt"):
+            raise ValueError("backend must be 'auto', 'float' or 'ntt'")
+        
+        n = len(poly1) + len(poly2) - 1
+        next_power_of_2 = FFT._next_power_of_2(n)
+        
+        integer = all(isinstance(c, int) for c in poly1) and all(isinstance(c, int) for c in poly2)
+        exact = integer and not FFT._exceeds_float_precision(poly1, poly2, next_power_of_2)
+        if backend != "float" and integer:
+            if backend == "ntt" or not exact:
+                return NTT.multiply(poly1, poly2)
+        elif backend == "ntt":
+            raise TypeError("The NTT backend needs integer coefficients")
         
         p1 = poly1 + [0] * (next_power_of_2 - len(poly1))
         p2 = poly2 + [0] * (next_power_of_2 - len(poly2))
         
-        fft1 = FFT.fft(p1)
-        fft2 = FFT.fft(p2)
+        if any(isinstance(c, complex) for c in p1) or any(isinstance(c, complex) for c in p2):
+            fft1 = FFT.fft(p1)
+            fft2 = FFT.fft(p2)
+            
+            fft_product = [a * b for a, b in zip(fft1, fft2)]
+            
+            result = FFT.ifft(fft_product)
+            
+            return [round(x.real, 10) for x in result[:n]]
         
-        fft_product = [a * b for a, b in zip(fft1, fft2)]
+        # Real coefficients: half-length transforms of the packed inputs
+        fft_product = list(map(operator.mul, FFT.rfft(p1), FFT.rfft(p2)))
+        result = FFT.irfft(fft_product, n)
         
-        result = FFT.ifft(fft_product)
-        
-        return [round(x.real, 10) for x in result[:n]]
+        if exact:
+            return [int(round(x)) for x in result]
+        return [round(x, 10) for x in result]
+
+def _transform_shared_rows(name, count, length, start, stop, inverse):
+    # Worker entry point: transforms rows start..stop of the shared buffer
+    # written by FFT._transform_parallel and stores the spectra in place
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = shm.buf.cast("d")
+        total = count * length
+        rows = [list(map(complex, view[i * length:(i + 1) * length].tolist(),
+                         view[total + i * length:total + (i + 1) * length].tolist()))
+                for i in range(start, stop)]
+        FFT._transform_rows(rows, inverse)
+        for i, row in zip(range(start, stop), rows):
+            view[i * length:(i + 1) * length] = array("d", [v.real for v in row])
+            view[total + i * length:total + (i + 1) * length] = array("d", [v.imag for v in row])
+        view.release()
+    finally:
+        shm.close()
 
 def main():
     print("=== Fast Fourier Transform Demo ===\n")
@@ -0,0 +1,203 @@
+"""
+Streaming Convolution and STFT
+Author: Андрій Будильников
+
+This module processes real-valued signals that arrive as an iterable of chunks
+and may be far longer than memory. Convolution with a fixed kernel uses the
+overlap-add or overlap-save method, and the short-time Fourier transform
+slides a window with a configurable hop. All of them are generators that
+yield results as soon as enough input has arrived, keep only one block of
+samples in memory and reuse cached kernel spectra and windows.
+"""
+
+import functools
+import math
+
+from fft import FFT
+
+class StreamingFFT:
+    """
+    Generator-based block processing on top of FFT
+    """
+
+    @staticmethod
+    def _blocks(chunks, size):
+        """
+        Regroups an iterable of chunks into lists of exactly size samples;
+        the last block may be shorter
+        """
+        buffer = []
+        for chunk in chunks:
+            buffer.extend(chunk)
+            if len(buffer) >= size:
+                count = len(buffer) // size * size
+                for start in range(0, count, size):
+                    yield buffer[start:start + size]
+                del buffer[:count]
+        if buffer:
+            yield buffer
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _kernel_spectrum(kernel, size):
+        """
+        Real FFT of a kernel zero-padded to size (cached per kernel and size)
+        """
+        return FFT.rfft(list(kernel) + [0.0] * (size - len(kernel)))
+
+    @staticmethod
+    def _fft_size(kernel_length, block_size):
+        """
+        Picks the block and transform sizes for a kernel
+        """
+        if block_size is None:
+            # A transform of about 4-8 kernel lengths keeps the overhead low
+            size = FFT._next_power_of_2(4 * kernel_length)
+            block_size = size - kernel_length + 1
+        else:
+            size = FFT._next_power_of_2(block_size + kernel_length - 1)
+        return block_size, size
+
+    @staticmethod
+    def overlap_add(chunks, kernel, block_size=None):
+        """
+        Convolves a stream with a kernel using the overlap-add method
+        :param chunks: Iterable of sample chunks (lists of real numbers)
+        :param kernel: Convolution kernel (real numbers)
+        :param block_size: Input samples per transform (chosen from the kernel by default)
+        :return: Generator of output blocks; together they form the full linear
+                 convolution of length len(signal) + len(kernel) - 1
+        """
+        kernel = tuple(float(k) for k in kernel)
+        m = len(kernel)
+        if m == 0:
+            raise ValueError("Kernel must not be empty")
+        block_size, size = StreamingFFT._fft_size(m, block_size)
+        spectrum = StreamingFFT._kernel_spectrum(kernel, size)
+
+        tail = [0.0] * (m - 1)
+        received = False
+        for block in StreamingFFT._blocks(chunks, block_size):
+            received = True
+            product = [a * b for a, b in zip(FFT.rfft(block + [0.0] * (size - len(block))), spectrum)]
+            output = FFT.irfft(product, len(block) + m - 1)
+            for i, value in enumerate(tail):
+                output[i] += value
+            count = len(block)
+            tail = output[count:]
+            yield output[:count]
+        if received and tail:
+            yield tail
+
+    @staticmethod
+    def overlap_save(chunks, kernel, block_size=None):
+        """
+        Convolves a stream with a kernel using the overlap-save method
+        :param chunks: Iterable of sample chunks (lists of real numbers)
+        :param kernel: Convolution kernel (real numbers)
+        :param block_size: New input samples per transform (chosen from the kernel by default)
+        :return: Generator of output blocks; together they form the full linear
+                 convolution of length len(signal) + len(kernel) - 1
+        """
+        kernel = tuple(float(k) for k in kernel)
+        m = len(kernel)
+        if m == 0:
+            raise ValueError("Kernel must not be empty")
+        block_size, size = StreamingFFT._fft_size(m, block_size)
+        spectrum = StreamingFFT._kernel_spectrum(kernel, size)
+
+        def padded():
+            # The last m - 1 outputs are flushed by feeding zeros
+            received = False
+            for chunk in chunks:
+                received = True
+                yield chunk
+            if received:
+                yield [0.0] * (m - 1)
+
+        history = [0.0] * (m - 1)
+        for block in StreamingFFT._blocks(padded(), block_size):
+            # Circular convolution of history + block; the first m - 1 outputs
+            # are wrapped around and discarded
+            segment = history + block
+            segment.extend([0.0] * (size - len(segment)))
+            product = [a * b for a, b in zip(FFT.rfft(segment), spectrum)]
+            yield FFT.irfft(product)[m - 1:m - 1 + len(block)]
+            if m > 1:
+                history = (history + block)[-(m - 1):]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _window(name, size):
+        """
+        Window coefficients (cached per name and size)
+        """
+        if name in ("rect", "rectangular", None):
+            return (1.0,) * size
+        if size == 1:
+            return (1.0,)
+        if name == "hann":
+            return tuple(0.5 - 0.5 * math.cos(2 * math.pi * n / size) for n in range(size))
+        if name == "hamming":
+            return tuple(0.54 - 0.46 * math.cos(2 * math.pi * n / size) for n in range(size))
+        if name == "blackman":
+            return tuple(0.42 - 0.5 * math.cos(2 * math.pi * n / size) + 0.08 * math.cos(4 * math.pi * n / size)
+                         for n in range(size))
+        raise ValueError(f"Unknown window: {name}")
+
+    @staticmethod
+    def stft(chunks, window_size, hop=None, window="hann", pad_end=False):
+        """
+        Short-time Fourier transform of a stream
+        :param chunks: Iterable of sample chunks (lists of real numbers)
+        :param window_size: Samples per frame
+        :param hop: Samples between frame starts (window_size // 2 by default)
+        :param window: "hann", "hamming", "blackman", "rect" or a sequence of coefficients
+        :param pad_end: Zero-pad the trailing samples into one last frame
+        :return: Generator of frames, each holding the window_size // 2 + 1
+                 non-redundant frequency bins
+        """
+        if window_size < 1:
+            raise ValueError("Window size must be positive")
+        if hop is None:
+            hop = max(1, window_size // 2)
+        if hop < 1:
+            raise ValueError("Hop must be positive")
+        if isinstance(window, str) or window is None:
+            coefficients = StreamingFFT._window(window, window_size)
+        else:
+            coefficients = tuple(window)
+            if len(coefficients) != window_size:
+                raise ValueError("Window length must equal window_size")
+
+        power_of_two = window_size & (window_size - 1) == 0
+        bins = window_size // 2 + 1
+
+        def transform(frame):
+            frame = [s * w for s, w in zip(frame, coefficients)]
+            if power_of_two:
+                return FFT.rfft(frame)
+            return FFT.fft(frame)[:bins]
+
+        buffer = []
+        skip = 0
+        for chunk in chunks:
+            chunk = list(chunk)
+            if skip:
+                # The previous hop jumped past the buffered samples
+                drop = min(skip, len(chunk))
+                del chunk[:drop]
+                skip -= drop
+            buffer.extend(chunk)
+            start = 0
+            while len(buffer) - start >= window_size:
+                yield transform(buffer[start:start + window_size])
+                start += hop
+            if start > len(buffer):
+                skip = start - len(buffer)
+                start = len(buffer)
+            # Keep only the samples later frames still need
+            del buffer[:start]
+
+        if pad_end and buffer:
+            yield transform(buffer + [0.0] * (window_size - len(buffer)))
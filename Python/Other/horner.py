@@ -0,0 +1,207 @@
+"""
+Compiled Horner Polynomial Evaluator
+Author: Андрій Будильников
+
+This module evaluates polynomials with Horner's scheme, which needs one
+multiplication and one addition per coefficient and no powers. The value and
+the first derivative come out of the same pass. For polynomials of moderate
+degree the scheme is compiled into straight-line Python code with the
+coefficients bound as local constants, and the compiled evaluators are cached
+per coefficient tuple, so repeated evaluation (Newton iterations, bulk
+evaluation over many points) pays no setup cost.
+"""
+
+import functools
+
+class HornerEvaluator:
+    """
+    Evaluates a fixed polynomial and its derivative
+    """
+
+    # Polynomials with more coefficients use a generic loop instead of
+    # generated straight-line code
+    UNROLL_LIMIT = 64
+
+    # Number of compiled evaluators kept by for_coefficients
+    CACHE_SIZE = 256
+
+    # LRU-cached _compile sized by CACHE_SIZE, built on first use
+    _cache = None
+
+    __slots__ = ("coefficients", "degree", "_value", "_value_and_derivative",
+                 "_value_many", "_value_and_derivative_many")
+
+    def __init__(self, coefficients):
+        """
+        Compiles an evaluator (use for_coefficients to share cached ones)
+        :param coefficients: Coefficients from highest degree to constant term
+        """
+        self.coefficients = tuple(coefficients)
+        self.degree = len(self.coefficients) - 1
+        if len(self.coefficients) <= HornerEvaluator.UNROLL_LIMIT:
+            functions = _generate(self.coefficients)
+        else:
+            functions = _generic(self.coefficients)
+        (self._value, self._value_and_derivative,
+         self._value_many, self._value_and_derivative_many) = functions
+
+    @staticmethod
+    def for_coefficients(coefficients):
+        """
+        Returns the cached evaluator for a coefficient sequence
+        :param coefficients: Coefficients from highest degree to constant term
+        :return: HornerEvaluator
+        """
+        coefficients = tuple(coefficients)
+        # Equal coefficients of different types (1, 1.0, 1+0j) must not share
+        # an evaluator, since the results would take the cached types
+        return HornerEvaluator._cached_evaluator()(coefficients, tuple(map(type, coefficients)))
+
+    @staticmethod
+    def _cached_evaluator():
+        """
+        Returns the cached compile function, rebuilding the cache when
+        CACHE_SIZE has changed since it was created
+        """
+        cache = HornerEvaluator._cache
+        size = HornerEvaluator.CACHE_SIZE
+        if cache is None or cache.cache_parameters()["maxsize"] != size:
+            cache = functools.lru_cache(maxsize=size)(_compile)
+            HornerEvaluator._cache = cache
+        return cache
+
+    @staticmethod
+    def clear_cache():
+        """
+        Drops all cached evaluators
+        """
+        if HornerEvaluator._cache is not None:
+            HornerEvaluator._cache.cache_clear()
+
+    def __call__(self, x):
+        """
+        Evaluates the polynomial at x
+        """
+        return self._value(x)
+
+    def value_and_derivative(self, x):
+        """
+        Evaluates the polynomial and its derivative at x in one pass
+        :return: Tuple (f(x), f'(x))
+        """
+        return self._value_and_derivative(x)
+
+    def evaluate_many(self, xs):
+        """
+        Evaluates the polynomial at every point of an iterable
+        :return: List of values
+        """
+        return self._value_many(xs)
+
+    def value_and_derivative_many(self, xs):
+        """
+        Evaluates the polynomial and its derivative at every point of an iterable
+        :return: Tuple (list of f(x), list of f'(x))
+        """
+        return self._value_and_derivative_many(xs)
+
+    def __repr__(self):
+        return f"HornerEvaluator({list(self.coefficients)})"
+
+
+def _generate(coefficients):
+    """
+    Builds straight-line evaluators with the coefficients as default arguments
+    (local variables of the generated functions)
+    """
+    n = len(coefficients)
+    names = [f"c{i}" for i in range(n)]
+    parameters = "".join(f", {name}={name}" for name in names)
+
+    if n == 0:
+        value = "0"
+    else:
+        value = names[0]
+        for name in names[1:]:
+            value = f"({value}) * x + {name}"
+
+    # p accumulates the value and d the derivative: d = d * x + p, p = p * x + c
+    steps = []
+    if n == 0:
+        steps.append("p = 0")
+    else:
+        steps.append(f"p = {names[0]}")
+    steps.append("d = 0")
+    for name in names[1:]:
+        steps.append("d = d * x + p")
+        steps.append(f"p = p * x + {name}")
+
+    body = "\n    ".join(steps)
+    loop_body = "\n        ".join(steps)
+    source = f"""
+def value(x{parameters}):
+    return {value}
+
+def value_and_derivative(x{parameters}):
+    {body}
+    return p, d
+
+def value_many(xs{parameters}):
+    return [{value} for x in xs]
+
+def value_and_derivative_many(xs{parameters}):
+    values = []
+    slopes = []
+    for x in xs:
+        {loop_body}
+        values.append(p)
+        slopes.append(d)
+    return values, slopes
+"""
+    namespace = dict(zip(names, coefficients))
+    exec(compile(source, "<horner>", "exec"), namespace)
+    return (namespace["value"], namespace["value_and_derivative"],
+            namespace["value_many"], namespace["value_and_derivative_many"])
+
+
+def _generic(coefficients):
+    """
+    Builds loop-based evaluators for long coefficient tuples
+    """
+    head = coefficients[0]
+    tail = coefficients[1:]
+
+    def value(x):
+        p = head
+        for c in tail:
+            p = p * x + c
+        return p
+
+    def value_and_derivative(x):
+        p = head
+        d = 0
+        for c in tail:
+            d = d * x + p
+            p = p * x + c
+        return p, d
+
+    def value_many(xs):
+        return [value(x) for x in xs]
+
+    def value_and_derivative_many(xs):
+        values = []
+        slopes = []
+        for x in xs:
+            p, d = value_and_derivative(x)
+            values.append(p)
+            slopes.append(d)
+        return values, slopes
+
+    return value, value_and_derivative, value_many, value_and_derivative_many
+
+
+def _compile(coefficients, types):
+    """
+    Compiles an evaluator; types only takes part in the cache key
+    """
+    return HornerEvaluator(coefficients)
@@ -0,0 +1,251 @@
+"""
+Number-Theoretic Transform
+Author: Андрій Будильников
+
+This module provides an exact alternative to the floating-point FFT for
+multiplying integer polynomials. The transform works modulo primes of the
+form c * 2^k + 1, which have 2^k-th roots of unity, and the coefficient
+residues from several primes are combined with the Chinese remainder theorem,
+so products of polynomials with arbitrarily large integer coefficients are
+exact and still take O(n log n) transforms per prime.
+"""
+
+import math
+from collections import OrderedDict
+
+class NTT:
+    """
+    Exact polynomial multiplication via number-theoretic transforms
+    """
+
+    # Well-known NTT-friendly primes (modulus, primitive root); each supports
+    # transforms of length up to 2^23
+    PRIMES = [
+        (998244353, 3),
+        (167772161, 3),
+        (469762049, 3),
+        (754974721, 11),
+        (1224736769, 3),
+    ]
+
+    # Maximum number of (prime, length) plans kept in memory
+    PLAN_CACHE_SIZE = 32
+
+    _plans = OrderedDict()
+    _generated = {}
+
+    @staticmethod
+    def _is_prime(n):
+        """
+        Deterministic Miller-Rabin test for n < 3.3 * 10^24
+        """
+        if n < 2:
+            return False
+        small = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+        for p in small:
+            if n % p == 0:
+                return n == p
+        d = n - 1
+        s = 0
+        while d % 2 == 0:
+            d //= 2
+            s += 1
+        for a in small:
+            x = pow(a, d, n)
+            if x == 1 or x == n - 1:
+                continue
+            for _ in range(s - 1):
+                x = x * x % n
+                if x == n - 1:
+                    break
+            else:
+                return False
+        return True
+
+    @staticmethod
+    def _primitive_root(p):
+        """
+        Finds a generator of the multiplicative group modulo prime p
+        """
+        factors = []
+        m = p - 1
+        q = 2
+        while q * q <= m:
+            if m % q == 0:
+                factors.append(q)
+                while m % q == 0:
+                    m //= q
+            q += 1
+        if m > 1:
+            factors.append(m)
+        g = 2
+        while any(pow(g, (p - 1) // q, p) == 1 for q in factors):
+            g += 1
+        return g
+
+    @staticmethod
+    def primes_for(bound, length):
+        """
+        Chooses NTT primes whose product exceeds bound and that support the length
+        :param bound: The product of the chosen primes must be larger than this
+        :param length: Transform length (a power of two)
+        :return: List of (prime, primitive root)
+        """
+        log_length = max(1, length.bit_length() - 1)
+        chosen = []
+        product = 1
+        for p, g in NTT.PRIMES:
+            if (p - 1) % length == 0:
+                chosen.append((p, g))
+                product *= p
+                if product > bound:
+                    return chosen
+
+        # Generate further primes c * 2^k + 1 below 2^62 for large bounds or lengths
+        k = max(23, log_length)
+        generated = NTT._generated.setdefault(k, [])
+        c = ((1 << 62) >> k) if not generated else (generated[-1][0] >> k) - 1
+        index = 0
+        while product <= bound:
+            if index == len(generated):
+                while c > 0 and not NTT._is_prime(c * (1 << k) + 1):
+                    c -= 1
+                if c <= 0:
+                    raise ValueError("Transform length too large for NTT primes")
+                p = c * (1 << k) + 1
+                generated.append((p, NTT._primitive_root(p)))
+                c -= 1
+            p, g = generated[index]
+            index += 1
+            if all(p != q for q, _ in chosen):
+                chosen.append((p, g))
+                product *= p
+        return chosen
+
+    @staticmethod
+    def _plan(p, g, n):
+        """
+        Bit-reversal permutation and per-stage roots for length n modulo p
+        """
+        key = (p, n)
+        plan = NTT._plans.get(key)
+        if plan is not None:
+            NTT._plans.move_to_end(key)
+            return plan
+
+        reverse = [0]
+        while len(reverse) < n:
+            reverse = [2 * r for r in reverse] + [2 * r + 1 for r in reverse]
+
+        stages = []
+        inverse_stages = []
+        half = 1
+        while half < n:
+            w = pow(g, (p - 1) // (2 * half), p)
+            w_inv = pow(w, p - 2, p)
+            roots = [1] * half
+            inverse_roots = [1] * half
+            for j in range(1, half):
+                roots[j] = roots[j - 1] * w % p
+                inverse_roots[j] = inverse_roots[j - 1] * w_inv % p
+            stages.append((half, roots))
+            inverse_stages.append((half, inverse_roots))
+            half *= 2
+
+        plan = (reverse, stages, inverse_stages)
+        NTT._plans[key] = plan
+        if len(NTT._plans) > NTT.PLAN_CACHE_SIZE:
+            NTT._plans.popitem(last=False)
+        return plan
+
+    @staticmethod
+    def transform(a, p, g, inverse=False):
+        """
+        In-place iterative NTT of a list whose length is a power of two
+        :param a: List of residues modulo p (overwritten)
+        :param p: Prime modulus
+        :param g: Primitive root modulo p
+        :param inverse: Compute the inverse transform (including the 1/n factor)
+        :return: a
+        """
+        n = len(a)
+        if n & (n - 1):
+            raise ValueError("NTT length must be a power of two")
+        if (p - 1) % n:
+            raise ValueError("Prime does not support this transform length")
+        if n <= 1:
+            return a
+
+        reverse, stages, inverse_stages = NTT._plan(p, g, n)
+        a[:] = [a[r] for r in reverse]
+
+        for half, roots in (inverse_stages if inverse else stages):
+            size = 2 * half
+            if half >= n // size:
+                for start in range(0, n, size):
+                    mid = start + half
+                    end = start + size
+                    even = a[start:mid]
+                    odd = [w * v % p for w, v in zip(roots, a[mid:end])]
+                    a[start:mid] = [(e + o) % p for e, o in zip(even, odd)]
+                    a[mid:end] = [(e - o) % p for e, o in zip(even, odd)]
+            else:
+                for k in range(half):
+                    w = roots[k]
+                    even = a[k::size]
+                    odd = [w * v % p for v in a[k + half::size]]
+                    a[k::size] = [(e + o) % p for e, o in zip(even, odd)]
+                    a[k + half::size] = [(e - o) % p for e, o in zip(even, odd)]
+
+        if inverse:
+            n_inv = pow(n, p - 2, p)
+            a[:] = [v * n_inv % p for v in a]
+        return a
+
+    @staticmethod
+    def multiply(poly1, poly2):
+        """
+        Multiplies two integer polynomials exactly
+        :param poly1: Integer coefficients
+        :param poly2: Integer coefficients
+        :return: Integer coefficients of the product
+        """
+        if not poly1 or not poly2:
+            return []
+        n = len(poly1) + len(poly2) - 1
+        length = 1
+        while length < n:
+            length <<= 1
+
+        # Every product coefficient lies in [-bound, bound]
+        bound = max(map(abs, poly1)) * max(map(abs, poly2)) * min(len(poly1), len(poly2))
+        if bound == 0:
+            return [0] * n
+        primes = NTT.primes_for(2 * bound, length)
+
+        residues = []
+        for p, g in primes:
+            a = [c % p for c in poly1] + [0] * (length - len(poly1))
+            b = [c % p for c in poly2] + [0] * (length - len(poly2))
+            NTT.transform(a, p, g)
+            NTT.transform(b, p, g)
+            product = [x * y % p for x, y in zip(a, b)]
+            residues.append(NTT.transform(product, p, g, inverse=True)[:n])
+
+        if len(primes) == 1:
+            p = primes[0][0]
+            half = p // 2
+            return [r - p if r > half else r for r in residues[0]]
+
+        # Chinese remainder theorem with precomputed basis coefficients
+        modulus = math.prod(p for p, _ in primes)
+        basis = []
+        for p, _ in primes:
+            m = modulus // p
+            basis.append(m * pow(m, -1, p) % modulus)
+        half = modulus // 2
+        result = []
+        for values in zip(*residues):
+            value = sum(r * e for r, e in zip(values, basis)) % modulus
+            result.append(value - modulus if value > half else value)
+        return result
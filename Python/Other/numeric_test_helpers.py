@@ -0,0 +1,37 @@
+"""
+numeric_test_helpers.py
+Author: Андрій Будильников
+
+Reference implementations and input factories shared by the tests of the
+transform and polynomial modules
+"""
+
+import cmath
+import random
+
+def assert_close(actual, expected, tolerance=1e-9):
+    """assert equal lengths and values within tolerance of the largest expected value"""
+    assert len(actual) == len(expected)
+    scale = max((abs(v) for v in expected), default=0.0) or 1.0
+    for a, e in zip(actual, expected):
+        assert abs(a - e) <= tolerance * scale, (a, e)
+
+def naive_dft(x):
+    """direct O(n^2) discrete fourier transform"""
+    n = len(x)
+    return [sum(x[t] * cmath.exp(-2j * cmath.pi * k * t / n) for t in range(n)) for k in range(n)]
+
+def random_signal(n, seed, real=False):
+    """n values with parts drawn uniformly from [-1, 1]"""
+    rng = random.Random(seed)
+    if real:
+        return [rng.uniform(-1, 1) for _ in range(n)]
+    return [complex(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(n)]
+
+def schoolbook(poly1, poly2):
+    """direct O(n*m) product of two coefficient lists"""
+    result = [0] * (len(poly1) + len(poly2) - 1)
+    for i, a in enumerate(poly1):
+        for j, b in enumerate(poly2):
+            result[i + j] += a * b
+    return result
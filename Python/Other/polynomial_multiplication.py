@@ -0,0 +1,286 @@
+"""
+Adaptive Polynomial Multiplication
+Author: Андрій Будильников
+
+This module multiplies polynomials (coefficient lists, lowest degree first)
+with the cheapest algorithm for their size and coefficient type. Short
+operands use the schoolbook O(n*m) loop, medium ones Karatsuba's O(n^1.585)
+recursion and long ones the FFT, or the exact NTT for integer coefficients
+too large for floating-point transforms. Very unbalanced operands are cut
+into pieces a few times the size of the shorter one, and products of many
+polynomials are scheduled as a product tree so that the large
+multiplications happen between operands of similar size. Float results are
+never rounded, so they agree with the schoolbook loop up to floating-point
+error whichever method is chosen. The thresholds can be calibrated with
+benchmark_polynomial.py.
+"""
+
+import heapq
+import operator
+
+from fft import FFT
+
+class PolynomialMultiplication:
+    """
+    Chooses between schoolbook, Karatsuba and transform-based multiplication
+    """
+
+    # The shorter operand must have at least this many coefficients for
+    # Karatsuba to replace the schoolbook loop
+    KARATSUBA_THRESHOLD = 64
+
+    # The shorter operand must have at least this many coefficients for the
+    # FFT to replace Karatsuba; NTT_THRESHOLD applies instead to integer
+    # operands too large for the floating-point transform, which go through
+    # the slower exact NTT
+    FFT_THRESHOLD = 128
+    NTT_THRESHOLD = 2048
+
+    METHODS = ("auto", "schoolbook", "karatsuba", "fft")
+
+    @staticmethod
+    def schoolbook(poly1, poly2):
+        """
+        Multiplies two polynomials with the direct O(n*m) loop
+        :param poly1: Coefficients of the first polynomial
+        :param poly2: Coefficients of the second polynomial
+        :return: Coefficients of the product
+        """
+        if not poly1 or not poly2:
+            return []
+        if len(poly1) < len(poly2):
+            poly1, poly2 = poly2, poly1
+        n = len(poly2)
+        add = operator.add
+        result = [0] * (len(poly1) + n - 1)
+        # One slice update per coefficient of the shorter operand
+        for i, c in enumerate(poly2):
+            result[i:i + len(poly1)] = map(add, result[i:i + len(poly1)], [c * a for a in poly1])
+        return result
+
+    @staticmethod
+    def karatsuba(poly1, poly2, threshold=None):
+        """
+        Multiplies two polynomials with Karatsuba's recursion
+        :param poly1: Coefficients of the first polynomial
+        :param poly2: Coefficients of the second polynomial
+        :param threshold: Operand length below which the schoolbook loop is
+                          used (defaults to KARATSUBA_THRESHOLD)
+        :return: Coefficients of the product
+        """
+        if not poly1 or not poly2:
+            return []
+        if threshold is None:
+            threshold = PolynomialMultiplication.KARATSUBA_THRESHOLD
+        return PolynomialMultiplication._karatsuba(list(poly1), list(poly2), max(2, threshold))
+
+    @staticmethod
+    def _karatsuba(a, b, threshold):
+        if len(a) < len(b):
+            a, b = b, a
+        if len(b) < threshold:
+            return PolynomialMultiplication.schoolbook(a, b)
+        if len(a) >= 2 * len(b):
+            return PolynomialMultiplication._unbalanced(
+                a, b, lambda x, y: PolynomialMultiplication._karatsuba(x, y, threshold))
+
+        # a = a0 + x^m * a1, b = b0 + x^m * b1 with len(b) > m
+        m = len(a) // 2
+        a0, a1 = a[:m], a[m:]
+        b0, b1 = b[:m], b[m:]
+        z0 = PolynomialMultiplication._karatsuba(a0, b0, threshold)
+        z2 = PolynomialMultiplication._karatsuba(a1, b1, threshold)
+        z1 = PolynomialMultiplication._karatsuba(PolynomialMultiplication._add(a0, a1),
+                                                 PolynomialMultiplication._add(b0, b1), threshold)
+        # z1 - z0 - z2 is the middle term a0*b1 + a1*b0
+        for i, value in enumerate(z0):
+            z1[i] -= value
+        for i, value in enumerate(z2):
+            z1[i] -= value
+
+        result = z0 + [0] * (len(a) + len(b) - 1 - len(z0))
+        for i, value in enumerate(z2, 2 * m):
+            result[i] += value
+        for i, value in enumerate(z1, m):
+            if i < len(result):
+                result[i] += value
+        return result
+
+    @staticmethod
+    def _add(a, b):
+        """
+        Adds two coefficient lists of possibly different lengths
+        """
+        if len(a) < len(b):
+            a, b = b, a
+        return list(map(operator.add, a[:len(b)], b)) + a[len(b):]
+
+    @staticmethod
+    def _unbalanced(a, b, multiply, piece=None):
+        """
+        Multiplies a long polynomial by a short one piece by piece
+        :param a: Longer operand
+        :param b: Shorter operand
+        :param multiply: Function multiplying a piece of a by b
+        :param piece: Length of the pieces of a (len(b) by default)
+        :return: Coefficients of the product
+        """
+        n = len(b)
+        piece = piece or n
+        result = [0] * (len(a) + n - 1)
+        add = operator.add
+        for start in range(0, len(a), piece):
+            product = multiply(a[start:start + piece], b)
+            result[start:start + len(product)] = map(add, result[start:start + len(product)], product)
+        return result
+
+    @staticmethod
+    def _kind(poly):
+        """
+        Classifies coefficients as "int", "float" (real or complex machine
+        numbers) or "exact" (Fractions, Decimals and other types the FFT
+        would round)
+        """
+        kind = "int"
+        for c in poly:
+            if type(c) is int:
+                continue
+            if type(c) in (float, complex):
+                kind = "float"
+            elif isinstance(c, int):
+                continue
+            else:
+                return "exact"
+        return kind
+
+    @staticmethod
+    def _transform(a, b, integer):
+        """
+        Multiplies two balanced operands with the FFT; integer operands get
+        exact integer results (FFT.polynomial_multiply falls back to the NTT
+        when the float transform could round them), float and complex
+        operands get the unrounded transform result
+        """
+        if integer:
+            return FFT.polynomial_multiply(a, b)
+        n = len(a) + len(b) - 1
+        length = FFT._next_power_of_2(n)
+        if any(type(c) is complex for c in a) or any(type(c) is complex for c in b):
+            fa = FFT.fft_inplace([complex(c) for c in a] + [0j] * (length - len(a)))
+            fb = FFT.fft_inplace([complex(c) for c in b] + [0j] * (length - len(b)))
+            return FFT.ifft_inplace(list(map(operator.mul, fa, fb)))[:n]
+        # FFT.polynomial_multiply rounds to 10 digits, so the real product
+        # is computed here with half-length real transforms
+        fa = FFT.rfft(list(a) + [0.0] * (length - len(a)))
+        fb = FFT.rfft(list(b) + [0.0] * (length - len(b)))
+        return FFT.irfft(list(map(operator.mul, fa, fb)), n)
+
+    @staticmethod
+    def _transform_threshold(a, b, kind):
+        """
+        Operand length from which the transform beats Karatsuba
+        """
+        if kind == "int":
+            length = FFT._next_power_of_2(len(a) + len(b) - 1)
+            if FFT._exceeds_float_precision(a, b, length):
+                return PolynomialMultiplication.NTT_THRESHOLD
+        return PolynomialMultiplication.FFT_THRESHOLD
+
+    @staticmethod
+    def multiply(poly1, poly2, method="auto"):
+        """
+        Multiplies two polynomials with the method suited to their size and type
+        :param poly1: Coefficients of the first polynomial (lowest degree first)
+        :param poly2: Coefficients of the second polynomial
+        :param method: "auto", "schoolbook", "karatsuba" or "fft" (the FFT, or
+                       the exact NTT for integers beyond float precision)
+        :return: Coefficients of the product; integer inputs give integers
+        """
+        if method not in PolynomialMultiplication.METHODS:
+            raise ValueError(f"method must be one of {', '.join(PolynomialMultiplication.METHODS)}")
+        if not poly1 or not poly2:
+            return []
+        a, b = list(poly1), list(poly2)
+        if len(a) < len(b):
+            a, b = b, a
+
+        kinds = (PolynomialMultiplication._kind(a), PolynomialMultiplication._kind(b))
+        if "exact" in kinds:
+            if method == "fft":
+                raise TypeError("The FFT would round these coefficients; use schoolbook or karatsuba")
+            kind = "exact"
+        else:
+            kind = "float" if "float" in kinds else "int"
+
+        if method == "auto":
+            shorter = len(b)
+            if shorter < PolynomialMultiplication.KARATSUBA_THRESHOLD:
+                method = "schoolbook"
+            elif kind == "exact":
+                method = "karatsuba"
+            elif shorter < PolynomialMultiplication._transform_threshold(a, b, kind):
+                method = "karatsuba"
+            else:
+                method = "fft"
+
+        if method == "schoolbook":
+            return PolynomialMultiplication.schoolbook(a, b)
+        if method == "karatsuba":
+            return PolynomialMultiplication.karatsuba(a, b)
+
+        integer = kind == "int"
+        # Transforms of a few times the short operand's length instead of the
+        # full length, as in overlap-add convolution
+        piece = FFT._next_power_of_2(4 * len(b)) - len(b) + 1
+        if len(a) >= 2 * piece:
+            return PolynomialMultiplication._unbalanced(
+                a, b, lambda x, y: PolynomialMultiplication._transform(x, y, integer), piece)
+        return PolynomialMultiplication._transform(a, b, integer)
+
+    @staticmethod
+    def multiply_many(polys, method="auto"):
+        """
+        Multiplies a sequence of polynomials using a product tree
+
+        The two shortest polynomials are always multiplied first, so operands
+        stay balanced and the expensive products are the last few.
+        :param polys: Iterable of coefficient lists
+        :param method: Method passed to multiply for every product
+        :return: Coefficients of the product ([1] for an empty sequence)
+        """
+        heap = [(len(poly), index, list(poly)) for index, poly in enumerate(polys)]
+        if not heap:
+            return [1]
+        if any(length == 0 for length, _, _ in heap):
+            return []
+        heapq.heapify(heap)
+        counter = len(heap)
+        while len(heap) > 1:
+            _, _, first = heapq.heappop(heap)
+            _, _, second = heapq.heappop(heap)
+            product = PolynomialMultiplication.multiply(first, second, method)
+            heapq.heappush(heap, (len(product), counter, product))
+            counter += 1
+        return heap[0][2]
+
+def main():
+    """
+    Main function to demonstrate adaptive polynomial multiplication
+    """
+    print("=== Adaptive Polynomial Multiplication Demo ===\n")
+
+    poly1 = [2, 3, 1]
+    poly2 = [1, 2, 4]
+    print(f"{poly1} * {poly2} = {PolynomialMultiplication.multiply(poly1, poly2)}")
+
+    # (x + 1)^64 through a product tree of 64 linear factors
+    binomial = PolynomialMultiplication.multiply_many([[1, 1]] * 64)
+    print(f"Middle coefficient of (x + 1)^64: {binomial[32]}")
+
+    long_poly = [1.5] * 500
+    short_poly = [0.5, -0.5]
+    product = PolynomialMultiplication.multiply(long_poly, short_poly)
+    print(f"Float product of lengths 500 and 2 has {len(product)} coefficients")
+
+if __name__ == "__main__":
+    main()
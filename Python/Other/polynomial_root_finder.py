@@ -2,14 +2,34 @@
 Polynomial Root Finder using Newton-Raphson Method
 Author: Андрій Будильников
 
-This program finds roots of polynomials using the Newton-Raphson numerical method.
+This program finds roots of polynomials using the Newton-Raphson numerical method
+and, with find_all_roots, all complex roots at once with the Aberth-Ehrlich
+simultaneous iteration. find_real_roots isolates every real root with a Sturm
+sequence in exact rational arithmetic and refines it with safeguarded Newton.
 """
 
+import cmath
+import math
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fractions import Fraction
+
+from horner import HornerEvaluator
+
+# Result of PolynomialRootFinder.find_roots_batch for one polynomial; residual
+# is the largest relative backward error |p(z)| / sum(|a_k| * |z|^k) of the roots
+RootResult = namedtuple("RootResult", ["index", "roots", "converged", "iterations", "residual"])
+
 class PolynomialRootFinder:
     """
     Finds roots of polynomials using the Newton-Raphson method
     """
     
+    # Largest number of polynomials per task sent to a worker by find_roots_batch
+    BATCH_CHUNK_SIZE = 256
+    
     def __init__(self, coefficients):
         """
         Initialize with polynomial coefficients
@@ -19,34 +39,39 @@ class PolynomialRootFinder:
         self.coefficients = coefficients
         self.degree = len(coefficients) - 1
     
+    def _evaluator(self):
+        """
+        Cached Horner evaluator for the current coefficients
+        """
+        return HornerEvaluator.for_coefficients(self.coefficients)
+    
     def evaluate(self, x):
         """
         Evaluate the polynomial at point x
         """
-        result = 0
-        for i, coeff in enumerate(self.coefficients):
-            result += coeff * (x ** (self.degree - i))
-        return result
+        return self._evaluator()(x)
     
     def derivative(self, x):
         """
         Evaluate the derivative of the polynomial at point x
         """
-        result = 0
-        for i, coeff in enumerate(self.coefficients[:-1]):  # Skip constant term
-            power = self.degree - i
-            result += coeff * power * (x ** (power - 1))
-        return result
+        return self._evaluator().value_and_derivative(x)[1]
+    
+    def evaluate_many(self, xs):
+        """
+        Evaluate the polynomial at every point of xs
+        """
+        return self._evaluator().evaluate_many(xs)
     
     def newton_raphson(self, initial_guess, tolerance=1e-7, max_iterations=1000):
         """
         Find a root using the Newton-Raphson method
         """
         x = initial_guess
+        value_and_derivative = self._evaluator().value_and_derivative
         
         for i in range(max_iterations):
-            fx = self.evaluate(x)
-            fpx = self.derivative(x)
+            fx, fpx = value_and_derivative(x)
             
             # Check if derivative is too close to zero
             if abs(fpx) < 1e-15:
@@ -85,6 +110,347 @@ class PolynomialRootFinder:
         
         return roots
 
+    def _root_bound(self, coefficients):
+        """
+        Fujiwara's bound: every root z satisfies |z| <= 2 * max |a_k / a_0|^(1/k)
+        """
+        lead = abs(coefficients[0])
+        n = len(coefficients) - 1
+        bound = 0.0
+        for k in range(1, n + 1):
+            ratio = abs(coefficients[k]) / lead
+            if k == n:
+                ratio /= 2
+            if ratio:
+                bound = max(bound, ratio ** (1.0 / k))
+        return 2 * bound
+    
+    def find_all_roots(self, tolerance=1e-12, max_iterations=500):
+        """
+        Find every complex root at once with the Aberth-Ehrlich iteration
+        
+        Starting points are spread over a circle given by Fujiwara's root bound
+        and each iteration moves every root by its Newton correction deflated by
+        the other approximations. A root is frozen and no longer updated once
+        its correction drops below tolerance (relative to its size) or once
+        |p(z)| is within rounding error of sum(|a_k| * |z|^k), since further
+        steps on clustered roots only move them around in the noise.
+        tolerance: relative step size at which a root counts as converged
+        max_iterations: maximum number of sweeps over the unconverged roots
+        Returns the list of degree roots (complex numbers, with multiplicity)
+        sorted by real and then imaginary part
+        """
+        roots, _, _ = self._aberth(tolerance, max_iterations)
+        return roots
+    
+    def _aberth(self, tolerance, max_iterations):
+        """
+        Aberth-Ehrlich iteration behind find_all_roots
+        Returns (sorted roots, number of sweeps, whether every root converged)
+        """
+        coefficients = list(self.coefficients)
+        while coefficients and coefficients[0] == 0:
+            coefficients.pop(0)
+        if len(coefficients) < 2:
+            return [], 0, True
+        
+        # Zero roots come from trailing zero coefficients
+        zero_roots = 0
+        while coefficients[-1] == 0:
+            coefficients.pop()
+            zero_roots += 1
+        
+        n = len(coefficients) - 1
+        iterations = 0
+        converged = True
+        if n == 0:
+            roots = []
+        elif n == 1:
+            roots = [complex(-coefficients[1] / coefficients[0])]
+        else:
+            radius = self._root_bound(coefficients)
+            # The angular offset avoids starting on symmetric (e.g. real) axes
+            roots = [radius * cmath.exp(1j * (2 * math.pi * k / n + 0.4)) for k in range(n)]
+            value_and_derivative = HornerEvaluator.for_coefficients(coefficients).value_and_derivative
+            # Backward-error bound: |p(z)| below this many units of rounding
+            # in sum(|a_k| * |z|^k) is as small as float evaluation can get
+            magnitude = HornerEvaluator.for_coefficients([abs(c) for c in coefficients])
+            noise = 4 * n * sys.float_info.epsilon
+            
+            active = list(range(n))
+            while active and iterations < max_iterations:
+                iterations += 1
+                still_active = []
+                for k in active:
+                    z = roots[k]
+                    value, slope = value_and_derivative(z)
+                    if abs(value) <= noise * magnitude(abs(z)):
+                        continue
+                    
+                    repulsion = 0j
+                    for j, other in enumerate(roots):
+                        if j != k:
+                            difference = z - other
+                            if difference != 0:
+                                repulsion += 1 / difference
+                    
+                    if slope == 0:
+                        # Nudge a root sitting on a critical point
+                        step = tolerance * max(1.0, abs(z)) * 1e3 + 1e-12j
+                    else:
+                        ratio = value / slope
+                        denominator = 1 - ratio * repulsion
+                        step = ratio / denominator if denominator != 0 else ratio
+                    roots[k] = z - step
+                    if abs(step) > tolerance * max(1.0, abs(z)):
+                        still_active.append(k)
+                active = still_active
+            converged = not active
+        
+        roots.extend([0j] * zero_roots)
+        return sorted(roots, key=lambda z: (z.real, z.imag)), iterations, converged
+    
+    def _residual(self, roots):
+        """
+        Largest relative backward error of approximate roots
+        """
+        evaluate = self._evaluator()
+        magnitude = HornerEvaluator.for_coefficients([abs(c) for c in self.coefficients])
+        residual = 0.0
+        for z in roots:
+            scale = magnitude(abs(z))
+            if scale:
+                residual = max(residual, abs(evaluate(z)) / scale)
+        return residual
+    
+    @staticmethod
+    def _strip(coefficients):
+        """
+        Removes leading zero coefficients
+        """
+        start = 0
+        while start < len(coefficients) and coefficients[start] == 0:
+            start += 1
+        return coefficients[start:]
+    
+    @staticmethod
+    def _differentiate(coefficients):
+        """
+        Coefficients of the derivative
+        """
+        degree = len(coefficients) - 1
+        return [c * (degree - i) for i, c in enumerate(coefficients[:-1])]
+    
+    @staticmethod
+    def _divmod(dividend, divisor):
+        """
+        Polynomial long division with exact coefficients
+        Returns (quotient, remainder)
+        """
+        remainder = list(dividend)
+        if len(remainder) < len(divisor):
+            return [], remainder
+        lead = divisor[0]
+        quotient = []
+        for i in range(len(dividend) - len(divisor) + 1):
+            factor = remainder[i] / lead
+            quotient.append(factor)
+            if factor:
+                for j, c in enumerate(divisor):
+                    remainder[i + j] -= factor * c
+        return quotient, PolynomialRootFinder._strip(remainder[len(quotient):])
+    
+    @staticmethod
+    def _sturm_sequence(coefficients):
+        """
+        Sturm sequence p, p', -rem(p, p'), ... of a square-free polynomial
+        """
+        coefficients = PolynomialRootFinder._primitive(coefficients)
+        sequence = [coefficients, PolynomialRootFinder._primitive(PolynomialRootFinder._differentiate(coefficients))]
+        while len(sequence[-1]) > 1:
+            _, remainder = PolynomialRootFinder._divmod(sequence[-2], sequence[-1])
+            if not remainder:
+                break
+            sequence.append(PolynomialRootFinder._primitive([-c for c in remainder]))
+        return sequence
+    
+    @staticmethod
+    def _primitive(coefficients):
+        """
+        Scales rational coefficients by a positive factor to coprime integers;
+        signs at every point are unchanged, and the coefficients of later
+        Sturm remainders stay small
+        """
+        denominator = math.lcm(*(c.denominator for c in coefficients))
+        numerators = [c.numerator * (denominator // c.denominator) for c in coefficients]
+        divisor = math.gcd(*numerators)
+        return [Fraction(n // divisor) for n in numerators]
+    
+    def find_real_roots(self, tolerance=1e-12, max_iterations=100):
+        """
+        Find every distinct real root without initial guesses
+        
+        The square-free part p / gcd(p, p') and its Sturm sequence are computed
+        with exact Fractions, so the number of roots in any interval is known
+        exactly. Bisection of the Cauchy bound interval isolates each root in
+        its own interval, which is then refined with Newton steps that fall
+        back to bisection whenever they would leave the bracket; the polynomial
+        is evaluated exactly at each float iterate.
+        tolerance: relative width at which a root is accepted
+        max_iterations: maximum number of refinement steps per root
+        Returns the sorted list of distinct real roots (floats)
+        """
+        if any(isinstance(c, complex) for c in self.coefficients):
+            raise ValueError("Sturm sequences need real coefficients")
+        coefficients = self._strip([Fraction(c) for c in self.coefficients])
+        if len(coefficients) < 2:
+            return []
+        
+        # Removing repeated factors makes every root simple
+        divisor = self._primitive(coefficients)
+        remainder = self._primitive(self._differentiate(coefficients))
+        while remainder:
+            divisor, remainder = remainder, self._divmod(divisor, remainder)[1]
+            if remainder:
+                remainder = self._primitive(remainder)
+        square_free = self._divmod(coefficients, divisor)[0] if len(divisor) > 1 else coefficients
+        
+        sequence = [HornerEvaluator.for_coefficients(p) for p in self._sturm_sequence(square_free)]
+        evaluate = sequence[0]
+        
+        def variations(x):
+            count = 0
+            previous = 0
+            for p in sequence:
+                value = p(x)
+                if value:
+                    if previous and (value > 0) != (previous > 0):
+                        count += 1
+                    previous = value
+            return count
+        
+        # Cauchy bound: every root lies in (-bound, bound)
+        bound = 1 + max(abs(c / square_free[0]) for c in square_free[1:])
+        
+        # Bisect until every interval (a, b] holds exactly one root
+        isolated = []
+        stack = [(-bound, bound, variations(-bound), variations(bound))]
+        while stack:
+            a, b, va, vb = stack.pop()
+            if va - vb == 1:
+                isolated.append((a, b, vb))
+            elif va - vb > 1:
+                middle = (a + b) / 2
+                vm = variations(middle)
+                stack.append((a, middle, va, vm))
+                stack.append((middle, b, vm, vb))
+        
+        def refine(x):
+            # Exact evaluation at the float x keeps the bracket signs correct
+            # even where float evaluation would be dominated by rounding
+            value, slope = evaluate.value_and_derivative(Fraction(x))
+            return float(value), float(slope)
+        
+        roots = []
+        for a, b, vb in isolated:
+            if evaluate(b) == 0:
+                roots.append(float(b))
+                continue
+            # Move a off a root of the neighbouring interval
+            while evaluate(a) == 0:
+                middle = (a + b) / 2
+                if variations(middle) - vb == 1:
+                    a = middle
+                else:
+                    b = middle
+            roots.append(self._safeguarded_newton(refine, float(a), float(b), evaluate(a) < 0,
+                                                  tolerance, max_iterations))
+        return sorted(roots)
+    
+    @staticmethod
+    def _safeguarded_newton(value_and_derivative, low, high, negative_at_low, tolerance, max_iterations):
+        """
+        Newton's method restricted to a bracket [low, high] holding one root;
+        a step that would leave the bracket or does not at least halve the
+        step before last is replaced by bisection
+        """
+        x = (low + high) / 2
+        previous_step = step = high - low
+        for _ in range(max_iterations):
+            fx, slope = value_and_derivative(x)
+            if fx == 0:
+                return x
+            if (fx < 0) == negative_at_low:
+                low = x
+            else:
+                high = x
+            
+            scale = tolerance * max(1.0, abs(x))
+            if slope and abs(fx / slope) <= scale:
+                return x - fx / slope
+            
+            x_new = x - fx / slope if slope else None
+            if x_new is None or not low < x_new < high or abs(x_new - x) > abs(previous_step) / 2:
+                x_new = (low + high) / 2
+            previous_step, step = step, x_new - x
+            
+            if high - low <= scale:
+                return x_new
+            x = x_new
+        return x
+    
+    @staticmethod
+    def find_roots_batch(polys, tolerance=1e-12, max_iterations=500, workers=None, chunk_size=None):
+        """
+        Finds all roots of many polynomials, spreading them over worker processes
+        
+        Polynomials are sent to the pool in chunks and results are yielded as
+        soon as their chunk finishes, so they may arrive out of order; use the
+        index field to match them with the input. Nothing is printed: failed
+        convergence is reported in the converged, iterations and residual fields.
+        polys: iterable of coefficient lists (highest degree first)
+        tolerance, max_iterations: passed to find_all_roots
+        workers: number of worker processes (None uses every CPU, 1 stays in-process)
+        chunk_size: polynomials per task (by default about 4 tasks per worker)
+        Returns a generator of RootResult
+        """
+        polys = [list(coefficients) for coefficients in polys]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, min(PolynomialRootFinder.BATCH_CHUNK_SIZE, -(-len(polys) // (workers * 4))))
+        
+        if workers <= 1 or len(polys) <= chunk_size:
+            yield from _solve_chunk(0, polys, tolerance, max_iterations)
+            return
+        
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = {executor.submit(_solve_chunk, start, polys[start:start + chunk_size],
+                                       tolerance, max_iterations)
+                       for start in range(0, len(polys), chunk_size)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            # Stops queued chunks if the caller abandons the generator early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def _solve_chunk(start, polys, tolerance, max_iterations):
+    """
+    Worker entry point: solves consecutive polynomials of a batch
+    start: index of the first polynomial in the whole batch
+    Returns a list of RootResult
+    """
+    results = []
+    for index, coefficients in enumerate(polys, start):
+        finder = PolynomialRootFinder(coefficients)
+        roots, iterations, converged = finder._aberth(tolerance, max_iterations)
+        results.append(RootResult(index, roots, converged, iterations, finder._residual(roots)))
+    return results
+
+
 def main():
     """
     Main function to demonstrate the polynomial root finder
@@ -103,6 +469,15 @@ def main():
     roots = finder.find_roots(initial_guesses)
     
     print(f"\nFound roots: {[round(root, 6) for root in roots]}")
+    
+    # All complex roots at once, no initial guesses needed
+    print("\nFinding all roots of x^4 + 1 = 0")
+    all_roots = PolynomialRootFinder([1, 0, 0, 0, 1]).find_all_roots()
+    print(f"Found roots: {[complex(round(z.real, 6), round(z.imag, 6)) for z in all_roots]}")
+    
+    # Real roots only, isolated with a Sturm sequence
+    print("\nFinding real roots of x^3 - 6x^2 + 11x - 6 = 0 with Sturm sequences")
+    print(f"Found roots: {[round(root, 6) for root in finder.find_real_roots()]}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
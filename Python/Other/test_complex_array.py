@@ -0,0 +1,119 @@
+"""
+test_complex_array.py
+Author: Андрій Будильников
+
+Test file for the struct-of-arrays ComplexArray and its use with FFT
+"""
+
+from array import array
+
+from complex_array import ComplexArray
+from complex_number import ComplexNumber
+from fft import FFT
+from numeric_test_helpers import assert_close, naive_dft, random_signal
+
+def test_construction():
+    """test constructors, buffers and element access"""
+    z = ComplexArray([3, 1, 0], [4, -2, 1])
+    assert len(z) == 3
+    assert z.tocomplex() == [3 + 4j, 1 - 2j, 1j]
+    assert list(z) == z.tocomplex()
+    assert z[1] == 1 - 2j and z[-1] == 1j
+    assert ComplexArray([1, 2]).tocomplex() == [1, 2]
+    assert ComplexArray.zeros(2).tocomplex() == [0, 0]
+    assert ComplexArray.from_complex([1 + 1j, 2, ComplexNumber(0, -1)]).tocomplex() == [1 + 1j, 2, -1j]
+    assert z.real.tolist() == [3, 1, 0] and z.imag.format == "d"
+    try:
+        ComplexArray([1, 2], [1])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("construction tests passed")
+
+def test_equality():
+    """test element-wise equality with arrays, lists and other objects"""
+    z = ComplexArray([1, 2], [3, 4])
+    assert z == ComplexArray.from_complex([1 + 3j, 2 + 4j])
+    assert z == [1 + 3j, 2 + 4j] and z == (1 + 3j, 2 + 4j)
+    assert z != ComplexArray([1, 2], [3, 5])
+    assert z != ComplexArray([1], [3])
+    assert z != [1 + 3j]
+    assert z != "z"
+    try:
+        hash(z)
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+    print("equality tests passed")
+
+def test_views():
+    """test that slices share the buffers and slice assignment writes through"""
+    buffer = array("d", [0, 1, 2, 3])
+    z = ComplexArray(buffer)
+    view = z[::2]
+    assert view == [0, 2]
+    view[1] = 5 + 5j
+    assert z == [0, 1, 5 + 5j, 3]
+    assert buffer[2] == 5
+    z[:2] = [7j, ComplexNumber(1, 1)]
+    assert z == [7j, 1 + 1j, 5 + 5j, 3]
+    copy = z.copy()
+    copy[0] = 0
+    assert z[0] == 7j
+    print("view tests passed")
+
+def test_arithmetic():
+    """test element-wise operations against builtin complex arithmetic"""
+    x = random_signal(6, seed=1)
+    y = random_signal(6, seed=2)
+    a = ComplexArray.from_complex(x)
+    b = ComplexArray.from_complex(y)
+    assert_close((a + b).tocomplex(), [p + q for p, q in zip(x, y)])
+    assert_close((a - b).tocomplex(), [p - q for p, q in zip(x, y)])
+    assert_close((a * b).tocomplex(), [p * q for p, q in zip(x, y)])
+    assert_close((a / b).tocomplex(), [p / q for p, q in zip(x, y)])
+    for scalar in (2, -0.5, 1 - 2j, ComplexNumber(1, -2)):
+        plain = complex(scalar)
+        assert_close((a + scalar).tocomplex(), [p + plain for p in x])
+        assert_close((scalar - a).tocomplex(), [plain - p for p in x])
+        assert_close((scalar * a).tocomplex(), [plain * p for p in x])
+        assert_close((a / scalar).tocomplex(), [p / plain for p in x])
+        assert_close((scalar / a).tocomplex(), [plain / p for p in x])
+    assert_close((-a).tocomplex(), [-p for p in x])
+    assert_close(a.conjugate().tocomplex(), [p.conjugate() for p in x])
+    assert_close(a.magnitude().tolist(), [abs(p) for p in x])
+    try:
+        a + ComplexArray.zeros(2)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("arithmetic tests passed")
+
+def test_polar():
+    """test the polar round trip"""
+    z = ComplexArray.from_complex(random_signal(5, seed=3))
+    assert_close(ComplexArray.from_polar(*z.to_polar()).tocomplex(), z.tocomplex())
+    print("polar tests passed")
+
+def test_fft_round_trip():
+    """test fft and ifft of ComplexArray inputs for several sizes"""
+    for n in (1, 8, 12, 7):
+        x = random_signal(n, seed=n)
+        spectrum = FFT.fft(ComplexArray.from_complex(x))
+        assert isinstance(spectrum, ComplexArray)
+        assert_close(spectrum.tocomplex(), naive_dft(x))
+        restored = FFT.ifft(spectrum)
+        assert isinstance(restored, ComplexArray)
+        assert_close(restored.tocomplex(), x)
+    padded = FFT.fft(ComplexArray.from_complex(random_signal(5, seed=4)), pad=True)
+    assert len(padded) == 8
+    print("fft round trip tests passed")
+
+if __name__ == "__main__":
+    test_construction()
+    test_equality()
+    test_views()
+    test_arithmetic()
+    test_polar()
+    test_fft_round_trip()
+    print("all tests passed! 🎉")
@@ -0,0 +1,130 @@
+"""
+test_complex_number.py
+Author: Андрій Будильников
+
+Test file for the slotted ComplexNumber class and its interplay with the
+builtin numeric types
+"""
+
+import cmath
+import pickle
+from fractions import Fraction
+
+from complex_number import ComplexNumber
+from fft import FFT
+from numeric_test_helpers import assert_close, naive_dft
+
+def test_slots():
+    """test that instances are slotted and stay mutable"""
+    z = ComplexNumber(1, 2)
+    assert not hasattr(z, "__dict__")
+    try:
+        z.extra = 1
+        assert False, "expected AttributeError"
+    except AttributeError:
+        pass
+    z.real = 5
+    assert z == ComplexNumber(5, 2)
+    print("slots tests passed")
+
+def test_unhashable():
+    """test that mutable values cannot be used as dict keys or set members"""
+    z = ComplexNumber(1, 2)
+    for use in (hash, lambda value: {value}, lambda value: {value: 1}):
+        try:
+            use(z)
+            assert False, "expected TypeError"
+        except TypeError:
+            pass
+    assert {complex(z): 1}[1 + 2j] == 1
+    print("unhashable tests passed")
+
+def test_builtin_operands():
+    """test every operator with int, float and complex on both sides"""
+    z = ComplexNumber(3, -2)
+    w = 3 - 2j
+    for other in (2, -1.5, 0.5 + 4j, ComplexNumber(0.5, 4)):
+        plain = complex(other)
+        assert complex(z + other) == w + plain
+        assert complex(other + z) == plain + w
+        assert complex(z - other) == w - plain
+        assert complex(other - z) == plain - w
+        assert complex(z * other) == w * plain
+        assert complex(other * z) == plain * w
+        assert_close([complex(z / other)], [w / plain])
+        assert_close([complex(other / z)], [plain / w])
+    for result in (z + 1, 1 + z, z * 2.0, 1j * z, z / 2, 2 / z):
+        assert type(result) is ComplexNumber
+    print("builtin operand tests passed")
+
+def test_equality():
+    """test equality against builtin numbers and other number types"""
+    assert ComplexNumber(1, 2) == 1 + 2j
+    assert 1 + 2j == ComplexNumber(1, 2)
+    assert ComplexNumber(3, 0) == 3
+    assert ComplexNumber(3, 0) == 3.0
+    assert ComplexNumber(0.5, 0) == Fraction(1, 2)
+    assert ComplexNumber(3, 1) != 3
+    assert ComplexNumber(1, 2) != "1+2j"
+    print("equality tests passed")
+
+def test_conversions():
+    """test complex(), abs(), from_complex and to_complex"""
+    z = ComplexNumber.from_complex(-3 + 4j)
+    assert z == ComplexNumber(-3, 4)
+    assert ComplexNumber.from_complex(z) == z
+    assert ComplexNumber.from_complex(2) == ComplexNumber(2, 0)
+    assert type(z.to_complex()) is complex and z.to_complex() == -3 + 4j
+    assert complex(z) == -3 + 4j
+    assert abs(z) == 5.0
+    assert cmath.isclose(cmath.exp(z), cmath.exp(-3 + 4j))
+    print("conversion tests passed")
+
+def test_power():
+    """test integer powers stay exact and other powers match builtin complex"""
+    z = ComplexNumber(1, 1)
+    assert z ** 0 == ComplexNumber(1, 0)
+    assert z ** 8 == ComplexNumber(16, 0)
+    assert type((z ** 8).real) is int
+    assert_close([complex(z ** -2)], [(1 + 1j) ** -2])
+    assert_close([complex(z ** 0.5)], [(1 + 1j) ** 0.5])
+    assert_close([complex(z ** (1 + 1j))], [(1 + 1j) ** (1 + 1j)])
+    assert_close([complex(2 ** z)], [2 ** (1 + 1j)])
+    print("power tests passed")
+
+def test_unsupported_operands():
+    """test that strings make every operator raise TypeError"""
+    z = ComplexNumber(1, 2)
+    for operation in (lambda: z + "a", lambda: "a" + z, lambda: z * "a",
+                      lambda: z / "a", lambda: "a" / z, lambda: z ** "a"):
+        try:
+            operation()
+            assert False, "expected TypeError"
+        except TypeError:
+            pass
+    print("unsupported operand tests passed")
+
+def test_pickle():
+    """test that slotted instances survive pickling"""
+    z = ComplexNumber(1.5, -2)
+    restored = pickle.loads(pickle.dumps(z))
+    assert type(restored) is ComplexNumber and restored == z
+    print("pickle tests passed")
+
+def test_fft_input():
+    """test that ComplexNumber values can be passed straight to FFT.fft"""
+    values = [ComplexNumber(i, -i) for i in range(8)]
+    assert_close(FFT.fft(values), naive_dft([complex(v) for v in values]))
+    print("fft input tests passed")
+
+if __name__ == "__main__":
+    test_slots()
+    test_unhashable()
+    test_builtin_operands()
+    test_equality()
+    test_conversions()
+    test_power()
+    test_unsupported_operands()
+    test_pickle()
+    test_fft_input()
+    print("all tests passed! 🎉")
@@ -0,0 +1,149 @@
+"""
+test_fft.py
+Author: Андрій Будильников
+
+Test file for the fft module
+"""
+
+import cmath
+from array import array
+
+from fft import FFT
+from numeric_test_helpers import assert_close, naive_dft, random_signal
+
+def test_radix2_against_dft():
+    """test the in-place radix-2 kernel against a naive dft"""
+    for n in (1, 2, 4, 8, 16, 64, 128):
+        x = random_signal(n, n)
+        assert_close(FFT.fft_inplace(list(x)), naive_dft(x))
+        assert_close(FFT.ifft_inplace(FFT.fft_inplace(list(x))), x)
+    try:
+        FFT.fft_inplace([1, 2, 3])
+        assert False, "non power of two length must raise"
+    except ValueError:
+        pass
+    print("radix-2 tests passed")
+
+def test_plan_cache():
+    """test that plans are reused and the cache stays bounded"""
+    FFT.clear_plan_cache()
+    plan = FFT._plan(16)
+    assert FFT._plan(16) is plan
+    size = FFT.PLAN_CACHE_SIZE
+    FFT.PLAN_CACHE_SIZE = 2
+    try:
+        for n in (32, 64, 128):
+            FFT._plan(n)
+        assert len(FFT._plans) == 2 and 16 not in FFT._plans
+        # results do not depend on cached state
+        x = random_signal(32, 1)
+        assert_close(FFT.fft(x), naive_dft(x))
+    finally:
+        FFT.PLAN_CACHE_SIZE = size
+        FFT.clear_plan_cache()
+    print("plan cache tests passed")
+
+def test_any_length_against_dft():
+    """test mixed radix and bluestein transforms against a naive dft"""
+    lengths = list(range(1, 71)) + [97, 101, 127, 45, 75, 135, 225]
+    for n in lengths:
+        x = random_signal(n, n)
+        spectrum = FFT.fft(x)
+        assert len(spectrum) == n
+        assert_close(spectrum, naive_dft(x))
+        assert_close(FFT.ifft(spectrum), x)
+    print("any length tests passed")
+
+def test_pad_keeps_old_length():
+    """test that pad=True restores zero-padding to a power of two"""
+    x = random_signal(12, 3)
+    padded = FFT.fft(x, pad=True)
+    assert len(padded) == 16
+    assert_close(padded, naive_dft(x + [0j] * 4))
+    print("padding tests passed")
+
+def test_rfft_round_trip():
+    """test rfft against the full transform and irfft(rfft(x)) round trips"""
+    for n in list(range(1, 40)) + [64, 100, 257]:
+        x = random_signal(n, n, real=True)
+        spectrum = FFT.rfft(x)
+        size = FFT._next_power_of_2(n)
+        assert len(spectrum) == size // 2 + 1
+        assert_close(spectrum, naive_dft(x + [0.0] * (size - n))[:size // 2 + 1])
+        restored = FFT.irfft(spectrum, n)
+        assert_close(restored, x)
+    print("rfft tests passed")
+
+def naive_dft2(matrix):
+    """direct o((mn)^2) two-dimensional discrete fourier transform"""
+    m, n = len(matrix), len(matrix[0])
+    return [[sum(matrix[a][b] * cmath.exp(-2j * cmath.pi * (k * a / m + l * b / n))
+                 for a in range(m) for b in range(n)) for l in range(n)] for k in range(m)]
+
+def assert_rows_close(actual, expected):
+    """assert two lists of rows agree within the default tolerance"""
+    assert len(actual) == len(expected)
+    for row, reference in zip(actual, expected):
+        assert_close(row, reference)
+
+def test_fft_batch():
+    """test batched transforms of lists and flat buffers against per-row fft"""
+    for length in (8, 12):
+        signals = [random_signal(length, seed) for seed in range(5)]
+        assert_rows_close(FFT.fft_batch(signals, workers=1), [FFT.fft(x) for x in signals])
+        assert_rows_close(FFT.fft_batch(signals, inverse=True, workers=1), [FFT.ifft(x) for x in signals])
+        real = [random_signal(length, seed, real=True) for seed in range(5)]
+        flat = array("d", [v for x in real for v in x])
+        assert_rows_close(FFT.fft_batch(flat, length, workers=1), [FFT.fft(x) for x in real])
+    assert FFT.fft_batch([], workers=1) == []
+    for call in (lambda: FFT.fft_batch([[1, 2], [1, 2, 3]]), lambda: FFT.fft_batch([1.0] * 10, 4)):
+        try:
+            call()
+            assert False, "ragged batch must raise"
+        except ValueError:
+            pass
+    print("batch tests passed")
+
+def test_fft2_against_dft():
+    """test fft2 and ifft2 against a naive 2d dft"""
+    for rows, cols in ((4, 8), (3, 5), (1, 6)):
+        matrix = [random_signal(cols, seed) for seed in range(rows)]
+        spectrum = FFT.fft2(matrix, workers=1)
+        assert_rows_close(spectrum, naive_dft2(matrix))
+        assert_rows_close(FFT.ifft2(spectrum, workers=1), matrix)
+        flat = [v for row in matrix for v in row]
+        assert_rows_close(FFT.fft2(flat, shape=(rows, cols), workers=1), spectrum)
+    assert FFT.fft2([]) == []
+    try:
+        FFT.fft2([1.0] * 10, shape=(3, 3))
+        assert False, "shape mismatch must raise"
+    except ValueError:
+        pass
+    print("fft2 tests passed")
+
+def test_parallel_batch():
+    """test that worker processes give the in-process results"""
+    threshold = FFT.PARALLEL_THRESHOLD
+    FFT.PARALLEL_THRESHOLD = 1
+    try:
+        for length in (16, 10):
+            signals = [random_signal(length, seed) for seed in range(9)]
+            for inverse in (False, True):
+                expected = FFT.fft_batch(signals, inverse=inverse, workers=1)
+                assert_rows_close(FFT.fft_batch(signals, inverse=inverse, workers=2), expected)
+        matrix = [random_signal(6, seed) for seed in range(4)]
+        assert_rows_close(FFT.fft2(matrix, workers=2), FFT.fft2(matrix, workers=1))
+    finally:
+        FFT.PARALLEL_THRESHOLD = threshold
+    print("parallel batch tests passed")
+
+if __name__ == "__main__":
+    test_radix2_against_dft()
+    test_plan_cache()
+    test_any_length_against_dft()
+    test_pad_keeps_old_length()
+    test_rfft_round_trip()
+    test_fft_batch()
+    test_fft2_against_dft()
+    test_parallel_batch()
+    print("all tests passed! 🎉")
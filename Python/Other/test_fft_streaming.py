@@ -0,0 +1,102 @@
+"""
+test_fft_streaming.py
+Author: Андрій Будильников
+
+Test file for streaming convolution and the short-time fourier transform
+"""
+
+import itertools
+import math
+
+from fft_streaming import StreamingFFT
+from numeric_test_helpers import assert_close, naive_dft, random_signal, schoolbook
+
+def chunked(signal, sizes=(1, 7, 3, 50, 2)):
+    """split a signal into chunks of cycling irregular sizes"""
+    chunks = []
+    start = 0
+    for size in itertools.cycle(sizes):
+        if start >= len(signal):
+            return chunks
+        chunks.append(signal[start:start + size])
+        start += size
+
+def test_convolution_against_direct():
+    """test overlap-add and overlap-save against direct convolution"""
+    for kernel_length in (1, 5, 31):
+        kernel = random_signal(kernel_length, kernel_length, real=True)
+        for signal_length in (1, 3, 30, 200):
+            signal = random_signal(signal_length, signal_length + 1, real=True)
+            expected = schoolbook(signal, kernel)
+            for block_size in (None, 1, 3, 7, 64):
+                for method in (StreamingFFT.overlap_add, StreamingFFT.overlap_save):
+                    output = list(itertools.chain.from_iterable(method(chunked(signal), kernel, block_size)))
+                    assert_close(output, expected)
+    print("convolution tests passed")
+
+def test_signal_shorter_than_kernel():
+    """test inputs shorter than the kernel and empty streams"""
+    kernel = random_signal(40, 1, real=True)
+    signal = random_signal(3, 2, real=True)
+    for method in (StreamingFFT.overlap_add, StreamingFFT.overlap_save):
+        output = list(itertools.chain.from_iterable(method([signal], kernel)))
+        assert_close(output, schoolbook(signal, kernel))
+        assert list(method([], kernel)) == []
+        try:
+            list(method([signal], []))
+            assert False, "empty kernel must raise"
+        except ValueError:
+            pass
+    print("short signal tests passed")
+
+def reference_frames(signal, window_size, hop, coefficients, pad_end):
+    """stft frames computed directly with a naive dft"""
+    frames = []
+    start = 0
+    while start + window_size <= len(signal):
+        frames.append(signal[start:start + window_size])
+        start += hop
+    if pad_end and start < len(signal):
+        frames.append(signal[start:] + [0.0] * (window_size - len(signal) + start))
+    bins = window_size // 2 + 1
+    return [naive_dft([s * w for s, w in zip(frame, coefficients)])[:bins] for frame in frames]
+
+def test_stft_frames():
+    """test frame count, hop and window handling against a naive dft"""
+    signal = random_signal(101, 3, real=True)
+    for window_size, hop in ((16, 8), (16, 1), (16, 16), (16, 23), (12, 5), (1, 1)):
+        hann = [0.5 - 0.5 * math.cos(2 * math.pi * n / window_size) for n in range(window_size)]
+        if window_size == 1:
+            hann = [1.0]
+        for pad_end in (False, True):
+            frames = list(StreamingFFT.stft(chunked(signal), window_size, hop, pad_end=pad_end))
+            expected = reference_frames(signal, window_size, hop, hann, pad_end)
+            full = (len(signal) - window_size) // hop + 1
+            assert len(frames) == len(expected) >= full
+            for frame, reference in zip(frames, expected):
+                assert len(frame) == window_size // 2 + 1
+                assert_close(frame, reference)
+    # default hop is half a window; custom windows are used as given
+    frames = list(StreamingFFT.stft([signal], 8, window="rect"))
+    assert len(frames) == (len(signal) - 8) // 4 + 1
+    assert_close(frames[1], reference_frames(signal[4:12], 8, 8, [1.0] * 8, False)[0])
+    coefficients = [0.1 * k for k in range(8)]
+    frames = list(StreamingFFT.stft(chunked(signal), 8, 3, window=coefficients))
+    for frame, reference in zip(frames, reference_frames(signal, 8, 3, coefficients, False)):
+        assert_close(frame, reference)
+    assert list(StreamingFFT.stft([signal[:5]], 8)) == []
+    for call in (lambda: StreamingFFT.stft([signal], 0), lambda: StreamingFFT.stft([signal], 8, 0),
+                 lambda: StreamingFFT.stft([signal], 8, window=[1.0] * 7),
+                 lambda: StreamingFFT.stft([signal], 8, window="triangle")):
+        try:
+            list(call())
+            assert False, "invalid stft arguments must raise"
+        except ValueError:
+            pass
+    print("stft tests passed")
+
+if __name__ == "__main__":
+    test_convolution_against_direct()
+    test_signal_shorter_than_kernel()
+    test_stft_frames()
+    print("all tests passed! 🎉")
@@ -0,0 +1,60 @@
+"""
+test_horner.py
+Author: Андрій Будильников
+
+Test file for the compiled horner evaluator
+"""
+
+from horner import HornerEvaluator
+from polynomial_root_finder import PolynomialRootFinder
+
+def test_evaluate():
+    """test value and derivative against direct evaluation"""
+    coefficients = [2, -3, 0, 5, -1]
+    evaluator = HornerEvaluator.for_coefficients(coefficients)
+    for x in (-2, 0, 1, 3):
+        value = sum(c * x ** (len(coefficients) - 1 - i) for i, c in enumerate(coefficients))
+        slope = sum(c * (len(coefficients) - 1 - i) * x ** (len(coefficients) - 2 - i)
+                    for i, c in enumerate(coefficients[:-1]))
+        assert evaluator(x) == value
+        assert evaluator.value_and_derivative(x) == (value, slope)
+    assert evaluator.evaluate_many([0, 1]) == [-1, 3]
+    print("horner evaluation tests passed")
+
+def test_cache_keeps_coefficient_types():
+    """test that equal int and complex coefficients do not share an evaluator"""
+    complex_evaluator = HornerEvaluator.for_coefficients([1 + 0j, -3 + 0j, 2 + 0j])
+    int_evaluator = HornerEvaluator.for_coefficients([1, -3, 2])
+    assert complex_evaluator is not int_evaluator
+    assert type(int_evaluator(3)) is int
+    # find_all_roots compiles the complex version of the same coefficients
+    finder = PolynomialRootFinder([1, -3, 2])
+    finder.find_all_roots()
+    value = finder.evaluate(3)
+    assert value == 2 and type(value) is int
+    print("horner cache tests passed")
+
+def test_cache_size():
+    """test that changing CACHE_SIZE resizes the evaluator cache"""
+    original = HornerEvaluator.CACHE_SIZE
+    try:
+        HornerEvaluator.CACHE_SIZE = 2
+        for k in range(4):
+            HornerEvaluator.for_coefficients([1, k])
+        info = HornerEvaluator._cache.cache_info()
+        assert info.maxsize == 2 and info.currsize == 2
+        # The two most recent evaluators are still shared
+        assert HornerEvaluator.for_coefficients([1, 3]) is HornerEvaluator.for_coefficients([1, 3])
+        HornerEvaluator.clear_cache()
+        assert HornerEvaluator._cache.cache_info().currsize == 0
+    finally:
+        HornerEvaluator.CACHE_SIZE = original
+    HornerEvaluator.for_coefficients([1, 0])
+    assert HornerEvaluator._cache.cache_parameters()["maxsize"] == original
+    print("horner cache size tests passed")
+
+if __name__ == "__main__":
+    test_evaluate()
+    test_cache_keeps_coefficient_types()
+    test_cache_size()
+    print("all tests passed! 🎉")
@@ -0,0 +1,78 @@
+"""
+test_ntt.py
+Author: Андрій Будильников
+
+Test file for the number-theoretic transform and exact integer products
+"""
+
+import random
+
+from fft import FFT
+from ntt import NTT
+from numeric_test_helpers import schoolbook
+
+def test_transform_round_trip():
+    """test that the inverse transform undoes the forward transform"""
+    p, g = NTT.PRIMES[0]
+    values = [random.Random(1).randrange(p) for _ in range(64)]
+    spectrum = NTT.transform(list(values), p, g)
+    assert NTT.transform(spectrum, p, g, inverse=True) == values
+    print("ntt round trip tests passed")
+
+def test_multiply_single_prime():
+    """test small products that fit into one ntt prime"""
+    rng = random.Random(2)
+    for n, m in ((1, 1), (3, 5), (17, 9), (64, 64)):
+        poly1 = [rng.randint(-100, 100) for _ in range(n)]
+        poly2 = [rng.randint(-100, 100) for _ in range(m)]
+        assert len(NTT.primes_for(2 * 100 * 100 * min(n, m), 128)) == 1
+        assert NTT.multiply(poly1, poly2) == schoolbook(poly1, poly2)
+    assert NTT.multiply([0, 0], [5]) == [0, 0]
+    print("single prime tests passed")
+
+def test_multiply_crt():
+    """test products whose coefficients need several primes and the crt"""
+    rng = random.Random(3)
+    poly1 = [rng.getrandbits(200) - (1 << 199) for _ in range(40)]
+    poly2 = [rng.getrandbits(150) - (1 << 149) for _ in range(33)]
+    bound = max(map(abs, poly1)) * max(map(abs, poly2)) * 33
+    assert len(NTT.primes_for(2 * bound, 128)) > 5
+    assert NTT.multiply(poly1, poly2) == schoolbook(poly1, poly2)
+    print("crt tests passed")
+
+def test_polynomial_multiply_types():
+    """test that integer products are exact ints on both sides of the ntt threshold"""
+    rng = random.Random(4)
+    small1 = [rng.randint(-50, 50) for _ in range(30)]
+    small2 = [rng.randint(-50, 50) for _ in range(20)]
+    assert not FFT._exceeds_float_precision(small1, small2, 64)
+    large1 = [rng.getrandbits(40) for _ in range(30)]
+    large2 = [rng.getrandbits(40) for _ in range(20)]
+    assert FFT._exceeds_float_precision(large1, large2, 64)
+    for poly1, poly2 in ((small1, small2), (large1, large2)):
+        result = FFT.polynomial_multiply(poly1, poly2)
+        assert result == schoolbook(poly1, poly2)
+        assert all(type(c) is int for c in result)
+    assert all(type(c) is int for c in FFT.polynomial_multiply(small1, small2, backend="ntt"))
+    assert all(type(c) is int for c in FFT.polynomial_multiply(small1, small2, backend="float"))
+    print("polynomial multiply type tests passed")
+
+def test_forced_float_backend_large_ints():
+    """test that forcing the float backend on large ints never returns wrong ints"""
+    rng = random.Random(5)
+    poly1 = [rng.getrandbits(60) for _ in range(40)]
+    poly2 = [rng.getrandbits(60) for _ in range(40)]
+    expected = schoolbook(poly1, poly2)
+    result = FFT.polynomial_multiply(poly1, poly2, backend="float")
+    assert all(type(c) is float for c in result)
+    assert all(abs(a - e) <= 1e-9 * e for a, e in zip(result, expected))
+    assert FFT.polynomial_multiply(poly1, poly2) == expected
+    print("forced float backend tests passed")
+
+if __name__ == "__main__":
+    test_transform_round_trip()
+    test_multiply_single_prime()
+    test_multiply_crt()
+    test_polynomial_multiply_types()
+    test_forced_float_backend_large_ints()
+    print("all tests passed! 🎉")
@@ -0,0 +1,66 @@
+"""
+test_polynomial_multiplication.py
+Author: Андрій Будильников
+
+Test file for adaptive polynomial multiplication
+"""
+
+import random
+
+from numeric_test_helpers import assert_close, random_signal, schoolbook
+from polynomial_multiplication import PolynomialMultiplication
+
+def threshold_lengths():
+    """operand lengths just below and at every threshold"""
+    lengths = []
+    for threshold in (PolynomialMultiplication.KARATSUBA_THRESHOLD,
+                      PolynomialMultiplication.FFT_THRESHOLD):
+        lengths += [threshold - 1, threshold]
+    return lengths
+
+def test_float_matches_schoolbook():
+    """test float products on both sides of each threshold against schoolbook"""
+    for n in threshold_lengths():
+        poly1 = random_signal(n, n, real=True)
+        poly2 = random_signal(n, n + 1, real=True)
+        assert_close(PolynomialMultiplication.multiply(poly1, poly2), schoolbook(poly1, poly2))
+    # unbalanced operands go through overlap-add pieces
+    poly1 = random_signal(3000, 1, real=True)
+    poly2 = random_signal(150, 2, real=True)
+    assert_close(PolynomialMultiplication.multiply(poly1, poly2), schoolbook(poly1, poly2))
+    print("float product tests passed")
+
+def test_small_floats_are_not_rounded():
+    """test that tiny coefficients survive the fft path"""
+    product = PolynomialMultiplication.multiply([1e-12] * 200, [1.0] * 200)
+    assert_close(product, schoolbook([1e-12] * 200, [1.0] * 200))
+    assert product[199] > 1.9e-10
+    print("small float tests passed")
+
+def test_complex_matches_schoolbook():
+    """test complex products on the fft path"""
+    n = PolynomialMultiplication.FFT_THRESHOLD
+    poly1 = random_signal(n, 3)
+    poly2 = random_signal(n, 4)
+    assert_close(PolynomialMultiplication.multiply(poly1, poly2), schoolbook(poly1, poly2))
+    print("complex product tests passed")
+
+def test_integer_products_are_exact_ints():
+    """test integer products on both sides of every threshold, including the ntt"""
+    rng = random.Random(3)
+    cases = [[rng.randint(-1000, 1000) for _ in range(n)] for n in threshold_lengths()]
+    ntt = PolynomialMultiplication.NTT_THRESHOLD
+    cases += [[rng.getrandbits(64) - (1 << 63) for _ in range(n)] for n in (ntt - 1, ntt)]
+    for poly in cases:
+        other = list(reversed(poly))
+        product = PolynomialMultiplication.multiply(poly, other)
+        assert product == schoolbook(poly, other)
+        assert all(type(c) is int for c in product)
+    print("integer product tests passed")
+
+if __name__ == "__main__":
+    test_float_matches_schoolbook()
+    test_small_floats_are_not_rounded()
+    test_complex_matches_schoolbook()
+    test_integer_products_are_exact_ints()
+    print("all tests passed! 🎉")
@@ -0,0 +1,173 @@
+"""
+test_polynomial_root_finder.py
+Author: Андрій Будильников
+
+Test file for sturm-sequence real root isolation, aberth-ehrlich complex
+root finding and the batched solver
+"""
+
+import multiprocessing
+from fractions import Fraction
+
+from polynomial_root_finder import PolynomialRootFinder, RootResult
+
+def from_roots(roots, extra=(1,)):
+    """coefficients (highest degree first) of extra * prod(x - r)"""
+    coefficients = list(extra)
+    for r in roots:
+        shifted = coefficients + [0]
+        for i, c in enumerate(coefficients):
+            shifted[i + 1] -= r * c
+        coefficients = shifted
+    return coefficients
+
+def sturm_count(coefficients):
+    """number of distinct real roots of a square-free polynomial from sign changes at -inf and +inf"""
+    sequence = PolynomialRootFinder._sturm_sequence([Fraction(c) for c in coefficients])
+
+    def changes(signs):
+        signs = [s for s in signs if s]
+        return sum(1 for a, b in zip(signs, signs[1:]) if a != b)
+
+    at_plus = [1 if p[0] > 0 else -1 for p in sequence]
+    at_minus = [s if (len(p) - 1) % 2 == 0 else -s for s, p in zip(at_plus, sequence)]
+    return changes(at_minus) - changes(at_plus)
+
+def assert_roots(found, expected, tolerance):
+    """assert that every expected root is matched by a distinct found root"""
+    remaining = list(found)
+    assert len(remaining) == len(expected)
+    for root in expected:
+        nearest = min(remaining, key=lambda z: abs(z - root))
+        assert abs(nearest - root) <= tolerance * max(1, abs(root)), (nearest, root)
+        remaining.remove(nearest)
+
+def test_repeated_roots():
+    """test that repeated roots are reported once"""
+    # (x - 1)^3 (x + 2)^2 (x^2 + 1)
+    coefficients = from_roots([1, 1, 1, -2, -2], extra=(1, 0, 1))
+    roots = PolynomialRootFinder(coefficients).find_real_roots()
+    assert len(roots) == sturm_count(from_roots([1, -2], extra=(1, 0, 1))) == 2
+    assert abs(roots[0] + 2) < 1e-12 and abs(roots[1] - 1) < 1e-12
+    print("repeated root tests passed")
+
+def test_close_roots():
+    """test roots separated by 1e-6"""
+    exact = [Fraction(1), Fraction(1) + Fraction(1, 10 ** 6), Fraction(1) + Fraction(2, 10 ** 6)]
+    coefficients = from_roots(exact)
+    roots = PolynomialRootFinder(coefficients).find_real_roots()
+    assert len(roots) == sturm_count(coefficients) == 3
+    for root, expected in zip(roots, exact):
+        assert abs(root - float(expected)) < 1e-12
+    print("close root tests passed")
+
+def test_no_real_roots():
+    """test a polynomial without real roots"""
+    coefficients = [1, 0, 1, 0, 1]
+    assert sturm_count(coefficients) == 0
+    assert PolynomialRootFinder(coefficients).find_real_roots() == []
+    print("no real root tests passed")
+
+def test_many_roots():
+    """test integer roots 1..12 against the sturm count"""
+    coefficients = from_roots(range(1, 13))
+    roots = PolynomialRootFinder(coefficients).find_real_roots()
+    assert len(roots) == sturm_count(coefficients) == 12
+    assert all(abs(root - k) < 1e-9 * k for root, k in zip(roots, range(1, 13)))
+    print("many root tests passed")
+
+def test_complex_roots():
+    """test find_all_roots against known complex roots"""
+    expected = [1 + 2j, 1 - 2j, -3, 0.5j, -0.5j, 2, 0, 0]
+    finder = PolynomialRootFinder(from_roots(expected, extra=(2,)))
+    roots, _, converged = finder._aberth(1e-12, 500)
+    assert converged
+    assert_roots(roots, expected, 1e-9)
+    assert_roots(finder.find_all_roots(), expected, 1e-9)
+    print("complex root tests passed")
+
+def test_clustered_roots():
+    """test that clustered roots converge once they reach rounding error"""
+    expected = [1.7825, 1.7906, 1.8986]
+    finder = PolynomialRootFinder(from_roots(expected))
+    roots, iterations, converged = finder._aberth(1e-12, 500)
+    assert converged and iterations < 50
+    assert_roots(roots, expected, 1e-9)
+    assert finder._residual(roots) < 1e-14
+
+    expected = [1.8167, 1.8816, 1.8009, 1.7564, 1.8204, 1.7294, 1.7198, 1.841]
+    finder = PolynomialRootFinder(from_roots(expected))
+    roots, iterations, converged = finder._aberth(1e-12, 500)
+    # Eight roots this close are only determined to about 1e-2, so only the
+    # backward error is checked
+    assert converged and iterations < 50
+    assert len(roots) == 8 and finder._residual(roots) < 1e-13
+    print("clustered root tests passed")
+
+def batch_polys(count):
+    """count cubics with known integer roots k, -k and k + 1"""
+    return [from_roots([k, -k, k + 1]) for k in range(1, count + 1)]
+
+def test_batch_order_and_index():
+    """test that in-process results come back in order with matching indices"""
+    polys = batch_polys(10)
+    results = list(PolynomialRootFinder.find_roots_batch(polys, workers=1))
+    assert [result.index for result in results] == list(range(10))
+    for k, result in enumerate(results, 1):
+        assert isinstance(result, RootResult)
+        assert result.converged and 0 < result.iterations < 100
+        assert result.residual < 1e-14
+        assert_roots(result.roots, [k, -k, k + 1], 1e-9)
+    print("batch order tests passed")
+
+def test_batch_workers():
+    """test that a worker pool gives the same results as the in-process path"""
+    polys = batch_polys(12) + [from_roots([1.7825, 1.7906, 1.8986])]
+    expected = list(PolynomialRootFinder.find_roots_batch(polys, workers=1))
+    results = sorted(PolynomialRootFinder.find_roots_batch(polys, workers=2, chunk_size=3),
+                     key=lambda result: result.index)
+    assert results == expected
+    assert all(result.converged for result in results)
+    print("batch worker tests passed")
+
+def test_batch_failures():
+    """test that non-convergence is reported in the result and bad input raises"""
+    result, = PolynomialRootFinder.find_roots_batch([from_roots(range(1, 9))], max_iterations=1)
+    assert not result.converged and result.iterations == 1
+    assert result.residual > 1e-6
+    for workers in (1, 2):
+        try:
+            list(PolynomialRootFinder.find_roots_batch(batch_polys(3) + [["a", 1]],
+                                                       workers=workers, chunk_size=1))
+            assert False, "expected TypeError"
+        except TypeError:
+            pass
+    print("batch failure tests passed")
+
+def test_batch_close():
+    """test that closing the generator early shuts the worker pool down"""
+    results = PolynomialRootFinder.find_roots_batch(batch_polys(40), workers=2, chunk_size=1)
+    first = next(results)
+    assert first.converged
+    assert multiprocessing.active_children()
+    results.close()
+    assert not multiprocessing.active_children()
+    try:
+        next(results)
+        assert False, "expected StopIteration"
+    except StopIteration:
+        pass
+    print("batch close tests passed")
+
+if __name__ == "__main__":
+    test_repeated_roots()
+    test_close_roots()
+    test_no_real_roots()
+    test_many_roots()
+    test_complex_roots()
+    test_clustered_roots()
+    test_batch_order_and_index()
+    test_batch_workers()
+    test_batch_failures()
+    test_batch_close()
+    print("all tests passed! 🎉")